@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ASGI serving mode with many concurrent change-feed long-polls:
+thread count while they wait, and how quickly one write wakes them all.
+Drives the ASGI app in-process, so no HTTP server or client is involved.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mock_ukg_rest'))
+
+import mock_server
+from asgi_server import MockASGIApp
+
+async def call(app, method, path, query='', headers=None, body=b''):
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+    messages = [{'type': 'http.request', 'body': body}]
+    response = {'body': b''}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] += message.get('body', b'')
+
+    await app(scope, receive, send)
+    return response['status'], json.loads(response['body']) if response['body'] else None
+
+async def run(connections):
+    app = MockASGIApp()
+    credentials = base64.b64encode(b'bench:bench').decode()
+    _, token = await call(app, 'POST', '/api/v2/client/tokens', headers={'Authorization': f'Basic {credentials}'})
+    headers = {'Authorization': f"Bearer {token['access_token']}"}
+    _, feed = await call(app, 'GET', '/api/v2/client/events', headers=headers)
+    since = feed['latest_seq']
+
+    polls = [asyncio.ensure_future(call(app, 'GET', '/api/v2/client/events', f'since={since}&wait=30', headers))
+             for _ in range(connections)]
+    await asyncio.sleep(0.5)
+    waiting = sum(not poll.done() for poll in polls)
+    print(f"{waiting} long-polls waiting on {threading.active_count()} threads")
+
+    started = time.perf_counter()
+    body = json.dumps({'url': 'https://example.com/hook'}).encode()
+    await call(app, 'POST', '/api/v2/client/webhooks', headers=dict(headers, **{'Content-Type': 'application/json'}),
+               body=body)
+    results = await asyncio.gather(*polls)
+    elapsed = time.perf_counter() - started
+    delivered = sum(1 for status, page in results if status == 200 and page['data'])
+    print(f"One write woke {delivered}/{connections} long-polls in {elapsed * 1000:.0f} ms "
+          f"({elapsed / connections * 1e6:.0f} µs per response)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=10000)
+    args = parser.parse_args()
+    mock_server.app.logger.disabled = True
+    asyncio.run(run(args.connections))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory per record for plain dict vs columnar mock storage
+
+Records are generated synthetically and round-tripped through JSON so that,
+like records POSTed to the mock server, no strings are shared up front.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mock_ukg_rest'))
+
+from compact_store import ColumnarCollection, DEFAULT_COMPACT_COLLECTIONS
+from data_generator import SyntheticDataGenerator
+
+def measure(payloads, collection):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for payload in payloads:
+        record = json.loads(payload)
+        collection[record['id']] = record
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--employees', type=int, default=20000)
+    args = parser.parse_args()
+
+    store = defaultdict(dict)
+    SyntheticDataGenerator(seed=1).populate(store, employees=args.employees)
+
+    print(f"Memory per record ({args.employees} synthetic employees)")
+    print(f"  {'collection':<20}{'records':>10}{'dict B/rec':>14}{'columnar B/rec':>16}{'saving':>9}{'read μs/rec':>14}")
+    for name in DEFAULT_COMPACT_COLLECTIONS:
+        payloads = [json.dumps(record) for record in store[name].values()]
+        if not payloads:
+            continue
+        plain = {}
+        plain_size, _ = measure(payloads, plain)
+        columnar = ColumnarCollection()
+        columnar_size, _ = measure(payloads, columnar)
+        started = time.perf_counter()
+        for _ in columnar.values():
+            pass
+        read = (time.perf_counter() - started) / len(payloads)
+        print(f"  {name:<20}{len(payloads):>10}{plain_size / len(payloads):>14.0f}"
+              f"{columnar_size / len(payloads):>16.0f}{1 - columnar_size / plain_size:>9.0%}{read * 1e6:>14.2f}")
+        del plain, columnar
+
+if __name__ == '__main__':
+    main()
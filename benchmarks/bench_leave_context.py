@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark the union leave workflow's service calls over real HTTP: three
+dependent requests (entitlements, violations, compliance) against the single
+/employees/<id>/leave-context request
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import union_entitlements_service
+import union_leave_workflow
+
+def separate_calls(employee_id):
+    entitlements = union_leave_workflow.get_union_entitlements(employee_id)
+    violations = union_leave_workflow.get_compliance_violations(employee_id, None, None)
+    compliance = union_leave_workflow.get_compliance_parameters(entitlements[0]['union_id'])
+    return entitlements, violations, compliance
+
+def leave_context(employee_id):
+    context = union_leave_workflow.get_leave_context(employee_id)
+    return context['entitlements'], context['violations'], context['compliance_parameters']
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn('EMP001')
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'union_entitlements.db')
+        shutil.copy(union_entitlements_service.DB_PATH, db_path)
+        union_entitlements_service.DB_PATH = db_path
+        server = make_server('127.0.0.1', 0, union_entitlements_service.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        union_leave_workflow.UNION_ENTITLEMENT_SERVICE_BASE_URL = f'http://127.0.0.1:{server.server_port}'
+
+        assert separate_calls('EMP001') == leave_context('EMP001')
+        separate = median_ms(separate_calls, args.repeat)
+        combined = median_ms(leave_context, args.repeat)
+        server.shutdown()
+
+    print(f"Union leave workflow service calls (median of {args.repeat})")
+    print(f"  3 requests (entitlements, violations, compliance): {separate:.2f} ms")
+    print(f"  1 request  (leave-context):                        {combined:.2f} ms")
+    print(f"  saving: {separate - combined:.2f} ms ({(1 - combined / separate) * 100:.0f}%)")
+
+if __name__ == '__main__':
+    main()
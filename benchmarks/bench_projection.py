@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark sparse fieldsets on the mock server: payload size and
+server-side time for GET /employees with and without `fields=`. The
+response cache is cleared before every request, so each one is serialized.
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'mock_ukg_rest'))
+
+import mock_server
+from data_generator import SyntheticDataGenerator
+
+def timed_get(client, url, headers, repeat):
+    timings = []
+    for _ in range(repeat):
+        mock_server.response_cache.clear()
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        body = response.get_data()
+        timings.append(time.perf_counter() - started)
+    return len(body), sorted(timings)[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--employees', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    mock_server.app.logger.disabled = True
+    SyntheticDataGenerator(seed=1).populate(mock_server.mock_data, employees=args.employees)
+    client = mock_server.app.test_client()
+    credentials = base64.b64encode(b'bench:bench').decode()
+    token = client.post('/api/v2/client/tokens', headers={'Authorization': f'Basic {credentials}'}).json['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    print(f"GET /api/v2/client/employees with {args.employees} employees (median of {args.repeat})")
+    baseline_size, baseline_time = None, None
+    for label, query in [('full records', ''), ('fields=id,employee_id,department', '?fields=id,employee_id,department')]:
+        size, elapsed = timed_get(client, f'/api/v2/client/employees{query}', headers, args.repeat)
+        baseline_size = baseline_size or size
+        baseline_time = baseline_time or elapsed
+        print(f"  {label:<36} {size / 1024:>10.1f} KiB  {elapsed * 1000:>8.1f} ms  "
+              f"({size / baseline_size:.0%} size, {elapsed / baseline_time:.0%} time)")
+
+if __name__ == '__main__':
+    main()
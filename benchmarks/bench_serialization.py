@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of large union service results: sqlite3.Row ->
+dict -> jsonify, against dicts zipped from plain tuples and against
+json_group_array() building the body inside SQLite. Each strategy serializes
+a union with --rows members, both directly and through the members route.
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from flask import jsonify
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import union_entitlements_service as service
+
+UNION_ID = 'UNION002'
+PARAMS = (UNION_ID, '', -1)
+
+def add_members(db_path, rows):
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO union_members VALUES (?, ?, ?, '2020-01-01', '2020-01-01', ?)",
+        ((f'BENCH{n:07d}', f'BENCHEMP{n:07d}', UNION_ID, n % 40) for n in range(rows)))
+    conn.commit()
+    conn.close()
+
+def row_dicts_jsonify(conn):
+    return jsonify([dict(row) for row in conn.execute(service.UNION_MEMBERS_QUERY, PARAMS)]).get_data()
+
+def tuple_rows(conn):
+    service.SQLITE_JSON = False
+    return service.query_json(conn, service.UNION_MEMBERS_QUERY, PARAMS)
+
+def sqlite_json(conn):
+    service.SQLITE_JSON = True
+    return service.query_json(conn, service.UNION_MEMBERS_QUERY, PARAMS)
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(body)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'union_entitlements.db')
+        shutil.copy(service.DB_PATH, db_path)
+        add_members(db_path, args.rows)
+        service.DB_PATH = db_path
+        client = service.app.test_client()
+
+        print(f"Serializing {args.rows} union members (best of {args.repeat})")
+        print(f"{'strategy':<26} {'ms':>8} {'rows/s':>10} {'MB':>6}")
+        with service.app.app_context():
+            conn = service.get_db_connection()
+            baseline = None
+            for name, serialize in (('Row -> dict -> jsonify', row_dicts_jsonify),
+                                    ('tuples + column names', tuple_rows),
+                                    ('json_group_array', sqlite_json)):
+                elapsed, size = best_of(lambda: serialize(conn), args.repeat)
+                baseline = baseline or elapsed
+                print(f"{name:<26} {elapsed * 1000:>8.1f} {args.rows / elapsed:>10,.0f} {size / 1e6:>6.1f}"
+                      f"  {baseline / elapsed:.1f}x")
+
+        print(f"\nGET /unions/{UNION_ID}/members through the test client")
+        for sqlite_json_enabled in (False, True):
+            service.SQLITE_JSON = sqlite_json_enabled
+            elapsed, _ = best_of(lambda: client.get(f'/unions/{UNION_ID}/members').get_data(), args.repeat)
+            print(f"  UNION_SERVICE_SQLITE_JSON={int(sqlite_json_enabled)}: {elapsed * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
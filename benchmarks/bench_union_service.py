@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request latency of the union entitlements service routes,
+served in-process through Flask's test client against a copy of the database
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import union_entitlements_service
+
+ROUTES = [
+    '/unions',
+    '/unions/UNION001/members',
+    '/employees/EMP001/entitlements',
+    '/members/MEM001/entitlements',
+    '/unions/UNION001/compliance',
+    '/unions/UNION001/entitlements',
+    '/employees/EMP001/violations',
+]
+
+def time_route(client, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        response.get_data()
+        timings.append(time.perf_counter() - started)
+    assert response.status_code == 200, (path, response.status_code)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'union_entitlements.db')
+        shutil.copy(union_entitlements_service.DB_PATH, db_path)
+        union_entitlements_service.DB_PATH = db_path
+        client = union_entitlements_service.app.test_client()
+
+        print(f"Union entitlements service, {args.repeat} requests per route")
+        print(f"{'route':<36} {'p50 µs':>8} {'p99 µs':>8}")
+        for path in ROUTES:
+            p50, p99 = time_route(client, path, args.repeat)
+            print(f"{path:<36} {p50 * 1e6:>8.0f} {p99 * 1e6:>8.0f}")
+
+if __name__ == '__main__':
+    main()
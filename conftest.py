@@ -0,0 +1,25 @@
+"""
+Shared pytest setup: makes the mock server's modules importable and provides
+an authenticated test client for it
+"""
+
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_ukg_rest'))
+
+@pytest.fixture
+def mock_server_client():
+    """Flask test client for the mock UKG server"""
+    import mock_server
+    return mock_server.app.test_client()
+
+@pytest.fixture
+def mock_auth_headers(mock_server_client):
+    """Bearer token headers for the mock server"""
+    credentials = base64.b64encode(b'test:test').decode()
+    response = mock_server_client.post('/api/v2/client/tokens', headers={'Authorization': f'Basic {credentials}'})
+    return {'Authorization': f"Bearer {response.json['access_token']}"}
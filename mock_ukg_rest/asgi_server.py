@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+ASGI serving mode for the mock UKG REST API server
+
+Serves the same route set, storage and handlers as mock_server.py from an
+asyncio event loop, so thousands of concurrent client connections do not
+need thousands of threads:
+
+- The Flask handlers are synchronous (and take store locks), so each one
+  runs on a handler thread pool and never blocks the loop. /admin/*
+  requests (seeding, snapshots) get their own small pool, so a long seed
+  can't starve API requests.
+- Long-polls on /api/v2/client/events wait on the loop for the next change
+  rather than holding a thread, then the shared handler builds the response.
+- Injected latency and slow-drip responses from the fault profile are
+  awaited with asyncio.sleep instead of time.sleep.
+
+Run it with any ASGI server:
+
+    python asgi_server.py --port 8080          # needs `pip install uvicorn`
+    uvicorn asgi_server:app --port 8080
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import math
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode
+
+import mock_server
+from fault_injection import drip_chunks
+
+EVENTS_PATH = '/api/v2/client/events'
+
+class ChangeNotifier:
+    """Wakes long-polls waiting on the event loop whenever mock_server records a change"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.changed = loop.create_future()
+        self.wakeup_pending = False
+        self.lock = threading.Lock()
+
+    def notify(self):
+        # Called from any thread; coalesce bursts (e.g. bulk imports) into one loop wakeup
+        with self.lock:
+            if self.wakeup_pending:
+                return
+            self.wakeup_pending = True
+        self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        with self.lock:
+            self.wakeup_pending = False
+        changed, self.changed = self.changed, self.loop.create_future()
+        changed.set_result(None)
+
+    async def wait_for_seq(self, since, timeout):
+        """Return once the change log is past `since`, or after `timeout` seconds"""
+        deadline = self.loop.time() + timeout
+        while mock_server.change_log.latest_seq <= since:
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(asyncio.shield(self.changed), remaining)
+            except asyncio.TimeoutError:
+                return
+
+class MockASGIApp:
+    def __init__(self, wsgi_app=mock_server.app, workers=8, admin_workers=2):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mock-handler')
+        self.admin_executor = ThreadPoolExecutor(max_workers=admin_workers, thread_name_prefix='mock-admin')
+        self.notifier = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.handle_http(scope, receive, send)
+
+    def start(self):
+        if self.notifier is None:
+            self.notifier = ChangeNotifier(asyncio.get_running_loop())
+            mock_server.change_listeners.append(self.notifier.notify)
+
+    def stop(self):
+        if self.notifier is not None:
+            mock_server.change_listeners.remove(self.notifier.notify)
+            self.notifier = None
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle_http(self, scope, receive, send):
+        self.start()
+        environ = self.build_environ(scope, await self.read_body(receive))
+        if scope['method'] == 'GET' and scope['path'] == EVENTS_PATH:
+            await self.long_poll(environ)
+
+        executor = self.admin_executor if scope['path'].startswith('/admin/') else self.executor
+        loop = asyncio.get_running_loop()
+        status, headers, body = await loop.run_in_executor(executor, self.call_wsgi, environ)
+
+        delay = environ.get('mock.injected_delay')
+        if delay:
+            await asyncio.sleep(delay)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        drip = environ.get('mock.drip')
+        if not drip:
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        for delay, chunk in drip_chunks(drip, body):
+            if delay:
+                await asyncio.sleep(delay)
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def long_poll(self, environ):
+        """Do the `wait=` part of an events request on the loop; the shared handler then answers immediately"""
+        query = parse_qsl(environ['QUERY_STRING'], keep_blank_values=True)
+        params = dict(query)
+        try:
+            since = int(params.get('since', 0))
+            wait = min(float(params.get('wait', 0)), mock_server.MAX_EVENTS_WAIT_SECONDS)
+            if not math.isfinite(wait):
+                raise ValueError('wait must be finite')
+        except ValueError:
+            # Let the handler report the bad parameter
+            return
+        environ['QUERY_STRING'] = urlencode([(name, value) for name, value in query if name != 'wait'])
+        if wait > 0 and self.has_live_token(environ):
+            await self.notifier.wait_for_seq(since, wait)
+
+    @staticmethod
+    def has_live_token(environ):
+        authorization = environ.get('HTTP_AUTHORIZATION', '')
+        if not authorization.startswith('Bearer '):
+            return False
+        with mock_server.token_lock:
+            entry = mock_server.mock_data['tokens'].get(authorization.split(' ')[1])
+            return entry is not None and entry['expires_at'] > datetime.now()
+
+    @staticmethod
+    async def read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] != 'http.request':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    def build_environ(scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin-1'),
+            'PATH_INFO': scope['path'].encode().decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            # Tells mock_server to hand injected latency and drip settings back instead of sleeping
+            'mock.async': True,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1')
+            value = value.decode('latin-1')
+            if name == 'content-type':
+                key = 'CONTENT_TYPE'
+            elif name == 'content-length':
+                continue
+            else:
+                key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+        # The body has already been read in full (and de-chunked) by the ASGI server
+        environ['CONTENT_LENGTH'] = str(len(body))
+        return environ
+
+    def call_wsgi(self, environ):
+        """Run the Flask app on `environ`; return (status, ASGI headers, body bytes)"""
+        started = {}
+        chunks = []
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+            return chunks.append
+
+        iterable = self.wsgi_app(environ, start_response)
+        try:
+            chunks.extend(iterable)
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+        return started['status'], started['headers'], b''.join(chunks)
+
+app = MockASGIApp()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the mock UKG API over ASGI')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=8, help='Handler threads')
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit('ASGI mode needs an ASGI server: pip install uvicorn')
+
+    if os.getenv('MOCK_SNAPSHOT_RESTORE'):
+        restored = mock_server.restore_snapshot(os.environ['MOCK_SNAPSHOT_RESTORE'])
+        logging.info('Restored %d records from %s', restored, os.environ['MOCK_SNAPSHOT_RESTORE'])
+    uvicorn.run(MockASGIApp(workers=args.workers), host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
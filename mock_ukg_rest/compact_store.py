@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Compact columnar record storage for high-volume mock UKG collections
+
+A ColumnarCollection behaves like the plain `{id: record}` dicts in
+`mock_data`, but keeps one column per field instead of one dict per record.
+Float columns are packed into `array('d')`, repeated strings are interned,
+and records are materialized on access as RecordView dicts that write
+changes back to the columns, so route handlers need no changes.
+"""
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+# High-volume resources that benefit most from columnar storage
+DEFAULT_COMPACT_COLLECTIONS = ('pay_stubs', 'timesheets', 'attendance_records', 'taxes')
+
+class _Missing:
+    """Marker for a field a record does not have; pickles by reference so snapshots keep identity"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+MISSING = _Missing()
+MAX_INTERNED_LENGTH = 64
+
+class RecordView(dict):
+    """A materialized record; mutations are mirrored into the owning collection"""
+    __slots__ = ('_collection', '_key')
+
+    def __init__(self, collection, key, values):
+        dict.__init__(self, values)
+        self._collection = collection
+        self._key = key
+
+    def __setitem__(self, field, value):
+        dict.__setitem__(self, field, value)
+        self._collection._set_field(self._key, field, value)
+
+    def __delitem__(self, field):
+        dict.__delitem__(self, field)
+        self._collection._set_field(self._key, field, MISSING)
+
+    def update(self, *args, **kwargs):
+        for field, value in dict(*args, **kwargs).items():
+            self[field] = value
+
+    def setdefault(self, field, default=None):
+        if field not in self:
+            self[field] = default
+        return self[field]
+
+    def pop(self, field, *default):
+        if field in self:
+            value = dict.__getitem__(self, field)
+            del self[field]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(field)
+
+    def __reduce__(self):
+        # Pickle and copy as a plain dict, detached from the collection
+        return (dict, (dict(self),))
+
+class ColumnarCollection(MutableMapping):
+    def __init__(self, records=None):
+        self._columns = {}
+        self._index = {}
+        self._free_rows = []
+        self._row_count = 0
+        if records:
+            self.update(records)
+
+    @staticmethod
+    def _compact(value):
+        if type(value) is str and len(value) <= MAX_INTERNED_LENGTH:
+            return sys.intern(value)
+        return value
+
+    def _store(self, field, row, value):
+        column = self._columns[field]
+        if type(column) is array:
+            if type(value) is float:
+                column[row] = value
+                return
+            # Non-float value (or a missing field): fall back to a generic column
+            column = self._columns[field] = list(column)
+        column[row] = self._compact(value)
+
+    def _new_column(self, value):
+        # Packed floats are only safe while no other live record needs a missing value
+        if type(value) is float and len(self._index) <= 1:
+            return array('d', bytes(8 * self._row_count))
+        return [MISSING] * self._row_count
+
+    def _set_field(self, key, field, value):
+        row = self._index.get(key)
+        if row is None:
+            return
+        if field not in self._columns:
+            if value is MISSING:
+                return
+            self._columns[field] = self._new_column(value)
+        self._store(field, row, value)
+
+    def __setitem__(self, key, record):
+        row = self._index.get(key)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = self._row_count
+                self._row_count += 1
+                for column in self._columns.values():
+                    column.append(0.0 if type(column) is array else MISSING)
+            self._index[sys.intern(key) if type(key) is str else key] = row
+        for field, value in record.items():
+            if field not in self._columns:
+                self._columns[field] = self._new_column(value)
+        for field in self._columns:
+            self._store(field, row, record.get(field, MISSING))
+
+    def __getitem__(self, key):
+        row = self._index[key]
+        values = {}
+        for field, column in self._columns.items():
+            value = column[row]
+            if value is not MISSING:
+                values[field] = value
+        return RecordView(self, key, values)
+
+    def __delitem__(self, key):
+        self._free_rows.append(self._index.pop(key))
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def clear(self):
+        self._columns = {}
+        self._index = {}
+        self._free_rows = []
+        self._row_count = 0
+
+    def __repr__(self):
+        return f'ColumnarCollection({len(self)} records, {len(self._columns)} columns)'
+
+def enable_compact_storage(store, collections=DEFAULT_COMPACT_COLLECTIONS):
+    """Swap the named collections in `store` for columnar ones, keeping existing records"""
+    for name in collections:
+        if not isinstance(store[name], ColumnarCollection):
+            store[name] = ColumnarCollection(store[name])
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic data generator for the mock UKG REST API
+Builds large, internally consistent datasets directly into the mock server's store
+"""
+
+import argparse
+import itertools
+import random
+import time
+from datetime import date, timedelta
+
+FIRST_NAMES = ['John', 'Jane', 'Bob', 'Alice', 'Maria', 'Wei', 'Priya', 'Carlos', 'Fatima', 'Liam',
+               'Olivia', 'Noah', 'Emma', 'Ahmed', 'Yuki', 'Sofia', 'Mateo', 'Aisha', 'Lucas', 'Chloe']
+LAST_NAMES = ['Doe', 'Smith', 'Johnson', 'Garcia', 'Chen', 'Patel', 'Nguyen', 'Kim', 'Brown', 'Lopez',
+              'Williams', 'Khan', 'Silva', 'Müller', 'Rossi', 'Tanaka', 'Okafor', 'Cohen', 'Novak', 'Davis']
+DEPARTMENTS = [
+    ('DEPT001', 'Engineering', 'CC-ENG-001', 'Software Engineer', 48.0),
+    ('DEPT002', 'Human Resources', 'CC-HR-001', 'HR Generalist', 34.0),
+    ('DEPT003', 'Operations', 'CC-OPS-001', 'Operations Associate', 27.0),
+    ('DEPT004', 'Finance', 'CC-FIN-001', 'Financial Analyst', 40.0),
+    ('DEPT005', 'Sales', 'CC-SAL-001', 'Account Executive', 36.0),
+]
+LOCATIONS = ['LOC001', 'LOC002', 'LOC003']
+TIME_OFF_TYPES = ['vacation', 'sick', 'personal']
+DEDUCTION_TYPES = [('Health Insurance', 0.03), ('401k', 0.05)]
+TAX_TYPES = [('Federal Income Tax', 0.12), ('Social Security', 0.062), ('Medicare', 0.0145)]
+
+# Collections written by the generator, in dependency order
+GENERATED_COLLECTIONS = ('companies', 'departments', 'org_units', 'employees', 'timesheets',
+                         'time_off_requests', 'payroll_runs', 'pay_stubs', 'deductions', 'taxes')
+
+class SyntheticDataGenerator:
+    """
+    Generates employees with correlated timesheets, time-off requests, pay stubs,
+    deductions and taxes. The same seed always produces the same records and IDs.
+    """
+
+    def __init__(self, seed=0, start_date=date(2024, 1, 7), weeks=4, companies=2):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.start_date = start_date
+        self.weeks = weeks
+        self.companies = companies
+        self._sequence = itertools.count(1)
+
+    def _id_factory(self):
+        # UUID-shaped, deterministic and far cheaper than uuid4()
+        prefix = '%08x-0000-4000-8000-' % (self.seed & 0xffffffff)
+        sequence = self._sequence
+        return lambda: f'{prefix}{next(sequence):012x}'
+
+    def populate(self, store, employees=1000):
+        """Write `employees` employees and their related records into `store`; return per-collection counts"""
+        rng = self.rng
+        next_id = self._id_factory()
+        created_at = self.start_date.isoformat() + 'T00:00:00'
+        counts = dict.fromkeys(GENERATED_COLLECTIONS, 0)
+
+        companies = store['companies']
+        company_ids = []
+        for n in range(self.companies):
+            company = {'id': next_id(), 'name': f'Synthetic Company {n + 1}', 'industry': 'Technology',
+                       'size': 'Large', 'created_at': created_at}
+            companies[company['id']] = company
+            company_ids.append(company['id'])
+        counts['companies'] = len(company_ids)
+
+        departments = store['departments']
+        org_units = store['org_units']
+        for dept_id, name, cost_center, _, _ in DEPARTMENTS:
+            departments[dept_id] = {'id': dept_id, 'name': name, 'description': name, 'manager_id': None,
+                                    'company_id': company_ids[0], 'cost_center': cost_center}
+            for location_id in LOCATIONS:
+                unit_id = f'{dept_id}-{location_id}'
+                org_units[unit_id] = {'id': unit_id, 'name': f'{name} ({location_id})', 'type': 'team',
+                                      'parent_id': dept_id, 'department_id': dept_id, 'location_id': location_id}
+                counts['org_units'] += 1
+        counts['departments'] = len(DEPARTMENTS)
+
+        # Weekly timesheets; two weeks form a pay period
+        week_endings = [(self.start_date + timedelta(days=6 + 7 * w)).isoformat() for w in range(self.weeks)]
+        pay_periods = []
+        for p in range(self.weeks // 2):
+            period_start = self.start_date + timedelta(days=14 * p)
+            pay_periods.append((period_start.isoformat(), (period_start + timedelta(days=13)).isoformat(),
+                                (period_start + timedelta(days=18)).isoformat()))
+
+        payroll_runs = store['payroll_runs']
+        run_ids = []
+        for period_start, period_end, pay_date in pay_periods:
+            run = {'id': next_id(), 'company_id': company_ids[0], 'pay_period_start': period_start,
+                   'pay_period_end': period_end, 'pay_date': pay_date, 'status': 'completed',
+                   'run_type': 'regular', 'total_employees': employees, 'created_at': created_at}
+            payroll_runs[run['id']] = run
+            run_ids.append(run['id'])
+        counts['payroll_runs'] = len(run_ids)
+
+        employee_store = store['employees']
+        timesheets = store['timesheets']
+        time_off_requests = store['time_off_requests']
+        pay_stubs = store['pay_stubs']
+        deductions = store['deductions']
+        taxes = store['taxes']
+        random_ = rng.random
+        choice = rng.choice
+        first_day = self.start_date.toordinal()
+
+        for n in range(employees):
+            dept_id, dept_name, _, job_title, base_rate = choice(DEPARTMENTS)
+            rate = round(base_rate * (0.8 + 0.4 * random_()), 2)
+            employee_id = next_id()
+            first_name = choice(FIRST_NAMES)
+            last_name = choice(LAST_NAMES)
+            employee_store[employee_id] = {
+                'id': employee_id,
+                'employee_id': f'EMP{n + 1:07d}',
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': f'{first_name.lower()}.{last_name.lower()}{n + 1}@example.com',
+                'company_id': company_ids[n % len(company_ids)],
+                'department': dept_name,
+                'department_id': dept_id,
+                'location_id': LOCATIONS[n % len(LOCATIONS)],
+                'job_title': job_title,
+                'hourly_rate': rate,
+                'hire_date': date.fromordinal(first_day - 30 - int(random_() * 3650)).isoformat(),
+                'status': 'active',
+                'created_at': created_at,
+            }
+
+            # Hours worked drive each pay stub, which in turn drives deductions and taxes
+            weekly_hours = []
+            for week_ending in week_endings:
+                overtime = 0.0 if random_() < 0.8 else float(int(random_() * 8) + 1)
+                regular = 40.0 if random_() < 0.9 else float(32 + int(random_() * 8))
+                weekly_hours.append((regular, overtime))
+                timesheet_id = next_id()
+                timesheets[timesheet_id] = {
+                    'id': timesheet_id, 'employee_id': employee_id, 'week_ending': week_ending,
+                    'total_hours': regular + overtime, 'regular_hours': regular, 'overtime_hours': overtime,
+                    'status': 'approved', 'created_at': created_at,
+                }
+
+            for p, (period_start, period_end, pay_date) in enumerate(pay_periods):
+                regular = weekly_hours[2 * p][0] + weekly_hours[2 * p + 1][0]
+                overtime = weekly_hours[2 * p][1] + weekly_hours[2 * p + 1][1]
+                gross = round(rate * (regular + 1.5 * overtime), 2)
+                withheld = 0.0
+                for deduction_type, share in DEDUCTION_TYPES:
+                    amount = round(gross * share, 2)
+                    withheld += amount
+                    deduction_id = next_id()
+                    deductions[deduction_id] = {
+                        'id': deduction_id, 'employee_id': employee_id, 'payroll_run_id': run_ids[p],
+                        'deduction_type': deduction_type, 'amount': amount, 'pre_tax': True,
+                        'created_at': created_at,
+                    }
+                taxable = round(gross - withheld, 2)
+                for tax_type, tax_rate in TAX_TYPES:
+                    amount = round(taxable * tax_rate, 2)
+                    withheld += amount
+                    tax_id = next_id()
+                    taxes[tax_id] = {
+                        'id': tax_id, 'employee_id': employee_id, 'payroll_run_id': run_ids[p],
+                        'tax_type': tax_type, 'amount': amount, 'taxable_wages': taxable,
+                        'created_at': created_at,
+                    }
+                stub_id = next_id()
+                pay_stubs[stub_id] = {
+                    'id': stub_id, 'employee_id': employee_id, 'payroll_run_id': run_ids[p],
+                    'pay_period_start': period_start, 'pay_period_end': period_end, 'pay_date': pay_date,
+                    'gross_pay': gross, 'net_pay': round(gross - withheld, 2),
+                    'regular_hours': regular, 'overtime_hours': overtime, 'created_at': created_at,
+                }
+
+            if random_() < 0.5:
+                start = date.fromordinal(first_day + int(random_() * 7 * self.weeks))
+                days = 1 + int(random_() * 5)
+                request_id = next_id()
+                time_off_requests[request_id] = {
+                    'id': request_id, 'employee_id': employee_id, 'type': choice(TIME_OFF_TYPES),
+                    'start_date': start.isoformat(), 'end_date': (start + timedelta(days=days - 1)).isoformat(),
+                    'days_requested': days, 'status': 'approved' if random_() < 0.7 else 'pending',
+                    'created_at': created_at,
+                }
+                counts['time_off_requests'] += 1
+
+        per_period = len(pay_periods)
+        counts['employees'] = employees
+        counts['timesheets'] = employees * len(week_endings)
+        counts['pay_stubs'] = employees * per_period
+        counts['deductions'] = employees * per_period * len(DEDUCTION_TYPES)
+        counts['taxes'] = employees * per_period * len(TAX_TYPES)
+        return counts
+
+def main():
+    import requests
+
+    parser = argparse.ArgumentParser(description='Seed the mock UKG server with synthetic data')
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--weeks', type=int, default=4)
+    parser.add_argument('--reset', action='store_true', help='Clear generated collections first')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    response = requests.post(f'{args.url}/admin/seed', json={
+        'employees': args.employees, 'seed': args.seed, 'weeks': args.weeks, 'reset': args.reset
+    })
+    response.raise_for_status()
+    result = response.json()
+    print(f"✓ Seeded {result['total_records']} records in {time.perf_counter() - started:.2f}s")
+    for collection, count in result['counts'].items():
+        print(f"  • {count} {collection}")
+
+if __name__ == '__main__':
+    main()
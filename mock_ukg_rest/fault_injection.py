@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Latency and fault-injection profiles for the mock UKG REST API server
+
+A profile is a JSON (or YAML, when PyYAML is installed) document such as:
+
+    {
+        "seed": 42,
+        "default": {"latency": {"distribution": "fixed", "ms": 5}},
+        "routes": [
+            {
+                "match": "/api/v2/client/employees*",
+                "methods": ["GET"],
+                "latency": {"distribution": "long_tail", "median_ms": 20, "sigma": 1.2, "max_ms": 2000},
+                "errors": {"429": 0.05, "503": 0.01},
+                "retry_after": 2,
+                "drip": {"chunk_bytes": 512, "interval_ms": 10}
+            }
+        ]
+    }
+
+Routes are matched in order with shell-style patterns against the request
+path; the first match wins and `default` applies otherwise.
+"""
+
+import fnmatch
+import json
+import random
+import threading
+import time
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'normal', 'long_tail')
+
+class FaultProfile:
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.seed = self.config.get('seed')
+        self.rules = [self._validate_rule(rule) for rule in self.config.get('routes', [])]
+        self.default = self._validate_rule(self.config.get('default', {}))
+        self.rng = random.Random(self.seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a profile from a JSON or YAML file"""
+        with open(path) as f:
+            if path.endswith(('.yaml', '.yml')):
+                import yaml
+                return cls(yaml.safe_load(f))
+            return cls(json.load(f))
+
+    @staticmethod
+    def _validate_rule(rule):
+        latency = rule.get('latency')
+        if latency and latency.get('distribution', 'fixed') not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency.get('distribution')}")
+        for status, probability in rule.get('errors', {}).items():
+            if int(status) not in (429, 503):
+                raise ValueError(f'Only 429 and 503 faults are supported, got {status}')
+            if not 0 <= float(probability) <= 1:
+                raise ValueError(f'Fault probability must be between 0 and 1, got {probability}')
+        return rule
+
+    def reseed(self, seed=None):
+        with self.lock:
+            self.seed = seed if seed is not None else self.seed
+            self.rng = random.Random(self.seed)
+
+    def match(self, method, path):
+        for rule in self.rules:
+            if rule.get('methods') and method not in rule['methods']:
+                continue
+            if fnmatch.fnmatchcase(path, rule.get('match', '*')):
+                return rule
+        return self.default
+
+    def sample_latency(self, rule):
+        """Return the injected delay for a request in seconds"""
+        latency = rule.get('latency')
+        if not latency:
+            return 0.0
+        distribution = latency.get('distribution', 'fixed')
+        with self.lock:
+            if distribution == 'fixed':
+                ms = latency.get('ms', 0)
+            elif distribution == 'normal':
+                ms = self.rng.gauss(latency.get('mean_ms', 0), latency.get('stddev_ms', 0))
+            else:
+                ms = self.rng.lognormvariate(0, latency.get('sigma', 1.0)) * latency.get('median_ms', 0)
+        ms = min(max(ms, 0), latency.get('max_ms', float('inf')))
+        return ms / 1000.0
+
+    def sample_fault(self, rule):
+        """Return 429, 503 or None for a request"""
+        errors = rule.get('errors')
+        if not errors:
+            return None
+        with self.lock:
+            roll = self.rng.random()
+        threshold = 0.0
+        for status, probability in sorted(errors.items()):
+            threshold += float(probability)
+            if roll < threshold:
+                return int(status)
+        return None
+
+    def drip(self, rule, body):
+        """Yield `body` in chunks, sleeping between them, for slow-drip responses"""
+        for delay, chunk in drip_chunks(rule['drip'], body):
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    def to_dict(self):
+        return dict(self.config, seed=self.seed)
+
+def drip_chunks(drip, body):
+    """Split `body` per a rule's `drip` settings into (delay before chunk in seconds, chunk) pairs"""
+    chunk_bytes = max(int(drip.get('chunk_bytes', 256)), 1)
+    interval = drip.get('interval_ms', 10) / 1000.0
+    for offset in range(0, len(body), chunk_bytes):
+        yield (interval if offset else 0.0), body[offset:offset + chunk_bytes]
@@ -4,14 +4,47 @@ Mock UKG REST API Server
 Implements all endpoints from ukg_api_client.py for testing purposes
 """
 
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, request, jsonify, make_response, g, Response, has_request_context, abort
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime, timedelta
 import uuid
 import base64
 import json
 import logging
+import heapq
+import math
+import os
+import threading
+import time
+import zlib
+import pickle
+from collections import defaultdict, OrderedDict
+from functools import wraps
+from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor
+
+from fault_injection import FaultProfile
+from data_generator import SyntheticDataGenerator, GENERATED_COLLECTIONS
+from compact_store import enable_compact_storage, ColumnarCollection, DEFAULT_COMPACT_COLLECTIONS
+from snapshot import dump_snapshot, load_snapshot, resolve_snapshot_name, EXCLUDED_COLLECTIONS
+from ring_buffer import RingBuffer
+from route_stats import UNMATCHED_ROUTE, RouteStats
+from rate_limiter import RateLimiter
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default JSON provider that accumulates serialization time per request for /admin/stats"""
+    
+    def dumps(self, obj, **kwargs):
+        if not has_request_context():
+            return super().dumps(obj, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            g.serialize_seconds = g.get('serialize_seconds', 0.0) + time.perf_counter() - started
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 logging.basicConfig(level=logging.INFO)
 
 # Mock data storage
@@ -40,14 +73,84 @@ mock_data = {
     'signature_tasks': {},
     'webhooks': {},
     'bulk_jobs': {},
-    'audit_logs': {},
     'org_units': {}
 }
 
+# /admin/snapshot and /admin/restore only read and write named files in this directory
+SNAPSHOT_DIR = os.getenv('MOCK_SNAPSHOT_DIR', 'snapshots')
+DEFAULT_SNAPSHOT_NAME = 'mock_snapshot.pkl'
+# Held while a snapshot is taken or restored, so neither sees the other half done
+snapshot_lock = threading.Lock()
+
+# Optional columnar storage for high-volume resources:
+# MOCK_COMPACT_STORAGE=1 for the defaults, or a comma-separated list of collections
+compact_setting = os.getenv('MOCK_COMPACT_STORAGE', '').strip()
+if compact_setting.lower() in ('1', 'true', 'yes'):
+    enable_compact_storage(mock_data, DEFAULT_COMPACT_COLLECTIONS)
+elif compact_setting:
+    enable_compact_storage(mock_data, [name.strip() for name in compact_setting.split(',') if name.strip()])
+
+# Token store limits; tokens are evicted in expiry order via a min-heap
+TOKEN_TTL_SECONDS = int(os.getenv('MOCK_TOKEN_TTL_SECONDS', '3600'))
+MAX_TOKENS = int(os.getenv('MOCK_MAX_TOKENS', '10000'))
+TOKEN_SWEEP_BATCH = 100
+
+token_expiry_heap = []
+token_lock = threading.Lock()
+
+# Per-collection version counters; bumped on every write and used to derive ETags
+collection_versions = defaultdict(int)
+version_lock = threading.Lock()
+
+# Sequence-numbered change feed served by /api/v2/client/events; the oldest events are overwritten
+change_log = RingBuffer(int(os.getenv('MOCK_CHANGE_LOG_SIZE', '100000')))
+change_condition = threading.Condition()
+# Callables run after every change, from whichever thread made it (used by the ASGI server)
+change_listeners = []
+MAX_EVENTS_PAGE = 1000
+MAX_EVENTS_WAIT_SECONDS = 30
+
+def record_change(collection, action='reset', record_id=None, record=None):
+    """
+    Bump the collection's version and append a change event. `action` is
+    created/updated/deleted for single records, or reset when a whole
+    collection was replaced (seeding, snapshot restore)
+    """
+    with version_lock:
+        collection_versions[collection] += 1
+    change_log.append(lambda seq: {
+        'seq': seq,
+        'collection': collection,
+        'action': action,
+        'id': record_id,
+        'record': dict(record) if record is not None else None,
+        'timestamp': datetime.now().isoformat()
+    })
+    with change_condition:
+        change_condition.notify_all()
+    for listener in change_listeners:
+        listener()
+
 def generate_id():
     return str(uuid.uuid4())
 
+def requested_fields():
+    """Parse the sparse fieldset from `?fields=a,b,c`; None means the full record"""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+def project_fields(record, fields=None):
+    fields = fields or requested_fields()
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
 def create_paginated_response(data, cursor=None):
+    fields = requested_fields()
+    if fields:
+        data = [project_fields(record, fields) for record in data]
     return {
         'data': data,
         'pagination': {
@@ -56,6 +159,213 @@ def create_paginated_response(data, cursor=None):
         }
     }
 
+def evict_expired_tokens(now, limit=TOKEN_SWEEP_BATCH):
+    """Drop up to `limit` expired tokens from the front of the expiry heap"""
+    tokens = mock_data['tokens']
+    evicted = 0
+    while token_expiry_heap and evicted < limit:
+        expires_at, token = token_expiry_heap[0]
+        if expires_at > now:
+            break
+        heapq.heappop(token_expiry_heap)
+        entry = tokens.get(token)
+        if entry is not None and entry['expires_at'] == expires_at:
+            del tokens[token]
+        evicted += 1
+    return evicted
+
+def issue_token():
+    now = datetime.now()
+    token = generate_id()
+    expires_at = now + timedelta(seconds=TOKEN_TTL_SECONDS)
+    with token_lock:
+        evict_expired_tokens(now)
+        # Store is full of live tokens: drop the ones closest to expiry
+        while len(mock_data['tokens']) >= MAX_TOKENS and token_expiry_heap:
+            _, oldest = heapq.heappop(token_expiry_heap)
+            mock_data['tokens'].pop(oldest, None)
+        mock_data['tokens'][token] = {'expires_at': expires_at}
+        heapq.heappush(token_expiry_heap, (expires_at, token))
+    return token
+
+class ResponseCache:
+    """LRU cache of encoded GET response bodies, stamped with the collection version they were built from"""
+    
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key, version, body):
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous[1])
+            self.entries[key] = (version, body)
+            self.total_bytes += len(body)
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+                self.evictions += 1
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+response_cache = ResponseCache(int(os.getenv('MOCK_RESPONSE_CACHE_SIZE', '1024')),
+                               int(os.getenv('MOCK_RESPONSE_CACHE_BYTES', str(256 * 1024 * 1024))))
+
+def current_etag(collection):
+    """Weak ETag for the current representation: collection version plus path and query"""
+    representation = zlib.crc32(request.full_path.encode())
+    return f'W/"{collection}-{collection_versions[collection]}-{representation:08x}"'
+
+def versioned(collection):
+    """
+    Emit ETags on GET responses, answer 304 Not Modified when If-None-Match still matches,
+    and serve unchanged representations from the pre-serialized response cache
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            etag = current_etag(collection)
+            if_none_match = [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]
+            if etag in if_none_match and require_auth():
+                return '', 304, {'ETag': etag}
+            
+            version = collection_versions[collection]
+            cache_key = (collection, request.full_path)
+            body = response_cache.get(cache_key, version) if require_auth() else None
+            if body is not None:
+                return app.response_class(body, mimetype='application/json', headers={'ETag': etag})
+            
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.headers['ETag'] = current_etag(collection)
+                # Only cache bodies built from a version no write raced with
+                if collection_versions[collection] == version and not response.is_streamed:
+                    response_cache.put(cache_key, version, response.get_data())
+            return response
+        return wrapper
+    return decorator
+
+# Request audit log: one entry per API request in a fixed-size ring buffer, served by /audit/logs
+audit_log = RingBuffer(int(os.getenv('MOCK_AUDIT_LOG_SIZE', '10000')))
+MAX_AUDIT_PAGE = 1000
+
+# Per-route handler/serialization timings and response sizes, served by /admin/stats and /admin/metrics
+route_stats = RouteStats()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    if request.path.startswith('/admin/') or 'request_started' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    latency_ms = round(elapsed * 1000, 3)
+    route = request.url_rule.rule if request.url_rule else UNMATCHED_ROUTE
+    # Injected latency is deliberate, so it is left out of the handler time
+    serialize_seconds = g.get('serialize_seconds', 0.0)
+    handler_seconds = elapsed - serialize_seconds - g.get('injected_delay', 0.0)
+    route_stats.record(request.method, route, response.status_code,
+                       handler_seconds * 1000, serialize_seconds * 1000, response.content_length)
+    audit_log.append(lambda seq: {
+        'id': str(seq),
+        'timestamp': datetime.now().isoformat(),
+        'method': request.method,
+        'path': request.path,
+        'route': route,
+        'status': response.status_code,
+        'latency_ms': latency_ms,
+        'response_bytes': response.content_length,
+        'remote_addr': request.remote_addr
+    })
+    return response
+
+# Per-token quotas, configured via MOCK_RATE_LIMITS or /admin/rate-limits; unlimited when unset
+rate_limiter = RateLimiter.from_file(os.environ['MOCK_RATE_LIMITS']) if os.getenv('MOCK_RATE_LIMITS') else None
+
+@app.after_request
+def add_rate_limit_headers(response):
+    decision = g.get('rate_limit')
+    if decision is not None:
+        response.headers.update(decision.headers())
+    return response
+
+# Latency / fault injection, configured via MOCK_FAULT_PROFILE or /admin/fault-profile
+fault_profile = FaultProfile.from_file(os.environ['MOCK_FAULT_PROFILE']) if os.getenv('MOCK_FAULT_PROFILE') else None
+
+@app.before_request
+def inject_faults():
+    g.fault_rule = None
+    if fault_profile is None or request.path.startswith('/admin/'):
+        return None
+    rule = fault_profile.match(request.method, request.path)
+    delay = fault_profile.sample_latency(rule)
+    if delay and request.environ.get('mock.async'):
+        # Served by asgi_server.py, which waits without blocking a thread
+        request.environ['mock.injected_delay'] = delay
+    elif delay:
+        time.sleep(delay)
+        g.injected_delay = delay
+    status = fault_profile.sample_fault(rule)
+    if status:
+        retry_after = str(rule.get('retry_after', 1))
+        message = 'Too Many Requests' if status == 429 else 'Service Unavailable'
+        return jsonify({'error': message}), status, {'Retry-After': retry_after}
+    g.fault_rule = rule
+    return None
+
+@app.after_request
+def drip_response(response):
+    rule = g.get('fault_rule')
+    if not rule or not rule.get('drip') or response.direct_passthrough or response.is_streamed:
+        return response
+    if request.environ.get('mock.async'):
+        request.environ['mock.drip'] = rule['drip']
+        return response
+    body = response.get_data()
+    dripped = Response(fault_profile.drip(rule, body), status=response.status_code, headers=response.headers)
+    dripped.headers['Content-Length'] = str(len(body))
+    return dripped
+
 # Authentication endpoint
 @app.route('/api/v2/client/tokens', methods=['POST'])
 def authenticate():
@@ -63,15 +373,12 @@ def authenticate():
     if not auth_header or not auth_header.startswith('Basic '):
         return jsonify({'error': 'Invalid authentication'}), 401
     
-    token = generate_id()
-    mock_data['tokens'][token] = {
-        'expires_at': datetime.now() + timedelta(hours=1)
-    }
+    token = issue_token()
     
     return jsonify({
         'access_token': token,
         'token_type': 'Bearer',
-        'expires_in': 3600
+        'expires_in': TOKEN_TTL_SECONDS
     })
 
 def require_auth():
@@ -79,7 +386,23 @@ def require_auth():
     if not auth_header or not auth_header.startswith('Bearer '):
         return False
     token = auth_header.split(' ')[1]
-    return token in mock_data['tokens']
+    now = datetime.now()
+    with token_lock:
+        evict_expired_tokens(now)
+        entry = mock_data['tokens'].get(token)
+        if entry is None:
+            return False
+        if entry['expires_at'] <= now:
+            del mock_data['tokens'][token]
+            return False
+    
+    # Count each request once against the token's quota, however often its handler checks auth
+    if rate_limiter is not None and 'rate_limit' not in g:
+        g.rate_limit = rate_limiter.check(token, request.method, request.path)
+        if g.rate_limit is not None and not g.rate_limit.allowed:
+            abort(make_response(jsonify({'error': 'Too Many Requests', 'retry_after': g.rate_limit.retry_after}),
+                                429, g.rate_limit.headers()))
+    return True
 
 # Health check
 @app.route('/api/v2/client/health', methods=['GET'])
@@ -90,6 +413,7 @@ def health_check():
 
 # Document Management Endpoints
 @app.route('/api/v2/client/documents/company-document-types', methods=['GET', 'POST'])
+@versioned('document_types')
 def company_document_types():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -106,9 +430,11 @@ def company_document_types():
         doc_type['id'] = generate_id()
         doc_type['created_at'] = datetime.now().isoformat()
         mock_data['document_types'][doc_type['id']] = doc_type
+        record_change('document_types', 'created', doc_type['id'], doc_type)
         return jsonify(doc_type), 201
 
 @app.route('/api/v2/client/documents/company-document-types/<doc_type_id>', methods=['GET', 'PUT', 'DELETE'])
+@versioned('document_types')
 def company_document_type(doc_type_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -117,19 +443,22 @@ def company_document_type(doc_type_id):
         return jsonify({'error': 'Document type not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['document_types'][doc_type_id])
+        return jsonify(project_fields(mock_data['document_types'][doc_type_id]))
     
     elif request.method == 'PUT':
         doc_type = mock_data['document_types'][doc_type_id]
         doc_type.update(request.json)
         doc_type['updated_at'] = datetime.now().isoformat()
+        record_change('document_types', 'updated', doc_type_id, doc_type)
         return jsonify(doc_type)
     
     elif request.method == 'DELETE':
         del mock_data['document_types'][doc_type_id]
+        record_change('document_types', 'deleted', doc_type_id)
         return '', 204
 
 @app.route('/api/v2/client/documents/company-documents', methods=['GET', 'POST'])
+@versioned('company_documents')
 def company_documents():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -143,9 +472,11 @@ def company_documents():
         doc['id'] = generate_id()
         doc['created_at'] = datetime.now().isoformat()
         mock_data['company_documents'][doc['id']] = doc
+        record_change('company_documents', 'created', doc['id'], doc)
         return jsonify(doc), 201
 
 @app.route('/api/v2/client/documents/company-documents/<doc_id>', methods=['GET', 'PUT', 'DELETE'])
+@versioned('company_documents')
 def company_document(doc_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -154,19 +485,22 @@ def company_document(doc_id):
         return jsonify({'error': 'Document not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['company_documents'][doc_id])
+        return jsonify(project_fields(mock_data['company_documents'][doc_id]))
     
     elif request.method == 'PUT':
         doc = mock_data['company_documents'][doc_id]
         doc.update(request.json)
         doc['updated_at'] = datetime.now().isoformat()
+        record_change('company_documents', 'updated', doc_id, doc)
         return jsonify(doc)
     
     elif request.method == 'DELETE':
         del mock_data['company_documents'][doc_id]
+        record_change('company_documents', 'deleted', doc_id)
         return '', 204
 
 @app.route('/api/v2/client/documents/company-folders', methods=['GET', 'POST'])
+@versioned('company_folders')
 def company_folders():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -180,9 +514,11 @@ def company_folders():
         folder['id'] = generate_id()
         folder['created_at'] = datetime.now().isoformat()
         mock_data['company_folders'][folder['id']] = folder
+        record_change('company_folders', 'created', folder['id'], folder)
         return jsonify(folder), 201
 
 @app.route('/api/v2/client/documents/company-folders/<folder_id>', methods=['GET', 'PUT', 'DELETE'])
+@versioned('company_folders')
 def company_folder(folder_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -191,20 +527,23 @@ def company_folder(folder_id):
         return jsonify({'error': 'Folder not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['company_folders'][folder_id])
+        return jsonify(project_fields(mock_data['company_folders'][folder_id]))
     
     elif request.method == 'PUT':
         folder = mock_data['company_folders'][folder_id]
         folder.update(request.json)
         folder['updated_at'] = datetime.now().isoformat()
+        record_change('company_folders', 'updated', folder_id, folder)
         return jsonify(folder)
     
     elif request.method == 'DELETE':
         del mock_data['company_folders'][folder_id]
+        record_change('company_folders', 'deleted', folder_id)
         return '', 204
 
 # Employee Management Endpoints
 @app.route('/api/v2/client/employees', methods=['GET', 'POST'])
+@versioned('employees')
 def employees():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -218,9 +557,11 @@ def employees():
         employee['id'] = generate_id()
         employee['created_at'] = datetime.now().isoformat()
         mock_data['employees'][employee['id']] = employee
+        record_change('employees', 'created', employee['id'], employee)
         return jsonify(employee), 201
 
 @app.route('/api/v2/client/employees/<employee_id>', methods=['GET', 'PUT', 'DELETE'])
+@versioned('employees')
 def employee(employee_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -229,20 +570,23 @@ def employee(employee_id):
         return jsonify({'error': 'Employee not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['employees'][employee_id])
+        return jsonify(project_fields(mock_data['employees'][employee_id]))
     
     elif request.method == 'PUT':
         emp = mock_data['employees'][employee_id]
         emp.update(request.json)
         emp['updated_at'] = datetime.now().isoformat()
+        record_change('employees', 'updated', employee_id, emp)
         return jsonify(emp)
     
     elif request.method == 'DELETE':
         del mock_data['employees'][employee_id]
+        record_change('employees', 'deleted', employee_id)
         return '', 204
 
 # Time & Attendance Endpoints
 @app.route('/api/v2/client/time-off/requests', methods=['GET', 'POST'])
+@versioned('time_off_requests')
 def time_off_requests():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -260,9 +604,11 @@ def time_off_requests():
         request_obj['status'] = 'pending'
         request_obj['created_at'] = datetime.now().isoformat()
         mock_data['time_off_requests'][request_obj['id']] = request_obj
+        record_change('time_off_requests', 'created', request_obj['id'], request_obj)
         return jsonify(request_obj), 201
 
 @app.route('/api/v2/client/time-off/requests/<request_id>', methods=['GET', 'PUT'])
+@versioned('time_off_requests')
 def time_off_request(request_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -271,12 +617,13 @@ def time_off_request(request_id):
         return jsonify({'error': 'Request not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['time_off_requests'][request_id])
+        return jsonify(project_fields(mock_data['time_off_requests'][request_id]))
     
     elif request.method == 'PUT':
         req = mock_data['time_off_requests'][request_id]
         req.update(request.json)
         req['updated_at'] = datetime.now().isoformat()
+        record_change('time_off_requests', 'updated', request_id, req)
         return jsonify(req)
 
 @app.route('/api/v2/client/time-off/requests/<request_id>/approve', methods=['POST'])
@@ -290,6 +637,7 @@ def approve_time_off_request(request_id):
     req = mock_data['time_off_requests'][request_id]
     req['status'] = 'approved'
     req['approved_at'] = datetime.now().isoformat()
+    record_change('time_off_requests', 'updated', request_id, req)
     return jsonify(req)
 
 @app.route('/api/v2/client/time-off/requests/<request_id>/reject', methods=['POST'])
@@ -303,9 +651,11 @@ def reject_time_off_request(request_id):
     req = mock_data['time_off_requests'][request_id]
     req['status'] = 'rejected'
     req['rejected_at'] = datetime.now().isoformat()
+    record_change('time_off_requests', 'updated', request_id, req)
     return jsonify(req)
 
 @app.route('/api/v2/client/time-off/accrual-balances', methods=['GET'])
+@versioned('accrual_balances')
 def accrual_balances():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -334,6 +684,7 @@ def accrual_balances():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/time-off/pto-plans', methods=['GET'])
+@versioned('pto_plans')
 def pto_plans():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -360,6 +711,7 @@ def pto_plans():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/time-attendance/timesheets', methods=['GET', 'POST'])
+@versioned('timesheets')
 def timesheets():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -383,6 +735,7 @@ def timesheets():
             }
             mock_data['timesheets'][sample_timesheet['id']] = sample_timesheet
             data = [sample_timesheet]
+            record_change('timesheets', 'created', sample_timesheet['id'], sample_timesheet)
         return jsonify(create_paginated_response(data))
     
     elif request.method == 'POST':
@@ -391,9 +744,11 @@ def timesheets():
         timesheet['status'] = 'draft'
         timesheet['created_at'] = datetime.now().isoformat()
         mock_data['timesheets'][timesheet['id']] = timesheet
+        record_change('timesheets', 'created', timesheet['id'], timesheet)
         return jsonify(timesheet), 201
 
 @app.route('/api/v2/client/time-attendance/timesheets/<timesheet_id>', methods=['GET', 'PUT'])
+@versioned('timesheets')
 def timesheet(timesheet_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -402,15 +757,17 @@ def timesheet(timesheet_id):
         return jsonify({'error': 'Timesheet not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['timesheets'][timesheet_id])
+        return jsonify(project_fields(mock_data['timesheets'][timesheet_id]))
     
     elif request.method == 'PUT':
         ts = mock_data['timesheets'][timesheet_id]
         ts.update(request.json)
         ts['updated_at'] = datetime.now().isoformat()
+        record_change('timesheets', 'updated', timesheet_id, ts)
         return jsonify(ts)
 
 @app.route('/api/v2/client/time-attendance/attendance-records', methods=['GET'])
+@versioned('attendance_records')
 def attendance_records():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -442,11 +799,13 @@ def attendance_records():
         ]
         for record in sample_records:
             mock_data['attendance_records'][record['id']] = record
+            record_change('attendance_records', 'created', record['id'], record)
         data = sample_records
     return jsonify(create_paginated_response(data))
 
 # Payroll Endpoints
 @app.route('/api/v2/client/payroll/runs', methods=['GET', 'POST'])
+@versioned('payroll_runs')
 def payroll_runs():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -460,9 +819,11 @@ def payroll_runs():
         payroll_run['id'] = generate_id()
         payroll_run['created_at'] = datetime.now().isoformat()
         mock_data['payroll_runs'][payroll_run['id']] = payroll_run
+        record_change('payroll_runs', 'created', payroll_run['id'], payroll_run)
         return jsonify(payroll_run), 201
 
 @app.route('/api/v2/client/payroll/runs/<run_id>', methods=['GET'])
+@versioned('payroll_runs')
 def payroll_run(run_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -470,9 +831,10 @@ def payroll_run(run_id):
     if run_id not in mock_data['payroll_runs']:
         return jsonify({'error': 'Payroll run not found'}), 404
     
-    return jsonify(mock_data['payroll_runs'][run_id])
+    return jsonify(project_fields(mock_data['payroll_runs'][run_id]))
 
 @app.route('/api/v2/client/payroll/pay-stubs', methods=['GET', 'POST'])
+@versioned('pay_stubs')
 def pay_stubs():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -489,9 +851,11 @@ def pay_stubs():
         pay_stub['id'] = generate_id()
         pay_stub['created_at'] = datetime.now().isoformat()
         mock_data['pay_stubs'][pay_stub['id']] = pay_stub
+        record_change('pay_stubs', 'created', pay_stub['id'], pay_stub)
         return jsonify(pay_stub), 201
 
 @app.route('/api/v2/client/payroll/pay-stubs/<stub_id>', methods=['GET'])
+@versioned('pay_stubs')
 def pay_stub(stub_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -499,9 +863,10 @@ def pay_stub(stub_id):
     if stub_id not in mock_data['pay_stubs']:
         return jsonify({'error': 'Pay stub not found'}), 404
     
-    return jsonify(mock_data['pay_stubs'][stub_id])
+    return jsonify(project_fields(mock_data['pay_stubs'][stub_id]))
 
 @app.route('/api/v2/client/payroll/earnings', methods=['GET', 'POST'])
+@versioned('earnings')
 def earnings():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -515,9 +880,11 @@ def earnings():
         earning['id'] = generate_id()
         earning['created_at'] = datetime.now().isoformat()
         mock_data['earnings'][earning['id']] = earning
+        record_change('earnings', 'created', earning['id'], earning)
         return jsonify(earning), 201
 
 @app.route('/api/v2/client/payroll/deductions', methods=['GET', 'POST'])
+@versioned('deductions')
 def deductions():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -534,9 +901,11 @@ def deductions():
         deduction['id'] = generate_id()
         deduction['created_at'] = datetime.now().isoformat()
         mock_data['deductions'][deduction['id']] = deduction
+        record_change('deductions', 'created', deduction['id'], deduction)
         return jsonify(deduction), 201
 
 @app.route('/api/v2/client/payroll/taxes', methods=['GET', 'POST'])
+@versioned('taxes')
 def taxes():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -553,10 +922,12 @@ def taxes():
         tax['id'] = generate_id()
         tax['created_at'] = datetime.now().isoformat()
         mock_data['taxes'][tax['id']] = tax
+        record_change('taxes', 'created', tax['id'], tax)
         return jsonify(tax), 201
 
 # Company/Configuration Endpoints
 @app.route('/api/v2/client/companies', methods=['GET', 'POST'])
+@versioned('companies')
 def companies():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -570,9 +941,11 @@ def companies():
         company['id'] = generate_id()
         company['created_at'] = datetime.now().isoformat()
         mock_data['companies'][company['id']] = company
+        record_change('companies', 'created', company['id'], company)
         return jsonify(company), 201
 
 @app.route('/api/v2/client/companies/<company_id>', methods=['GET', 'PUT'])
+@versioned('companies')
 def company(company_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -581,15 +954,17 @@ def company(company_id):
         return jsonify({'error': 'Company not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['companies'][company_id])
+        return jsonify(project_fields(mock_data['companies'][company_id]))
     
     elif request.method == 'PUT':
         comp = mock_data['companies'][company_id]
         comp.update(request.json)
         comp['updated_at'] = datetime.now().isoformat()
+        record_change('companies', 'updated', company_id, comp)
         return jsonify(comp)
 
 @app.route('/api/v2/client/configuration/departments', methods=['GET'])
+@versioned('departments')
 def departments():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -625,10 +1000,12 @@ def departments():
         ]
         for dept in sample_departments:
             mock_data['departments'][dept['id']] = dept
+            record_change('departments', 'created', dept['id'], dept)
         data = sample_departments
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/configuration/departments/<dept_id>', methods=['GET'])
+@versioned('departments')
 def department(dept_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -636,9 +1013,10 @@ def department(dept_id):
     if dept_id not in mock_data['departments']:
         return jsonify({'error': 'Department not found'}), 404
     
-    return jsonify(mock_data['departments'][dept_id])
+    return jsonify(project_fields(mock_data['departments'][dept_id]))
 
 @app.route('/api/v2/client/configuration/job-titles', methods=['GET'])
+@versioned('job_titles')
 def job_titles():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -647,6 +1025,7 @@ def job_titles():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/configuration/locations', methods=['GET'])
+@versioned('locations')
 def locations():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -691,11 +1070,13 @@ def locations():
         ]
         for loc in sample_locations:
             mock_data['locations'][loc['id']] = loc
+            record_change('locations', 'created', loc['id'], loc)
         data = sample_locations
     return jsonify(create_paginated_response(data))
 
 # Benefits Endpoints
 @app.route('/api/v2/client/benefits/plans', methods=['GET'])
+@versioned('benefits')
 def benefits():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -704,6 +1085,7 @@ def benefits():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/benefits/plans/<benefit_id>', methods=['GET'])
+@versioned('benefits')
 def benefit(benefit_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -711,9 +1093,10 @@ def benefit(benefit_id):
     if benefit_id not in mock_data['benefits']:
         return jsonify({'error': 'Benefit not found'}), 404
     
-    return jsonify(mock_data['benefits'][benefit_id])
+    return jsonify(project_fields(mock_data['benefits'][benefit_id]))
 
 @app.route('/api/v2/client/employees/<employee_id>/benefits', methods=['GET'])
+@versioned('employee_benefits')
 def employee_benefits(employee_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -722,6 +1105,7 @@ def employee_benefits(employee_id):
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/employees/<employee_id>/benefits/<benefit_id>', methods=['GET'])
+@versioned('employee_benefits')
 def employee_benefit(employee_id, benefit_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -730,10 +1114,87 @@ def employee_benefit(employee_id, benefit_id):
     if key not in mock_data['employee_benefits']:
         return jsonify({'error': 'Employee benefit not found'}), 404
     
-    return jsonify(mock_data['employee_benefits'][key])
+    return jsonify(project_fields(mock_data['employee_benefits'][key]))
+
+# Background jobs for bulk imports and reports
+job_executor = ThreadPoolExecutor(max_workers=int(os.getenv('MOCK_JOB_WORKERS', '2')), thread_name_prefix='mock-job')
+BULK_IMPORT_CHUNK_SIZE = 500
+MAX_BULK_IMPORT_CHUNK_SIZE = 10000
+MAX_BULK_IMPORT_CHUNK_DELAY_MS = 10000
+MAX_BULK_IMPORT_ERRORS = 20
+
+def update_job(collection, job_id, **changes):
+    """Replace a job record rather than mutating it, so concurrent GETs never serialize a half-updated dict"""
+    job = mock_data[collection].get(job_id)
+    if job is None:
+        return None
+    job = dict(job, **changes)
+    mock_data[collection][job_id] = job
+    record_change(collection, 'updated', job_id, job)
+    return job
+
+def run_bulk_import(job_id, employees, chunk_size, chunk_delay):
+    update_job('bulk_jobs', job_id, status='processing', started_at=datetime.now().isoformat())
+    processed = failed = 0
+    errors = []
+    try:
+        for offset in range(0, len(employees), chunk_size):
+            for position, employee in enumerate(employees[offset:offset + chunk_size], start=offset):
+                if not isinstance(employee, dict):
+                    failed += 1
+                    if len(errors) < MAX_BULK_IMPORT_ERRORS:
+                        errors.append({'index': position, 'error': 'Employee record must be an object'})
+                    continue
+                employee = dict(employee, id=generate_id(), created_at=datetime.now().isoformat(), import_job_id=job_id)
+                mock_data['employees'][employee['id']] = employee
+                record_change('employees', 'created', employee['id'], employee)
+                processed += 1
+            update_job('bulk_jobs', job_id, processed_records=processed, failed_records=failed,
+                       progress=round(100 * (processed + failed) / len(employees), 1), errors=errors)
+            if chunk_delay:
+                time.sleep(chunk_delay)
+        update_job('bulk_jobs', job_id, status='completed', progress=100.0, completed_at=datetime.now().isoformat())
+    except Exception as e:
+        logging.exception('Bulk import %s failed', job_id)
+        update_job('bulk_jobs', job_id, status='failed', error=str(e), completed_at=datetime.now().isoformat())
+
+def build_report_result(report_type, parameters):
+    employees = list(mock_data['employees'].values())
+    if not parameters.get('include_inactive', True):
+        employees = [e for e in employees if e.get('status', 'active') == 'active']
+    
+    if report_type in ('employee_summary', 'headcount'):
+        by_department = defaultdict(int)
+        by_status = defaultdict(int)
+        for employee in employees:
+            by_department[employee.get('department', 'Unassigned')] += 1
+            by_status[employee.get('status', 'active')] += 1
+        return {'total_employees': len(employees), 'by_department': dict(by_department), 'by_status': dict(by_status)}
+    
+    if report_type == 'payroll_summary':
+        stubs = list(mock_data['pay_stubs'].values())
+        return {
+            'pay_stubs': len(stubs),
+            'total_gross_pay': round(sum(stub.get('gross_pay', 0) for stub in stubs), 2),
+            'total_net_pay': round(sum(stub.get('net_pay', 0) for stub in stubs), 2)
+        }
+    
+    return {'record_counts': {name: len(records) for name, records in mock_data.items() if name != 'tokens'}}
+
+def run_report(report_id, report_type, parameters):
+    update_job('reports', report_id, started_at=datetime.now().isoformat())
+    try:
+        if parameters.get('delay_ms'):
+            time.sleep(parameters['delay_ms'] / 1000.0)
+        result = build_report_result(report_type, parameters)
+        update_job('reports', report_id, status='completed', result=result, completed_at=datetime.now().isoformat())
+    except Exception as e:
+        logging.exception('Report %s failed', report_id)
+        update_job('reports', report_id, status='failed', error=str(e), completed_at=datetime.now().isoformat())
 
 # Reports Endpoints
 @app.route('/api/v2/client/reports', methods=['GET', 'POST'])
+@versioned('reports')
 def reports():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -748,9 +1209,12 @@ def reports():
         report['status'] = 'processing'
         report['created_at'] = datetime.now().isoformat()
         mock_data['reports'][report['id']] = report
+        record_change('reports', 'created', report['id'], report)
+        job_executor.submit(run_report, report['id'], report.get('type'), report.get('parameters') or {})
         return jsonify(report), 201
 
 @app.route('/api/v2/client/reports/<report_id>', methods=['GET'])
+@versioned('reports')
 def report(report_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -758,10 +1222,11 @@ def report(report_id):
     if report_id not in mock_data['reports']:
         return jsonify({'error': 'Report not found'}), 404
     
-    return jsonify(mock_data['reports'][report_id])
+    return jsonify(project_fields(mock_data['reports'][report_id]))
 
 # eSignature Endpoints
 @app.route('/api/v2/client/esignature/requests', methods=['GET', 'POST'])
+@versioned('signature_requests')
 def signature_requests():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -776,9 +1241,11 @@ def signature_requests():
         sig_req['status'] = 'pending'
         sig_req['created_at'] = datetime.now().isoformat()
         mock_data['signature_requests'][sig_req['id']] = sig_req
+        record_change('signature_requests', 'created', sig_req['id'], sig_req)
         return jsonify(sig_req), 201
 
 @app.route('/api/v2/client/esignature/requests/<request_id>', methods=['GET'])
+@versioned('signature_requests')
 def signature_request(request_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -786,9 +1253,10 @@ def signature_request(request_id):
     if request_id not in mock_data['signature_requests']:
         return jsonify({'error': 'Signature request not found'}), 404
     
-    return jsonify(mock_data['signature_requests'][request_id])
+    return jsonify(project_fields(mock_data['signature_requests'][request_id]))
 
 @app.route('/api/v2/client/esignature/tasks', methods=['GET'])
+@versioned('signature_tasks')
 def signature_tasks():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -797,6 +1265,7 @@ def signature_tasks():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/esignature/tasks/<task_id>', methods=['GET'])
+@versioned('signature_tasks')
 def signature_task(task_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -804,10 +1273,11 @@ def signature_task(task_id):
     if task_id not in mock_data['signature_tasks']:
         return jsonify({'error': 'Signature task not found'}), 404
     
-    return jsonify(mock_data['signature_tasks'][task_id])
+    return jsonify(project_fields(mock_data['signature_tasks'][task_id]))
 
 # Webhooks Endpoints
 @app.route('/api/v2/client/webhooks', methods=['GET', 'POST'])
+@versioned('webhooks')
 def webhooks():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -821,9 +1291,11 @@ def webhooks():
         webhook['id'] = generate_id()
         webhook['created_at'] = datetime.now().isoformat()
         mock_data['webhooks'][webhook['id']] = webhook
+        record_change('webhooks', 'created', webhook['id'], webhook)
         return jsonify(webhook), 201
 
 @app.route('/api/v2/client/webhooks/<webhook_id>', methods=['GET', 'PUT', 'DELETE'])
+@versioned('webhooks')
 def webhook(webhook_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -832,16 +1304,18 @@ def webhook(webhook_id):
         return jsonify({'error': 'Webhook not found'}), 404
     
     if request.method == 'GET':
-        return jsonify(mock_data['webhooks'][webhook_id])
+        return jsonify(project_fields(mock_data['webhooks'][webhook_id]))
     
     elif request.method == 'PUT':
         wh = mock_data['webhooks'][webhook_id]
         wh.update(request.json)
         wh['updated_at'] = datetime.now().isoformat()
+        record_change('webhooks', 'updated', webhook_id, wh)
         return jsonify(wh)
     
     elif request.method == 'DELETE':
         del mock_data['webhooks'][webhook_id]
+        record_change('webhooks', 'deleted', webhook_id)
         return '', 204
 
 @app.route('/api/v2/client/webhooks/<webhook_id>/test', methods=['POST'])
@@ -860,14 +1334,38 @@ def bulk_employee_import():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    job = request.json
+    job = request.get_json(silent=True)
+    if not isinstance(job, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    employees = job.pop('employees', None)
+    if not isinstance(employees, list) or not all(isinstance(employee, dict) for employee in employees):
+        return jsonify({'error': 'employees must be a list of employee records'}), 400
+    options = job.get('options') or {}
+    if not isinstance(options, dict):
+        return jsonify({'error': 'options must be an object'}), 400
+    try:
+        chunk_size = min(max(int(options.get('chunk_size', BULK_IMPORT_CHUNK_SIZE)), 1), MAX_BULK_IMPORT_CHUNK_SIZE)
+        chunk_delay_ms = float(options.get('chunk_delay_ms', 0))
+        if math.isnan(chunk_delay_ms):
+            raise ValueError('chunk_delay_ms is NaN')
+        chunk_delay_ms = min(max(chunk_delay_ms, 0), MAX_BULK_IMPORT_CHUNK_DELAY_MS)
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({'error': 'chunk_size and chunk_delay_ms must be numbers'}), 400
+    
     job['id'] = generate_id()
-    job['status'] = 'processing'
+    job['status'] = 'queued'
+    job['total_records'] = len(employees)
+    job['processed_records'] = 0
+    job['failed_records'] = 0
+    job['progress'] = 0.0
     job['created_at'] = datetime.now().isoformat()
     mock_data['bulk_jobs'][job['id']] = job
+    record_change('bulk_jobs', 'created', job['id'], job)
+    job_executor.submit(run_bulk_import, job['id'], employees, chunk_size, chunk_delay_ms / 1000.0)
     return jsonify(job), 201
 
 @app.route('/api/v2/client/bulk/import-jobs', methods=['GET'])
+@versioned('bulk_jobs')
 def bulk_import_jobs():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -876,6 +1374,7 @@ def bulk_import_jobs():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/bulk/import-jobs/<job_id>', methods=['GET'])
+@versioned('bulk_jobs')
 def bulk_import_job(job_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -883,7 +1382,48 @@ def bulk_import_job(job_id):
     if job_id not in mock_data['bulk_jobs']:
         return jsonify({'error': 'Import job not found'}), 404
     
-    return jsonify(mock_data['bulk_jobs'][job_id])
+    return jsonify(project_fields(mock_data['bulk_jobs'][job_id]))
+
+# Change Feed Endpoints
+@app.route('/api/v2/client/events', methods=['GET'])
+def change_events():
+    if not require_auth():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        since = max(int(request.args.get('since', 0)), 0)
+        limit = min(max(int(request.args.get('limit', 100)), 1), MAX_EVENTS_PAGE)
+        wait = float(request.args.get('wait', 0))
+        # NaN survives min()/max() and would make the long-poll wait forever
+        if not math.isfinite(wait):
+            raise ValueError('wait must be finite')
+        wait = min(max(wait, 0.0), MAX_EVENTS_WAIT_SECONDS)
+    except ValueError:
+        return jsonify({'error': 'since, limit and wait must be numeric'}), 400
+    collections = set(request.args['collection'].split(',')) if request.args.get('collection') else None
+
+    # Events after `since` have already been overwritten: the caller must resync
+    if since < change_log.oldest_seq - 1:
+        return jsonify({'error': 'Cursor expired', 'oldest_seq': change_log.oldest_seq}), 410
+
+    # Long-poll: hold the request until something newer than `since` is recorded
+    if wait and change_log.latest_seq <= since:
+        with change_condition:
+            change_condition.wait_for(lambda: change_log.latest_seq > since, timeout=wait)
+
+    events = change_log.since(since, limit)
+    cursor = events[-1]['seq'] if events else since
+    if collections:
+        events = [event for event in events if event['collection'] in collections]
+    latest_seq = change_log.latest_seq
+    return jsonify({
+        'data': events,
+        'pagination': {
+            'cursor': cursor,
+            'has_more': cursor < latest_seq
+        },
+        'latest_seq': latest_seq
+    })
 
 # Audit/Logging Endpoints
 @app.route('/api/v2/client/audit/logs', methods=['GET'])
@@ -891,21 +1431,58 @@ def audit_logs():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    data = list(mock_data['audit_logs'].values())
-    return jsonify(create_paginated_response(data))
+    # Newest first; every filter is optional
+    try:
+        limit = min(max(int(request.args.get('limit', 100)), 1), MAX_AUDIT_PAGE)
+        before = int(request.args['before']) if request.args.get('before') else None
+        min_latency_ms = float(request.args.get('min_latency_ms', 0))
+    except ValueError:
+        return jsonify({'error': 'limit, before and min_latency_ms must be numeric'}), 400
+    method = request.args.get('method', '').upper()
+    status = request.args.get('status', '')
+    route = request.args.get('route')
+    path = request.args.get('path')
+    
+    data = []
+    for entry in audit_log.newest():
+        if before is not None and int(entry['id']) >= before:
+            continue
+        if method and entry['method'] != method:
+            continue
+        # `status` is an exact code (404) or a class (4xx)
+        if status and not (str(entry['status']) == status or
+                           (status[1:].lower() == 'xx' and str(entry['status'])[0] == status[0])):
+            continue
+        if route and entry['route'] != route:
+            continue
+        if path and not fnmatch(entry['path'], path):
+            continue
+        if entry['latency_ms'] < min_latency_ms:
+            continue
+        data.append(entry)
+        if len(data) > limit:
+            break
+    
+    has_more = len(data) > limit
+    data = data[:limit]
+    response = create_paginated_response(data, cursor=data[-1]['id'] if has_more else None)
+    response['pagination']['has_more'] = has_more
+    return jsonify(response)
 
 @app.route('/api/v2/client/audit/logs/<log_id>', methods=['GET'])
-def audit_log(log_id):
+def audit_log_entry(log_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    if log_id not in mock_data['audit_logs']:
+    entry = audit_log.get(int(log_id)) if log_id.isdigit() else None
+    if entry is None:
         return jsonify({'error': 'Audit log not found'}), 404
     
-    return jsonify(mock_data['audit_logs'][log_id])
+    return jsonify(project_fields(entry))
 
 # Organization Management Endpoints
 @app.route('/api/v2/client/organization/units', methods=['GET'])
+@versioned('org_units')
 def org_units():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -914,6 +1491,7 @@ def org_units():
     return jsonify(create_paginated_response(data))
 
 @app.route('/api/v2/client/organization/units/<unit_id>', methods=['GET'])
+@versioned('org_units')
 def org_unit(unit_id):
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -921,9 +1499,10 @@ def org_unit(unit_id):
     if unit_id not in mock_data['org_units']:
         return jsonify({'error': 'Organization unit not found'}), 404
     
-    return jsonify(mock_data['org_units'][unit_id])
+    return jsonify(project_fields(mock_data['org_units'][unit_id]))
 
 @app.route('/api/v2/client/organization/hierarchy', methods=['GET'])
+@versioned('org_hierarchy')
 def org_hierarchy():
     if not require_auth():
         return jsonify({'error': 'Unauthorized'}), 401
@@ -1078,5 +1657,165 @@ def pro_reviews():
         'status': 'In Progress'
     }])
 
+# ==================== MOCK ADMINISTRATION ====================
+
+@app.route('/admin/fault-profile', methods=['GET', 'PUT', 'DELETE'])
+def admin_fault_profile():
+    global fault_profile
+    
+    if request.method == 'GET':
+        return jsonify(fault_profile.to_dict() if fault_profile else {})
+    
+    elif request.method == 'PUT':
+        try:
+            fault_profile = FaultProfile(request.json)
+        except (ValueError, TypeError, AttributeError) as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(fault_profile.to_dict())
+    
+    elif request.method == 'DELETE':
+        fault_profile = None
+        return '', 204
+
+@app.route('/admin/rate-limits', methods=['GET', 'PUT', 'DELETE'])
+def admin_rate_limits():
+    global rate_limiter
+    
+    if request.method == 'GET':
+        return jsonify(rate_limiter.to_dict() if rate_limiter else {})
+    
+    elif request.method == 'PUT':
+        try:
+            rate_limiter = RateLimiter(request.json)
+        except (ValueError, TypeError, AttributeError) as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(rate_limiter.to_dict())
+    
+    elif request.method == 'DELETE':
+        rate_limiter = None
+        return '', 204
+
+@app.route('/admin/cache', methods=['GET', 'DELETE'])
+def admin_cache():
+    if request.method == 'GET':
+        return jsonify(response_cache.stats())
+    
+    elif request.method == 'DELETE':
+        response_cache.clear()
+        return '', 204
+
+def restore_snapshot(path):
+    """
+    Swap in every collection from a snapshot and invalidate cached representations.
+    Collections keep this server's storage: compact ones stay compact, whatever the
+    snapshot was dumped from. Nothing is swapped unless the whole snapshot loads.
+    """
+    collections = load_snapshot(path)
+    compact = [name for name, records in mock_data.items() if isinstance(records, ColumnarCollection)]
+    restored = {}
+    for name in mock_data:
+        if name in EXCLUDED_COLLECTIONS:
+            continue
+        records = collections.get(name, {})
+        if isinstance(records, ColumnarCollection) and name not in compact:
+            records = {key: dict(record) for key, record in records.items()}
+        restored[name] = records if isinstance(records, (dict, ColumnarCollection)) else dict(records)
+    enable_compact_storage(restored, compact)
+    with snapshot_lock:
+        mock_data.update(restored)
+    for name in restored:
+        record_change(name)
+    response_cache.clear()
+    return sum(len(records) for records in restored.values())
+
+@app.route('/admin/stats', methods=['GET', 'DELETE'])
+def admin_stats():
+    if request.method == 'DELETE':
+        route_stats.reset()
+        return '', 204
+    return jsonify({'routes': route_stats.snapshot(), 'response_cache': response_cache.stats()})
+
+@app.route('/admin/metrics', methods=['GET'])
+def admin_metrics():
+    return Response(route_stats.prometheus(), mimetype='text/plain; version=0.0.4')
+
+def requested_snapshot_path():
+    """The snapshot named in the request body, resolved inside SNAPSHOT_DIR"""
+    options = request.get_json(silent=True) or {}
+    if not isinstance(options, dict):
+        raise ValueError('Request body must be a JSON object')
+    return resolve_snapshot_name(SNAPSHOT_DIR, options.get('name', DEFAULT_SNAPSHOT_NAME))
+
+@app.route('/admin/snapshot', methods=['POST'])
+def admin_snapshot():
+    try:
+        path = requested_snapshot_path()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    started = time.perf_counter()
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with snapshot_lock:
+        size = dump_snapshot(mock_data, path)
+    return jsonify({
+        'name': os.path.basename(path),
+        'bytes': size,
+        'records': sum(len(records) for name, records in mock_data.items() if name not in EXCLUDED_COLLECTIONS),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    }), 201
+
+@app.route('/admin/restore', methods=['POST'])
+def admin_restore():
+    try:
+        path = requested_snapshot_path()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not os.path.exists(path):
+        return jsonify({'error': 'Snapshot not found'}), 404
+    started = time.perf_counter()
+    try:
+        records = restore_snapshot(path)
+    except (ValueError, pickle.UnpicklingError) as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'name': os.path.basename(path),
+        'bytes': os.path.getsize(path),
+        'records': records,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    })
+
+@app.route('/admin/seed', methods=['POST'])
+def admin_seed():
+    options = request.get_json(silent=True)
+    if options is None:
+        options = {}
+    if not isinstance(options, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    try:
+        employees = int(options.get('employees', 1000))
+        weeks = int(options.get('weeks', 4))
+        seed = int(options.get('seed', 0))
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({'error': 'employees, weeks and seed must be integers'}), 400
+    if employees < 0 or weeks < 0:
+        return jsonify({'error': 'employees and weeks must not be negative'}), 400
+    generator = SyntheticDataGenerator(seed=seed, weeks=weeks)
+    
+    if options.get('reset'):
+        for collection in GENERATED_COLLECTIONS:
+            mock_data[collection].clear()
+    
+    started = time.perf_counter()
+    counts = generator.populate(mock_data, employees=employees)
+    for collection in GENERATED_COLLECTIONS:
+        record_change(collection)
+    return jsonify({
+        'counts': counts,
+        'total_records': sum(counts.values()),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    }), 201
+
 if __name__ == '__main__':
+    if os.getenv('MOCK_SNAPSHOT_RESTORE'):
+        restored = restore_snapshot(os.environ['MOCK_SNAPSHOT_RESTORE'])
+        logging.info('Restored %d records from %s', restored, os.environ['MOCK_SNAPSHOT_RESTORE'])
     app.run(host='0.0.0.0', port=8080, debug=True)
\ No newline at end of file
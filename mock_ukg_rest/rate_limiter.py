@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Per-token request quotas for the mock UKG REST API server
+
+A rate-limit policy is a JSON (or YAML, when PyYAML is installed) document such as:
+
+    {
+        "default": {"limit": 600, "window_seconds": 60},
+        "groups": [
+            {"name": "payroll", "match": "/api/v2/client/payroll/*", "limit": 60, "window_seconds": 60},
+            {"name": "bulk", "match": "/api/v2/client/bulk/*", "methods": ["POST"], "limit": 5, "window_seconds": 300}
+        ]
+    }
+
+Groups are matched in order with shell-style patterns against the request
+path; the first match wins and `default` applies otherwise. Omit `default`
+to leave unmatched routes unlimited. Each token gets its own quota per group.
+
+Quotas use the sliding-window counter approximation: every (token, group)
+keeps just the current and previous fixed-window counts, and the previous
+window's count is weighted by how much of it still overlaps the sliding
+window. Memory is O(1) per token and group, however many requests it sends.
+"""
+
+import fnmatch
+import json
+import math
+import threading
+import time
+
+PRUNE_EVERY = 1024
+
+class RateLimitDecision:
+    __slots__ = ('allowed', 'group', 'limit', 'remaining', 'reset_after', 'retry_after')
+
+    def __init__(self, allowed, group, limit, remaining, reset_after, retry_after=None):
+        self.allowed = allowed
+        self.group = group
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_after = reset_after
+        self.retry_after = retry_after
+
+    def headers(self):
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(self.reset_after),
+            'X-RateLimit-Group': self.group
+        }
+        if self.retry_after is not None:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+class RateLimiter:
+    def __init__(self, config=None, clock=time.monotonic):
+        self.config = config or {}
+        self.groups = [self._validate_group(group, f'group {n}')
+                       for n, group in enumerate(self.config.get('groups', []))]
+        default = self.config.get('default')
+        self.default = self._validate_group(dict({'name': 'default'}, **default), 'default') if default else None
+        self.clock = clock
+        # Counters idle for two of the longest windows no longer affect any decision
+        self.max_window = max([float(group['window_seconds']) for group in self.groups] +
+                              ([float(self.default['window_seconds'])] if self.default else []), default=0)
+        # (token, group name) -> [window start, current window count, previous window count]
+        self.windows = {}
+        self.lock = threading.Lock()
+        self.checks = 0
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a policy from a JSON or YAML file"""
+        with open(path) as f:
+            if path.endswith(('.yaml', '.yml')):
+                import yaml
+                return cls(yaml.safe_load(f))
+            return cls(json.load(f))
+
+    @staticmethod
+    def _validate_group(group, label):
+        if int(group.get('limit', 0)) < 1:
+            raise ValueError(f'{label}: limit must be a positive integer')
+        if float(group.get('window_seconds', 0)) <= 0:
+            raise ValueError(f'{label}: window_seconds must be positive')
+        return dict(group, name=group.get('name') or group.get('match', label))
+
+    def match(self, method, path):
+        for group in self.groups:
+            if group.get('methods') and method not in group['methods']:
+                continue
+            if fnmatch.fnmatchcase(path, group.get('match', '*')):
+                return group
+        return self.default
+
+    def check(self, token, method, path):
+        """Count a request against the token's quota; return a RateLimitDecision, or None when unlimited"""
+        group = self.match(method, path)
+        if group is None:
+            return None
+        limit = int(group['limit'])
+        window = float(group['window_seconds'])
+        now = self.clock()
+        key = (token, group['name'])
+
+        with self.lock:
+            self.checks += 1
+            if self.checks % PRUNE_EVERY == 0:
+                self._prune(now)
+
+            state = self.windows.get(key)
+            if state is None:
+                state = self.windows[key] = [now, 0, 0]
+            start, current, previous = state
+            elapsed = now - start
+            if elapsed >= window:
+                # Roll forward; a gap of two or more windows leaves nothing to carry over
+                windows_passed = int(elapsed // window)
+                previous = current if windows_passed == 1 else 0
+                current = 0
+                start += windows_passed * window
+                state[:] = [start, current, previous]
+
+            into_window = now - start
+            weight = 1 - into_window / window
+            estimate = previous * weight + current
+            reset_after = max(1, math.ceil(start + window - now))
+
+            if estimate + 1 > limit:
+                retry_after = self._retry_after(limit, window, into_window, current, previous)
+                return RateLimitDecision(False, group['name'], limit, 0, reset_after, retry_after)
+
+            state[1] = current + 1
+            remaining = max(0, math.floor(limit - (estimate + 1)))
+            return RateLimitDecision(True, group['name'], limit, remaining, reset_after)
+
+    @staticmethod
+    def _retry_after(limit, window, into_window, current, previous):
+        """Whole seconds until one more request fits under the sliding-window estimate"""
+        if current + 1 <= limit:
+            # Wait for enough of the previous window to slide out
+            needed = window * (1 - (limit - current - 1) / previous)
+            wait = needed - into_window
+        else:
+            # This window alone is over quota: wait for it to become the previous window and slide out
+            needed = window * (1 - (limit - 1) / current)
+            wait = (window - into_window) + needed
+        return max(1, math.ceil(wait))
+
+    def _prune(self, now):
+        stale = [key for key, (start, _, _) in self.windows.items() if now - start >= 2 * self.max_window]
+        for key in stale:
+            del self.windows[key]
+
+    def reset(self):
+        with self.lock:
+            self.windows.clear()
+
+    def to_dict(self):
+        return dict(self.config, tracked_windows=len(self.windows))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fixed-capacity, sequence-numbered ring buffer for the mock UKG REST API server
+Appends are O(1); once full, the oldest entries are overwritten.
+"""
+
+import threading
+
+class RingBuffer:
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.latest_seq = 0
+        self.lock = threading.Lock()
+
+    @property
+    def oldest_seq(self):
+        """Sequence number of the oldest retained entry (latest_seq + 1 when empty)"""
+        return max(1, self.latest_seq - self.capacity + 1) if self.latest_seq else 1
+
+    def append(self, make_entry):
+        """Store make_entry(seq) under the next sequence number and return the entry"""
+        with self.lock:
+            seq = self.latest_seq + 1
+            entry = make_entry(seq)
+            self.slots[seq % self.capacity] = entry
+            self.latest_seq = seq
+            return entry
+
+    def get(self, seq):
+        """The entry stored under `seq`, or None once it has been overwritten"""
+        with self.lock:
+            if not self.oldest_seq <= seq <= self.latest_seq:
+                return None
+            return self.slots[seq % self.capacity]
+
+    def since(self, seq, limit):
+        """Entries with sequence numbers greater than `seq`, oldest first, at most `limit` of them"""
+        with self.lock:
+            start = max(seq + 1, self.oldest_seq)
+            stop = min(self.latest_seq, start + limit - 1)
+            return [self.slots[n % self.capacity] for n in range(start, stop + 1)]
+
+    def newest(self, limit=None):
+        """Retained entries, newest first"""
+        with self.lock:
+            oldest = self.oldest_seq
+            if limit is not None:
+                oldest = max(oldest, self.latest_seq - limit + 1)
+            return [self.slots[n % self.capacity] for n in range(self.latest_seq, oldest - 1, -1)]
+
+    def __len__(self):
+        return min(self.latest_seq, self.capacity)
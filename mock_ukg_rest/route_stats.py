@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Per-route request timing for the mock UKG REST API server
+Handler time, serialization time and response size are aggregated per route
+into streaming quantile sketches, so memory stays bounded however long the
+server runs.
+"""
+
+import math
+import threading
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Label for requests that matched no route, so 404 scans don't add a series per path
+UNMATCHED_ROUTE = '<unmatched>'
+
+class QuantileSketch:
+    """
+    Log-bucketed streaming quantile sketch (DDSketch-style). Every quantile
+    estimate is within `relative_accuracy` of the true value; memory grows
+    with the logarithm of the value range, not with the number of samples.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket, clamped to the observed range
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, digits=3):
+        if not self.count:
+            return {'count': 0}
+        summary = {'count': self.count, 'mean': round(self.sum / self.count, digits),
+                   'min': round(self.min, digits), 'max': round(self.max, digits)}
+        for q in QUANTILES:
+            summary[f'p{round(q * 100)}'] = round(self.quantile(q), digits)
+        return summary
+
+class RouteTimings:
+    """Sketches for one (method, route) pair"""
+    __slots__ = ('handler_ms', 'serialize_ms', 'response_bytes', 'statuses')
+
+    def __init__(self):
+        self.handler_ms = QuantileSketch()
+        self.serialize_ms = QuantileSketch()
+        self.response_bytes = QuantileSketch()
+        self.statuses = {}
+
+class RouteStats:
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def record(self, method, route, status, handler_ms, serialize_ms, response_bytes):
+        with self.lock:
+            timings = self.routes.get((method, route))
+            if timings is None:
+                timings = self.routes[(method, route)] = RouteTimings()
+            timings.handler_ms.add(handler_ms)
+            timings.serialize_ms.add(serialize_ms)
+            if response_bytes is not None:
+                timings.response_bytes.add(response_bytes)
+            timings.statuses[status] = timings.statuses.get(status, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+    def snapshot(self):
+        """JSON-ready stats per route, busiest routes first"""
+        with self.lock:
+            routes = [{
+                'method': method,
+                'route': route,
+                'statuses': {str(status): count for status, count in sorted(timings.statuses.items())},
+                'handler_ms': timings.handler_ms.summary(),
+                'serialize_ms': timings.serialize_ms.summary(),
+                'response_bytes': timings.response_bytes.summary(digits=0)
+            } for (method, route), timings in self.routes.items()]
+        routes.sort(key=lambda entry: entry['handler_ms']['count'], reverse=True)
+        return routes
+
+    def prometheus(self, prefix='mock_ukg'):
+        """Prometheus text exposition format: one summary per measurement, labelled by method and route"""
+        metrics = [
+            ('handler_seconds', 'Time spent in the route handler, excluding JSON serialization',
+             lambda timings: timings.handler_ms, 0.001),
+            ('serialization_seconds', 'Time spent serializing JSON responses',
+             lambda timings: timings.serialize_ms, 0.001),
+            ('response_bytes', 'Response body size', lambda timings: timings.response_bytes, 1),
+        ]
+        lines = []
+        with self.lock:
+            routes = sorted(self.routes.items())
+            for name, help_text, select, scale in metrics:
+                lines.append(f'# HELP {prefix}_{name} {help_text}')
+                lines.append(f'# TYPE {prefix}_{name} summary')
+                for (method, route), timings in routes:
+                    sketch = select(timings)
+                    if not sketch.count:
+                        continue
+                    labels = f'method="{method}",route="{_escape(route)}"'
+                    for q in QUANTILES:
+                        lines.append(f'{prefix}_{name}{{{labels},quantile="{q}"}} {sketch.quantile(q) * scale:.6g}')
+                    lines.append(f'{prefix}_{name}_sum{{{labels}}} {sketch.sum * scale:.6g}')
+                    lines.append(f'{prefix}_{name}_count{{{labels}}} {sketch.count}')
+            lines.append(f'# HELP {prefix}_requests_total Requests by route and status')
+            lines.append(f'# TYPE {prefix}_requests_total counter')
+            for (method, route), timings in routes:
+                for status, count in sorted(timings.statuses.items()):
+                    lines.append(f'{prefix}_requests_total{{method="{method}",route="{_escape(route)}",'
+                                 f'status="{status}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
@@ -6,12 +6,24 @@ Populates the mock server with realistic test data
 
 import requests
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 
 class MockDataLoader:
-    def __init__(self, base_url='http://localhost:8080'):
+    def __init__(self, base_url='http://localhost:8080', max_workers=8):
         self.base_url = base_url
         self.token = None
+        self.max_workers = max_workers
+        # One pooled session shared by all worker threads keeps connections alive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.request_count = 0
+        self.request_lock = threading.Lock()
         self.authenticate()
     
     def authenticate(self):
@@ -19,7 +31,7 @@ class MockDataLoader:
         import base64
         credentials = base64.b64encode(b'test_app:test_secret').decode('utf-8')
         
-        response = requests.post(
+        response = self.session.post(
             f'{self.base_url}/api/v2/client/tokens',
             headers={'Authorization': f'Basic {credentials}'},
             data={'grant_type': 'client_credentials', 'scope': 'client', 'client_id': 'test_client'}
@@ -37,8 +49,32 @@ class MockDataLoader:
             'Content-Type': 'application/json'
         }
     
+    def post(self, path, payload):
+        """POST one payload; return the created record, or None on failure"""
+        try:
+            response = self.session.post(f'{self.base_url}/api/v2/client/{path}', headers=self.get_headers(), json=payload)
+        except requests.RequestException:
+            return None
+        finally:
+            with self.request_lock:
+                self.request_count += 1
+        return response.json() if response.status_code == 201 else None
+    
+    def post_stage(self, jobs):
+        """
+        POST every payload of a dependency stage concurrently.
+        `jobs` maps a name to (path, payloads); returns name -> created records (None for failures), in payload order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                name: [executor.submit(self.post, path, payload) for payload in payloads]
+                for name, (path, payloads) in jobs.items()
+            }
+            return {name: [future.result() for future in pending] for name, pending in futures.items()}
+    
     def load_sample_data(self):
         """Load comprehensive sample data into mock server"""
+        started = time.perf_counter()
         
         # Create sample companies
         companies = [
@@ -56,15 +92,12 @@ class MockDataLoader:
             }
         ]
         
+        # Stage 1: companies, which everything else references
         company_ids = []
-        for company in companies:
-            response = requests.post(
-                f'{self.base_url}/api/v2/client/companies',
-                headers=self.get_headers(),
-                json=company
-            )
-            if response.status_code == 201:
-                company_ids.append(response.json()['id'])
+        created = self.post_stage({'companies': ('companies', companies)})
+        for company, result in zip(companies, created['companies']):
+            if result:
+                company_ids.append(result['id'])
                 print(f"✓ Created company: {company['name']}")
         
         # Create sample employees
@@ -104,16 +137,6 @@ class MockDataLoader:
             }
         ]
         
-        employee_ids = []
-        for employee in employees:
-            response = requests.post(
-                f'{self.base_url}/api/v2/client/employees',
-                headers=self.get_headers(),
-                json=employee
-            )
-            if response.status_code == 201:
-                employee_ids.append(response.json()['id'])
-                print(f"✓ Created employee: {employee['first_name']} {employee['last_name']}")
         
         # Create sample document types
         doc_types = [
@@ -131,14 +154,71 @@ class MockDataLoader:
             }
         ]
         
-        for doc_type in doc_types:
-            response = requests.post(
-                f'{self.base_url}/api/v2/client/documents/company-document-types',
-                headers=self.get_headers(),
-                json=doc_type
-            )
-            if response.status_code == 201:
+        # Create sample payroll runs
+        payroll_runs = [
+            {
+                'company_id': company_ids[0] if company_ids else 'default',
+                'pay_period_start': '2024-01-01',
+                'pay_period_end': '2024-01-15',
+                'pay_date': '2024-01-20',
+                'status': 'completed',
+                'total_employees': 150,
+                'total_gross_pay': 375000.00,
+                'total_net_pay': 285000.00,
+                'run_type': 'regular'
+            },
+            {
+                'company_id': company_ids[0] if company_ids else 'default',
+                'pay_period_start': '2024-01-16',
+                'pay_period_end': '2024-01-31',
+                'pay_date': '2024-02-05',
+                'status': 'processing',
+                'total_employees': 152,
+                'total_gross_pay': 380000.00,
+                'total_net_pay': 288000.00,
+                'run_type': 'regular'
+            }
+        ]
+        
+        # Create sample webhooks
+        webhooks = [
+            {
+                'url': 'https://example.com/webhook/employee-created',
+                'events': ['employee.created', 'employee.updated'],
+                'active': True,
+                'description': 'Employee change notifications'
+            },
+            {
+                'url': 'https://example.com/webhook/timeoff',
+                'events': ['timeoff.requested', 'timeoff.approved'],
+                'active': True,
+                'description': 'Time-off notifications'
+            }
+        ]
+        
+        # Stage 2: resources that only depend on companies
+        created = self.post_stage({
+            'employees': ('employees', employees),
+            'document_types': ('documents/company-document-types', doc_types),
+            'payroll_runs': ('payroll/runs', payroll_runs),
+            'webhooks': ('webhooks', webhooks)
+        })
+        employee_ids = []
+        for employee, result in zip(employees, created['employees']):
+            if result:
+                employee_ids.append(result['id'])
+                print(f"✓ Created employee: {employee['first_name']} {employee['last_name']}")
+        for doc_type, result in zip(doc_types, created['document_types']):
+            if result:
                 print(f"✓ Created document type: {doc_type['name']}")
+        payroll_run_ids = []
+        for payroll_run, result in zip(payroll_runs, created['payroll_runs']):
+            if result:
+                payroll_run_ids.append(result['id'])
+                print(f"✓ Created payroll run: {payroll_run['pay_period_start']} to {payroll_run['pay_period_end']}")
+        for webhook, result in zip(webhooks, created['webhooks']):
+            if result:
+                print(f"✓ Created webhook: {webhook['description']}")
         
         # Create sample time-off requests
         time_off_requests = [
@@ -162,15 +242,6 @@ class MockDataLoader:
             }
         ]
         
-        for request in time_off_requests:
-            response = requests.post(
-                f'{self.base_url}/api/v2/client/time-off/requests',
-                headers=self.get_headers(),
-                json=request
-            )
-            if response.status_code == 201:
-                print(f"✓ Created time-off request for employee: {request['employee_id']}")
-        
         # Create sample timesheets
         timesheets = [
             {
@@ -191,55 +262,6 @@ class MockDataLoader:
             }
         ]
         
-        for timesheet in timesheets:
-            response = requests.post(
-                f'{self.base_url}/api/v2/client/time-attendance/timesheets',
-                headers=self.get_headers(),
-                json=timesheet
-            )
-            if response.status_code == 201:
-                print(f"✓ Created timesheet for employee: {timesheet['employee_id']}")
-        
-        # Create sample payroll runs
-        payroll_runs = [
-            {
-                'company_id': company_ids[0] if company_ids else 'default',
-                'pay_period_start': '2024-01-01',
-                'pay_period_end': '2024-01-15',
-                'pay_date': '2024-01-20',
-                'status': 'completed',
-                'total_employees': 150,
-                'total_gross_pay': 375000.00,
-                'total_net_pay': 285000.00,
-                'run_type': 'regular'
-            },
-            {
-                'company_id': company_ids[0] if company_ids else 'default',
-                'pay_period_start': '2024-01-16',
-                'pay_period_end': '2024-01-31',
-                'pay_date': '2024-02-05',
-                'status': 'processing',
-                'total_employees': 152,
-                'total_gross_pay': 380000.00,
-                'total_net_pay': 288000.00,
-                'run_type': 'regular'
-            }
-        ]
-        
-        payroll_run_ids = []
-        for payroll_run in payroll_runs:
-            try:
-                response = requests.post(
-                    f'{self.base_url}/api/v2/client/payroll/runs',
-                    headers=self.get_headers(),
-                    json=payroll_run
-                )
-                if response.status_code == 201:
-                    payroll_run_ids.append(response.json()['id'])
-                    print(f"✓ Created payroll run: {payroll_run['pay_period_start']} to {payroll_run['pay_period_end']}")
-            except:
-                print(f"⚠ Payroll run endpoint not available, skipping")
-        
         # Create sample pay stubs
         pay_stubs = [
             {
@@ -325,26 +347,22 @@ class MockDataLoader:
             }
         ]
         
-        # Load payroll data
-        payroll_endpoints = [
-            ('pay-stubs', pay_stubs),
-            ('earnings', earnings),
-            ('deductions', deductions),
-            ('taxes', taxes)
-        ]
-        
-        for endpoint, data_list in payroll_endpoints:
-            for item in data_list:
-                try:
-                    response = requests.post(
-                        f'{self.base_url}/api/v2/client/payroll/{endpoint}',
-                        headers=self.get_headers(),
-                        json=item
-                    )
-                    if response.status_code == 201:
-                        print(f"✓ Created {endpoint.replace('-', ' ')}: {item.get('employee_id', 'N/A')}")
-                except:
-                    print(f"⚠ {endpoint} endpoint not available, skipping")
+        # Stage 3: per-employee resources, fanned out in parallel
+        stage = {
+            'time-off request': ('time-off/requests', time_off_requests),
+            'timesheet': ('time-attendance/timesheets', timesheets),
+            'pay stub': ('payroll/pay-stubs', pay_stubs),
+            'earning': ('payroll/earnings', earnings),
+            'deduction': ('payroll/deductions', deductions),
+            'tax': ('payroll/taxes', taxes)
+        }
+        created = self.post_stage(stage)
+        for name, (_, payloads) in stage.items():
+            for item, result in zip(payloads, created[name]):
+                if result:
+                    print(f"✓ Created {name} for employee: {item.get('employee_id', 'N/A')}")
+                else:
+                    print(f"⚠ Failed to create {name} for employee: {item.get('employee_id', 'N/A')}")
         
         # Create sample departments
         departments = [
@@ -426,31 +444,6 @@ class MockDataLoader:
         except:
             print("⚠ Location endpoints not available")
         
-        # Create sample webhooks
-        webhooks = [
-            {
-                'url': 'https://example.com/webhook/employee-created',
-                'events': ['employee.created', 'employee.updated'],
-                'active': True,
-                'description': 'Employee change notifications'
-            },
-            {
-                'url': 'https://example.com/webhook/timeoff',
-                'events': ['timeoff.requested', 'timeoff.approved'],
-                'active': True,
-                'description': 'Time-off notifications'
-            }
-        ]
-        
-        for webhook in webhooks:
-            response = requests.post(
-                f'{self.base_url}/api/v2/client/webhooks',
-                headers=self.get_headers(),
-                json=webhook
-            )
-            if response.status_code == 201:
-                print(f"✓ Created webhook: {webhook['description']}")
-        
         # Create sample PTO plans
         pto_plans = [
             {
@@ -569,6 +562,9 @@ class MockDataLoader:
         print(f"✓ Accrual data prepared: {len(accrual_data)} records")
         print(f"✓ Schedule data prepared: {len(schedule_data)} schedules")
         
+        elapsed = time.perf_counter() - started
+        print(f"\n⏱ {self.request_count} requests in {elapsed:.2f}s "
+              f"({self.request_count / elapsed:.1f} req/s, {self.max_workers} workers)")
         print("\n✅ Sample data loading completed successfully!")
         print(f"Mock server is running at: {self.base_url}")
         print("Sample data includes:")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Snapshot and restore of the mock UKG REST API server's in-memory store
+
+Snapshots are a single pickle (protocol 5) file. Restoring memory-maps the
+file and unpickles straight from the mapping, so there is no intermediate
+read buffer, and columnar collections are restored as compact arrays.
+Only restore snapshots you created: unpickling runs arbitrary code. The
+server's /admin endpoints therefore only take a file name, which must resolve
+inside its snapshot directory.
+"""
+
+import argparse
+import mmap
+import os
+import pickle
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+SNAPSHOT_FORMAT = 1
+# Tokens are per-session and never part of a snapshot
+EXCLUDED_COLLECTIONS = ('tokens',)
+
+def resolve_snapshot_name(directory, name):
+    """Path of snapshot file `name` inside `directory`; ValueError for anything that would leave it"""
+    if not isinstance(name, str) or not name or name in ('.', '..') or os.path.basename(name) != name \
+            or (os.altsep and os.altsep in name):
+        raise ValueError('Snapshot name must be a plain file name')
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.dirname(path) != root:
+        raise ValueError('Snapshot name must be a plain file name')
+    return path
+
+def dump_snapshot(store, path):
+    """Write every collection in `store` to `path` atomically; return the snapshot size in bytes"""
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'created_at': datetime.now().isoformat(),
+        'collections': {name: records for name, records in store.items() if name not in EXCLUDED_COLLECTIONS}
+    }
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=5)
+    os.replace(temp_path, path)
+    return os.path.getsize(path)
+
+def load_snapshot(path):
+    """Read and check a snapshot written by dump_snapshot; return its collections"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        snapshot = pickle.loads(mapped)
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format: {snapshot.get('format') if isinstance(snapshot, dict) else None}")
+    collections = snapshot.get('collections')
+    if not isinstance(collections, dict):
+        raise ValueError('Snapshot has no collections')
+    for name, records in collections.items():
+        if not isinstance(records, Mapping):
+            raise ValueError(f'Snapshot collection {name!r} is not a mapping of records')
+    return collections
+
+def main():
+    import requests
+
+    parser = argparse.ArgumentParser(description='Dump or restore mock UKG server state')
+    parser.add_argument('action', choices=['dump', 'restore'])
+    parser.add_argument('name', help="Snapshot file name, inside the server's MOCK_SNAPSHOT_DIR")
+    parser.add_argument('--url', default='http://localhost:8080')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    endpoint = 'snapshot' if args.action == 'dump' else 'restore'
+    response = requests.post(f'{args.url}/admin/{endpoint}', json={'name': args.name})
+    response.raise_for_status()
+    result = response.json()
+    print(f"✓ {args.action.title()} of {result['records']} records ({result['bytes'] / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+if __name__ == '__main__':
+    main()
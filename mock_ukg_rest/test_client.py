@@ -147,8 +147,11 @@ def test_ukg_client():
         # Test bulk import
         print("\n15. Testing Bulk Employee Import...")
         bulk_job = client.create_bulk_employee_import({
-            'file_url': 'https://example.com/employees.csv',
             'company_id': company_id,
+            'employees': [
+                {'first_name': 'Bulk', 'last_name': f'Employee {n}', 'company_id': company_id}
+                for n in range(10)
+            ],
             'options': {'update_existing': True}
         })
         print(f"✓ Created bulk import job (ID: {bulk_job['id']}, Status: {bulk_job['status']})")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's ASGI serving mode
+"""
+
+import asyncio
+import base64
+import json
+import threading
+from datetime import datetime, timedelta
+
+import mock_server
+from asgi_server import MockASGIApp
+
+async def call(app, method, path, query='', headers=None, body_chunks=(b'',)):
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or [])],
+    }
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': n < len(body_chunks) - 1}
+                for n, chunk in enumerate(body_chunks)]
+    response = {'body': b'', 'chunks': 0}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = dict(message['headers'])
+        else:
+            response['body'] += message.get('body', b'')
+            response['chunks'] += 1
+
+    await app(scope, receive, send)
+    return response
+
+async def bearer_headers(app):
+    credentials = base64.b64encode(b'asgi:asgi').decode()
+    response = await call(app, 'POST', '/api/v2/client/tokens', headers=[('Authorization', f'Basic {credentials}')])
+    return [('Authorization', f"Bearer {json.loads(response['body'])['access_token']}")]
+
+def test_build_environ_translates_scope():
+    """Test ASGI scope fields, repeated headers and the body length map onto the WSGI environ"""
+    scope = {
+        'type': 'http', 'method': 'POST', 'path': '/api/v2/client/employees', 'root_path': '/mock',
+        'query_string': b'fields=id,name', 'http_version': '1.1', 'scheme': 'https',
+        'server': ('mock.local', 8443), 'client': ('10.0.0.5', 51000),
+        'headers': [(b'content-type', b'application/json'), (b'content-length', b'999'),
+                    (b'x-trace-id', b'a'), (b'x-trace-id', b'b'), (b'authorization', b'Bearer t')],
+    }
+
+    environ = MockASGIApp.build_environ(scope, b'{"a": 1}')
+
+    assert environ['REQUEST_METHOD'] == 'POST'
+    assert (environ['SCRIPT_NAME'], environ['PATH_INFO']) == ('/mock', '/api/v2/client/employees')
+    assert environ['QUERY_STRING'] == 'fields=id,name'
+    assert (environ['SERVER_NAME'], environ['SERVER_PORT']) == ('mock.local', '8443')
+    assert (environ['REMOTE_ADDR'], environ['REMOTE_PORT']) == ('10.0.0.5', '51000')
+    assert environ['wsgi.url_scheme'] == 'https'
+    assert environ['CONTENT_TYPE'] == 'application/json'
+    assert environ['CONTENT_LENGTH'] == '8'
+    assert environ['HTTP_X_TRACE_ID'] == 'a,b'
+    assert environ['HTTP_AUTHORIZATION'] == 'Bearer t'
+    assert environ['wsgi.input'].read() == b'{"a": 1}'
+
+def test_read_body_joins_chunks():
+    """Test a body streamed over several http.request messages is reassembled"""
+    messages = [{'type': 'http.request', 'body': b'ab', 'more_body': True},
+                {'type': 'http.request', 'body': b'cd', 'more_body': False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    assert asyncio.run(MockASGIApp.read_body(receive)) == b'abcd'
+
+def test_requests_round_trip_through_flask():
+    """Test a chunked JSON POST reaches the handler and the response status, headers and body come back"""
+    async def scenario():
+        app = MockASGIApp()
+        headers = await bearer_headers(app)
+        body = json.dumps({'url': 'https://example.com/asgi-hook'}).encode()
+        created = await call(app, 'POST', '/api/v2/client/webhooks',
+                             headers=headers + [('Content-Type', 'application/json')],
+                             body_chunks=(body[:10], body[10:]))
+        unauthorized = await call(app, 'GET', '/api/v2/client/companies')
+        app.stop()
+        return created, unauthorized
+
+    created, unauthorized = asyncio.run(scenario())
+
+    assert created['status'] == 201
+    assert created['headers'][b'content-type'] == b'application/json'
+    assert json.loads(created['body'])['url'] == 'https://example.com/asgi-hook'
+    assert unauthorized['status'] == 401
+
+def test_handlers_run_off_the_event_loop():
+    """Test the synchronous WSGI app is called on worker threads, not the loop's thread"""
+    handler_threads = []
+
+    def wsgi_app(environ, start_response):
+        handler_threads.append(threading.current_thread())
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok']
+
+    async def scenario():
+        app = MockASGIApp(wsgi_app=wsgi_app)
+        await call(app, 'GET', '/api/v2/client/companies')
+        await call(app, 'GET', '/admin/stats')
+        app.stop()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert len(handler_threads) == 2
+    assert loop_thread not in handler_threads
+    assert handler_threads[0].name.startswith('mock-handler')
+    assert handler_threads[1].name.startswith('mock-admin')
+
+def test_slow_handler_does_not_block_other_requests():
+    """Test a request blocked in its handler leaves the loop free to answer others"""
+    release = threading.Event()
+
+    def wsgi_app(environ, start_response):
+        if environ['PATH_INFO'] == '/slow':
+            release.wait(5)
+        start_response('200 OK', [])
+        return [environ['PATH_INFO'].encode()]
+
+    async def scenario():
+        app = MockASGIApp(wsgi_app=wsgi_app)
+        slow = asyncio.ensure_future(call(app, 'GET', '/slow'))
+        fast = await asyncio.wait_for(call(app, 'GET', '/fast'), 2)
+        finished_before_release = slow.done()
+        release.set()
+        await slow
+        app.stop()
+        return fast, finished_before_release
+
+    fast, finished_before_release = asyncio.run(scenario())
+
+    assert fast['body'] == b'/fast'
+    assert not finished_before_release
+
+def test_long_poll_wakes_on_change_and_times_out():
+    """Test events long-polls wait on the loop until a write, or return empty after `wait`"""
+    async def scenario():
+        app = MockASGIApp()
+        headers = await bearer_headers(app)
+        latest = json.loads((await call(app, 'GET', '/api/v2/client/events', headers=headers))['body'])['latest_seq']
+
+        idle = await call(app, 'GET', '/api/v2/client/events', f'since={latest}&wait=0.1', headers)
+        poll = asyncio.ensure_future(call(app, 'GET', '/api/v2/client/events', f'since={latest}&wait=10', headers))
+        await asyncio.sleep(0.1)
+        waiting = not poll.done()
+        await call(app, 'POST', '/api/v2/client/webhooks', headers=headers + [('Content-Type', 'application/json')],
+                   body_chunks=(json.dumps({'url': 'https://example.com/wake'}).encode(),))
+        woken = await asyncio.wait_for(poll, 5)
+        app.stop()
+        return idle, waiting, woken
+
+    idle, waiting, woken = asyncio.run(scenario())
+
+    assert idle['status'] == 200 and json.loads(idle['body'])['data'] == []
+    assert waiting
+    assert woken['status'] == 200
+    assert json.loads(woken['body'])['data'][0]['collection'] == 'webhooks'
+
+def test_has_live_token_checks_expiry_under_token_lock():
+    """Test only unexpired bearer tokens count, and lookups wait for the token store lock"""
+    now = datetime.now()
+    with mock_server.token_lock:
+        mock_server.mock_data['tokens']['asgi-live'] = {'expires_at': now + timedelta(hours=1)}
+        mock_server.mock_data['tokens']['asgi-expired'] = {'expires_at': now - timedelta(seconds=1)}
+    try:
+        assert MockASGIApp.has_live_token({'HTTP_AUTHORIZATION': 'Bearer asgi-live'})
+        assert not MockASGIApp.has_live_token({'HTTP_AUTHORIZATION': 'Bearer asgi-expired'})
+        assert not MockASGIApp.has_live_token({'HTTP_AUTHORIZATION': 'Bearer unknown'})
+        assert not MockASGIApp.has_live_token({'HTTP_AUTHORIZATION': 'Basic YTpi'})
+
+        results = []
+        checker = threading.Thread(target=lambda: results.append(
+            MockASGIApp.has_live_token({'HTTP_AUTHORIZATION': 'Bearer asgi-live'})))
+        with mock_server.token_lock:
+            checker.start()
+            checker.join(0.1)
+            assert results == []
+        checker.join(5)
+        assert results == [True]
+    finally:
+        with mock_server.token_lock:
+            mock_server.mock_data['tokens'].pop('asgi-live', None)
+            mock_server.mock_data['tokens'].pop('asgi-expired', None)
+
+def test_lifespan_registers_change_listener():
+    """Test startup subscribes to store changes and shutdown unsubscribes"""
+    async def scenario():
+        app = MockASGIApp()
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+        registered = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+            registered.append(app.notifier is not None and app.notifier.notify in mock_server.change_listeners)
+
+        await app({'type': 'lifespan'}, receive, send)
+        return sent, registered
+
+    sent, registered = asyncio.run(scenario())
+
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    assert registered == [True, False]
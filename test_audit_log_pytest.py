@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's ring buffer and the request audit log
+"""
+
+import pytest
+import mock_server
+from ring_buffer import RingBuffer
+from route_stats import UNMATCHED_ROUTE
+
+AUDIT = '/api/v2/client/audit/logs'
+
+def test_ring_buffer_overwrites_oldest():
+    """Test sequence numbers keep counting while only the newest `capacity` entries are retained"""
+    ring = RingBuffer(3)
+    assert (len(ring), ring.oldest_seq, ring.newest()) == (0, 1, [])
+
+    for n in range(5):
+        assert ring.append(lambda seq: {'seq': seq, 'n': n}) == {'seq': n + 1, 'n': n}
+
+    assert (len(ring), ring.latest_seq, ring.oldest_seq) == (3, 5, 3)
+    assert ring.get(2) is None and ring.get(6) is None
+    assert ring.get(3)['n'] == 2
+    assert [entry['seq'] for entry in ring.newest()] == [5, 4, 3]
+    assert [entry['seq'] for entry in ring.newest(limit=2)] == [5, 4]
+
+def test_ring_buffer_since():
+    """Test since() pages oldest first from a cursor, skipping entries already overwritten"""
+    ring = RingBuffer(4)
+    for _ in range(6):
+        ring.append(lambda seq: seq)
+
+    assert ring.since(0, 10) == [3, 4, 5, 6]
+    assert ring.since(3, 2) == [4, 5]
+    assert ring.since(6, 10) == []
+
+def test_ring_buffer_needs_capacity():
+    """Test a buffer must hold at least one entry"""
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+@pytest.fixture
+def audit(monkeypatch):
+    """A fresh audit log, with helpers to add entries directly"""
+    log = RingBuffer(100)
+    monkeypatch.setattr(mock_server, 'audit_log', log)
+
+    def add(method='GET', path='/api/v2/client/employees', route='/api/v2/client/employees', status=200, latency_ms=1.0):
+        log.append(lambda seq: {'id': str(seq), 'method': method, 'path': path, 'route': route,
+                                'status': status, 'latency_ms': latency_ms})
+    return add
+
+def ids(client, headers, query=''):
+    response = client.get(f'{AUDIT}?{query}', headers=headers).json
+    return [int(entry['id']) for entry in response['data']]
+
+def test_requests_are_recorded(mock_server_client, mock_auth_headers, monkeypatch):
+    """Test API requests are logged with their matched route, admin requests are not"""
+    monkeypatch.setattr(mock_server, 'audit_log', RingBuffer(100))
+    mock_server_client.get('/api/v2/client/companies', headers=mock_auth_headers)
+    mock_server_client.get('/api/v2/client/no-such-thing', headers=mock_auth_headers)
+    mock_server_client.get('/admin/stats')
+
+    entries = mock_server_client.get(AUDIT, headers=mock_auth_headers).json['data']
+
+    assert [(entry['path'], entry['route'], entry['status']) for entry in entries] == [
+        ('/api/v2/client/no-such-thing', UNMATCHED_ROUTE, 404),
+        ('/api/v2/client/companies', '/api/v2/client/companies', 200),
+    ]
+    assert entries[1]['latency_ms'] >= 0 and entries[1]['method'] == 'GET'
+    latest = entries[0]['id']
+    assert mock_server_client.get(f'{AUDIT}/{latest}', headers=mock_auth_headers).json['path'] == '/api/v2/client/no-such-thing'
+    assert mock_server_client.get(f'{AUDIT}/999999', headers=mock_auth_headers).status_code == 404
+
+def test_status_filters(mock_server_client, mock_auth_headers, audit):
+    """Test `status` matches an exact code or a class such as 4xx"""
+    for status in (200, 404, 401, 503, 201):
+        audit(status=status)
+
+    assert ids(mock_server_client, mock_auth_headers, 'status=4xx') == [3, 2]
+    assert ids(mock_server_client, mock_auth_headers, 'status=4XX') == [3, 2]
+    assert ids(mock_server_client, mock_auth_headers, 'status=404') == [2]
+    # the three audit queries above are logged as 200s too
+    assert ids(mock_server_client, mock_auth_headers, 'status=2xx&before=6') == [5, 1]
+
+def test_method_route_and_path_filters(mock_server_client, mock_auth_headers, audit):
+    """Test method, exact route and shell-style path filters"""
+    audit(path='/api/v2/client/employees/E1', route='/api/v2/client/employees/<employee_id>')
+    audit(method='POST', path='/api/v2/client/employees')
+    audit(path='/api/v2/client/payroll/runs', route='/api/v2/client/payroll/runs')
+
+    assert ids(mock_server_client, mock_auth_headers, 'method=post') == [2]
+    assert ids(mock_server_client, mock_auth_headers, 'path=/api/v2/client/employees*') == [2, 1]
+    assert ids(mock_server_client, mock_auth_headers, 'path=*/payroll/*') == [3]
+    assert ids(mock_server_client, mock_auth_headers, 'route=/api/v2/client/employees/<employee_id>') == [1]
+
+def test_min_latency_filter(mock_server_client, mock_auth_headers, audit):
+    """Test min_latency_ms keeps only requests at least that slow"""
+    for latency_ms in (5.0, 250.0, 99.9, 100.0):
+        audit(latency_ms=latency_ms)
+
+    assert ids(mock_server_client, mock_auth_headers, 'min_latency_ms=100') == [4, 2]
+
+def test_before_pages_backwards(mock_server_client, mock_auth_headers, audit):
+    """Test limit and the cursor page newest first, and before= continues from the cursor"""
+    for _ in range(5):
+        audit()
+
+    first = mock_server_client.get(f'{AUDIT}?limit=2', headers=mock_auth_headers).json
+    assert [int(entry['id']) for entry in first['data']] == [5, 4]
+    assert first['pagination'] == {'cursor': '4', 'has_more': True}
+
+    assert ids(mock_server_client, mock_auth_headers, 'limit=2&before=4') == [3, 2]
+    last = mock_server_client.get(f'{AUDIT}?limit=2&before=2', headers=mock_auth_headers).json
+    assert [int(entry['id']) for entry in last['data']] == [1]
+    assert last['pagination']['has_more'] is False
+
+def test_filters_combine_with_paging(mock_server_client, mock_auth_headers, audit):
+    """Test a filtered page is full when enough matching entries exist, however many are skipped"""
+    for n in range(10):
+        audit(status=500 if n % 3 == 0 else 200)
+
+    page = mock_server_client.get(f'{AUDIT}?status=5xx&limit=2', headers=mock_auth_headers).json
+
+    assert [int(entry['id']) for entry in page['data']] == [10, 7]
+    assert page['pagination']['has_more'] is True
+    assert ids(mock_server_client, mock_auth_headers, 'status=5xx&before=7') == [4, 1]
+
+@pytest.mark.parametrize('query', ['limit=many', 'before=yesterday', 'min_latency_ms=slow'])
+def test_bad_filters_are_rejected(mock_server_client, mock_auth_headers, audit, query):
+    """Test non-numeric limit, before and min_latency_ms get a 400"""
+    assert mock_server_client.get(f'{AUDIT}?{query}', headers=mock_auth_headers).status_code == 400
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's background bulk employee imports
+"""
+
+import time
+
+import pytest
+import mock_server
+
+def wait_for_job(client, headers, job_id, timeout=5.0):
+    """Poll an import job until it finishes; return every status snapshot seen"""
+    seen = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/v2/client/bulk/import-jobs/{job_id}', headers=headers).json
+        seen.append(job)
+        if job['status'] in ('completed', 'failed'):
+            return seen
+        time.sleep(0.01)
+    pytest.fail(f'Import job {job_id} did not finish: {seen[-1]}')
+
+def test_bulk_import_completes(mock_server_client, mock_auth_headers):
+    """Test a queued import ingests every employee and reports progress until completed"""
+    employees = [{'first_name': f'Bulk{n}', 'last_name': 'Import'} for n in range(5)]
+    response = mock_server_client.post('/api/v2/client/bulk/employees/import', headers=mock_auth_headers,
+                                       json={'employees': employees, 'options': {'chunk_size': 2, 'chunk_delay_ms': 20}})
+
+    assert response.status_code == 201
+    assert response.json['status'] == 'queued'
+    assert response.json['total_records'] == 5
+    assert 'employees' not in response.json
+
+    seen = wait_for_job(mock_server_client, mock_auth_headers, response.json['id'])
+    final = seen[-1]
+    assert final['status'] == 'completed'
+    assert (final['processed_records'], final['failed_records'], final['progress']) == (5, 0, 100.0)
+    progress = [job['progress'] for job in seen]
+    assert progress == sorted(progress)
+    imported = [employee for employee in mock_server.mock_data['employees'].values()
+                if employee.get('import_job_id') == final['id']]
+    assert sorted(employee['first_name'] for employee in imported) == [f'Bulk{n}' for n in range(5)]
+
+def test_bulk_import_jobs_are_listed(mock_server_client, mock_auth_headers):
+    """Test jobs show up in the job list, and unknown jobs are 404s"""
+    job_id = mock_server_client.post('/api/v2/client/bulk/employees/import', headers=mock_auth_headers,
+                                     json={'employees': []}).json['id']
+    wait_for_job(mock_server_client, mock_auth_headers, job_id)
+
+    listed = mock_server_client.get('/api/v2/client/bulk/import-jobs', headers=mock_auth_headers).json['data']
+    assert job_id in {job['id'] for job in listed}
+    assert mock_server_client.get('/api/v2/client/bulk/import-jobs/nope', headers=mock_auth_headers).status_code == 404
+
+def test_bulk_import_records_per_row_errors():
+    """Test the runner counts bad rows as failures with their index, and still completes"""
+    job = {'id': 'job-row-errors', 'status': 'queued', 'total_records': 3}
+    mock_server.mock_data['bulk_jobs'][job['id']] = job
+
+    mock_server.run_bulk_import(job['id'], [{'first_name': 'Ok'}, 'not a record', None], 2, 0)
+
+    job = mock_server.mock_data['bulk_jobs'][job['id']]
+    assert job['status'] == 'completed'
+    assert (job['processed_records'], job['failed_records']) == (1, 2)
+    assert [error['index'] for error in job['errors']] == [1, 2]
+
+@pytest.mark.parametrize('body', [
+    None,
+    ['not', 'an', 'object'],
+    'employees',
+    {'employees': 'nobody'},
+    {'employees': [{'first_name': 'Ok'}, 'not a record']},
+    {'employees': [], 'options': 'fast'},
+    {'employees': [], 'options': {'chunk_size': 'big'}},
+    {'employees': [], 'options': {'chunk_delay_ms': 'slow'}},
+])
+def test_bulk_import_rejects_malformed_requests(mock_server_client, mock_auth_headers, body):
+    """Test malformed bodies and options are 400s with an error message, not 500s"""
+    response = mock_server_client.post('/api/v2/client/bulk/employees/import', headers=mock_auth_headers, json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+def test_bulk_import_clamps_options(mock_server_client, mock_auth_headers, monkeypatch):
+    """Test out-of-range chunk sizes and delays are clamped"""
+    submitted = []
+    monkeypatch.setattr(mock_server.job_executor, 'submit', lambda fn, *args: submitted.append(args))
+
+    for options in ({'chunk_size': 0, 'chunk_delay_ms': -50}, {'chunk_size': 10 ** 9, 'chunk_delay_ms': 10 ** 9}):
+        mock_server_client.post('/api/v2/client/bulk/employees/import', headers=mock_auth_headers,
+                                json={'employees': [], 'options': options})
+
+    assert [(chunk_size, delay) for _, _, chunk_size, delay in submitted] == [
+        (1, 0.0), (mock_server.MAX_BULK_IMPORT_CHUNK_SIZE, mock_server.MAX_BULK_IMPORT_CHUNK_DELAY_MS / 1000.0)]
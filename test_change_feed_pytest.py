@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's change feed, /api/v2/client/events
+"""
+
+import asyncio
+import time
+
+import pytest
+import mock_server
+from asgi_server import MockASGIApp
+
+EVENTS = '/api/v2/client/events'
+
+def latest_seq(client, headers):
+    return client.get(EVENTS, headers=headers).json['latest_seq']
+
+def test_events_after_a_cursor(mock_server_client, mock_auth_headers):
+    """Test a write shows up after the previous cursor, filtered by collection"""
+    since = latest_seq(mock_server_client, mock_auth_headers)
+    mock_server.record_change('webhooks', 'created', 'feed-test', {'id': 'feed-test'})
+
+    page = mock_server_client.get(f'{EVENTS}?since={since}', headers=mock_auth_headers).json
+    other = mock_server_client.get(f'{EVENTS}?since={since}&collection=employees', headers=mock_auth_headers).json
+
+    assert [(event['collection'], event['id']) for event in page['data']] == [('webhooks', 'feed-test')]
+    assert page['pagination'] == {'cursor': since + 1, 'has_more': False}
+    assert other['data'] == [] and other['pagination']['cursor'] == since + 1
+
+def test_long_poll_times_out_empty(mock_server_client, mock_auth_headers):
+    """Test a long-poll with nothing new returns an empty page after `wait` seconds"""
+    since = latest_seq(mock_server_client, mock_auth_headers)
+
+    started = time.perf_counter()
+    page = mock_server_client.get(f'{EVENTS}?since={since}&wait=0.05', headers=mock_auth_headers).json
+
+    assert page['data'] == []
+    assert 0.04 < time.perf_counter() - started < 5
+
+@pytest.mark.parametrize('query', ['wait=nan', 'wait=NaN', 'wait=inf', 'wait=-inf', 'wait=soon', 'since=x', 'limit=1.5'])
+def test_bad_parameters_are_rejected(mock_server_client, mock_auth_headers, query):
+    """Test non-numeric and non-finite parameters get a 400 instead of hanging the long-poll"""
+    response = mock_server_client.get(f'{EVENTS}?{query}', headers=mock_auth_headers)
+
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+def test_asgi_rejects_nan_wait(mock_auth_headers):
+    """Test the ASGI long-poll passes a NaN wait through to the handler's 400"""
+    async def scenario():
+        app = MockASGIApp()
+        scope = {'type': 'http', 'method': 'GET', 'path': EVENTS, 'query_string': b'since=0&wait=nan',
+                 'headers': [(name.lower().encode(), value.encode()) for name, value in mock_auth_headers.items()]}
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            sent.append(message)
+
+        await asyncio.wait_for(app(scope, receive, send), 5)
+        app.stop()
+        return sent[0]['status']
+
+    assert asyncio.run(scenario()) == 400
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's columnar record storage
+"""
+
+import pickle
+from array import array
+
+import pytest
+import compact_store
+from compact_store import ColumnarCollection, MISSING, RecordView, enable_compact_storage
+
+RECORDS = {
+    'ts1': {'id': 'ts1', 'employee_id': 'E1', 'hours': 8.0, 'status': 'approved'},
+    'ts2': {'id': 'ts2', 'employee_id': 'E2', 'hours': 7.5},
+    'ts3': {'id': 'ts3', 'employee_id': 'E1', 'hours': 6.0, 'status': 'pending', 'note': 'late'},
+}
+
+@pytest.fixture
+def collection():
+    return ColumnarCollection(RECORDS)
+
+def test_records_read_back_unchanged(collection):
+    """Test records come back equal to what was stored, without fields they never had"""
+    assert len(collection) == 3
+    assert {key: dict(record) for key, record in collection.items()} == RECORDS
+    assert 'status' not in collection['ts2']
+    assert isinstance(collection['ts1'], RecordView)
+    assert 'nope' not in collection
+    with pytest.raises(KeyError):
+        collection['nope']
+
+def test_record_view_writes_back(collection):
+    """Test item assignment, deletion, update, setdefault and pop reach the columns"""
+    record = collection['ts2']
+    record['status'] = 'approved'
+    record.update(hours=9.25, approver='M1')
+    record.setdefault('note', 'early')
+    assert record.pop('employee_id') == 'E2'
+    assert record.pop('missing', None) is None
+    del record['note']
+
+    assert dict(collection['ts2']) == {'id': 'ts2', 'hours': 9.25, 'status': 'approved', 'approver': 'M1'}
+    assert dict(collection['ts1']) == RECORDS['ts1']
+
+def test_float_columns_pack_until_a_non_float_arrives():
+    """Test a float column is an array('d') and falls back to a list without losing values"""
+    collection = ColumnarCollection({'a': {'hours': 1.5}})
+    collection['b'] = {'hours': 2.5}
+    assert type(collection._columns['hours']) is array
+
+    collection['c'] = {'hours': 'n/a'}
+
+    assert type(collection._columns['hours']) is list
+    assert [collection[key]['hours'] for key in 'abc'] == [1.5, 2.5, 'n/a']
+
+def test_deleted_rows_are_reused_without_stale_fields(collection):
+    """Test a freed row is reused and forgets the old record's fields"""
+    del collection['ts3']
+    collection['ts4'] = {'id': 'ts4', 'hours': 4.0}
+
+    assert len(collection) == 3
+    assert collection._row_count == 3
+    assert dict(collection['ts4']) == {'id': 'ts4', 'hours': 4.0}
+    assert 'ts3' not in collection
+
+def test_views_of_deleted_records_do_not_write(collection):
+    """Test writes through a view whose record was deleted are dropped"""
+    record = collection['ts1']
+    del collection['ts1']
+    record['status'] = 'rejected'
+
+    assert 'ts1' not in collection
+
+def test_pickle_round_trip_keeps_missing_marker(collection):
+    """Test pickled collections restore their records and the MISSING sentinel by identity"""
+    restored = pickle.loads(pickle.dumps(collection, protocol=5))
+
+    assert {key: dict(record) for key, record in restored.items()} == RECORDS
+    assert any(value is MISSING for value in restored._columns['note'])
+    assert type(pickle.loads(pickle.dumps(collection['ts1']))) is dict
+    assert repr(compact_store.MISSING) == 'MISSING'
+
+def test_enable_compact_storage():
+    """Test collections are converted in place, keeping their records, only once"""
+    store = {'timesheets': dict(RECORDS), 'employees': {}}
+    enable_compact_storage(store, ['timesheets'])
+    converted = store['timesheets']
+    enable_compact_storage(store, ['timesheets'])
+
+    assert isinstance(converted, ColumnarCollection)
+    assert store['timesheets'] is converted
+    assert type(store['employees']) is dict
+    assert {key: dict(record) for key, record in converted.items()} == RECORDS
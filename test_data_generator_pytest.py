@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's synthetic data generator and /admin/seed
+"""
+
+import pytest
+import mock_server
+from data_generator import GENERATED_COLLECTIONS, SyntheticDataGenerator
+
+def empty_store():
+    return {collection: {} for collection in GENERATED_COLLECTIONS}
+
+def generate(seed, employees=20, weeks=4):
+    store = empty_store()
+    counts = SyntheticDataGenerator(seed=seed, weeks=weeks).populate(store, employees=employees)
+    return store, counts
+
+def test_same_seed_gives_identical_records():
+    """Test a seed reproduces every record and ID, and a different seed does not"""
+    first, _ = generate(seed=42)
+    second, _ = generate(seed=42)
+    other, _ = generate(seed=43)
+
+    assert first == second
+    assert list(first['employees']) == list(second['employees'])
+    assert set(first['employees']).isdisjoint(other['employees'])
+    assert first['timesheets'] != other['timesheets']
+
+@pytest.mark.parametrize('employees, weeks', [(0, 4), (1, 1), (25, 4), (10, 5)])
+def test_counts_match_the_records_written(employees, weeks):
+    """Test the returned counts are exactly what landed in the store, for whole and partial pay periods"""
+    store, counts = generate(seed=7, employees=employees, weeks=weeks)
+    periods = weeks // 2
+
+    assert counts == {collection: len(store[collection]) for collection in GENERATED_COLLECTIONS}
+    assert counts['employees'] == employees
+    assert counts['timesheets'] == employees * weeks
+    assert counts['pay_stubs'] == employees * periods
+    assert counts['taxes'] == employees * periods * 3
+    assert counts['payroll_runs'] == periods
+
+def test_records_are_related():
+    """Test timesheets and pay stubs point at generated employees and payroll runs"""
+    store, _ = generate(seed=3)
+
+    employees, runs = set(store['employees']), set(store['payroll_runs'])
+    assert {timesheet['employee_id'] for timesheet in store['timesheets'].values()} == employees
+    assert all(stub['employee_id'] in employees and stub['payroll_run_id'] in runs
+               for stub in store['pay_stubs'].values())
+
+@pytest.fixture
+def seed_store(monkeypatch):
+    """Swap the server's generated collections for empty ones, restoring the originals afterwards"""
+    for collection in GENERATED_COLLECTIONS:
+        monkeypatch.setitem(mock_server.mock_data, collection, {})
+
+def test_admin_seed(mock_server_client, seed_store):
+    """Test seeding through the admin endpoint is reproducible and reports what it wrote"""
+    response = mock_server_client.post('/admin/seed', json={'employees': 5, 'seed': 1, 'weeks': 2, 'reset': True})
+
+    assert response.status_code == 201
+    assert response.json['counts']['employees'] == len(mock_server.mock_data['employees']) == 5
+    assert response.json['total_records'] == sum(response.json['counts'].values())
+    seeded = dict(mock_server.mock_data['employees'])
+
+    mock_server_client.post('/admin/seed', json={'employees': 5, 'seed': 1, 'weeks': 2, 'reset': True})
+    assert mock_server.mock_data['employees'] == seeded
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    'employees',
+    {'employees': -5},
+    {'weeks': -1},
+    {'employees': 'many'},
+    {'seed': None},
+])
+def test_admin_seed_rejects_bad_options(mock_server_client, seed_store, body):
+    """Test malformed seed requests get a 400 and write nothing"""
+    response = mock_server_client.post('/admin/seed', json=body)
+
+    assert response.status_code == 400
+    assert 'error' in response.json
+    assert mock_server.mock_data['employees'] == {}
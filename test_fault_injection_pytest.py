@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's latency and fault-injection profiles
+"""
+
+import pytest
+import mock_server
+from fault_injection import FaultProfile, drip_chunks
+
+def test_first_matching_rule_wins():
+    """Test routes match in order, honour methods, and fall back to the default"""
+    profile = FaultProfile({
+        'default': {'latency': {'ms': 1}},
+        'routes': [
+            {'match': '/api/v2/client/employees*', 'methods': ['POST'], 'latency': {'ms': 2}},
+            {'match': '/api/v2/client/employees*', 'latency': {'ms': 3}},
+        ]
+    })
+
+    assert profile.match('POST', '/api/v2/client/employees')['latency']['ms'] == 2
+    assert profile.match('GET', '/api/v2/client/employees/1')['latency']['ms'] == 3
+    assert profile.match('GET', '/api/v2/client/companies') is profile.default
+
+def test_latency_distributions():
+    """Test fixed delays, and long-tail delays capped at max_ms"""
+    profile = FaultProfile({'seed': 1})
+
+    assert profile.sample_latency({'latency': {'distribution': 'fixed', 'ms': 250}}) == 0.25
+    assert profile.sample_latency({}) == 0.0
+    long_tail = {'latency': {'distribution': 'long_tail', 'median_ms': 50, 'sigma': 3, 'max_ms': 100}}
+    assert all(0 <= profile.sample_latency(long_tail) <= 0.1 for _ in range(1000))
+
+def test_seeded_profiles_repeat():
+    """Test the same seed reproduces the same faults"""
+    rule = {'errors': {'429': 0.3, '503': 0.3}}
+    first = FaultProfile({'seed': 7})
+    second = FaultProfile({'seed': 7})
+
+    faults = [first.sample_fault(rule) for _ in range(200)]
+    assert faults == [second.sample_fault(rule) for _ in range(200)]
+    assert {429, 503, None} == set(faults)
+
+def test_fault_probabilities_at_the_bounds():
+    """Test probability 1 always faults and 0 never does"""
+    profile = FaultProfile({'seed': 3})
+
+    assert {profile.sample_fault({'errors': {'503': 1}}) for _ in range(50)} == {503}
+    assert {profile.sample_fault({'errors': {'429': 0}}) for _ in range(50)} == {None}
+
+@pytest.mark.parametrize('rule', [
+    {'latency': {'distribution': 'uniform'}},
+    {'errors': {'500': 0.1}},
+    {'errors': {'429': 1.5}},
+])
+def test_invalid_rules_are_rejected(rule):
+    """Test unknown distributions, statuses and probabilities raise ValueError"""
+    with pytest.raises(ValueError):
+        FaultProfile({'routes': [rule]})
+
+def test_drip_chunks():
+    """Test bodies are split into chunks with a delay before every chunk but the first"""
+    chunks = list(drip_chunks({'chunk_bytes': 4, 'interval_ms': 20}, b'0123456789'))
+
+    assert [chunk for _, chunk in chunks] == [b'0123', b'4567', b'89']
+    assert [delay for delay, _ in chunks] == [0.0, 0.02, 0.02]
+
+def test_injected_faults_are_served(mock_server_client, mock_auth_headers, monkeypatch):
+    """Test a profile turns matching requests into 503s with Retry-After, leaving /admin alone"""
+    monkeypatch.setattr(mock_server, 'fault_profile',
+                        FaultProfile({'routes': [{'match': '*', 'errors': {'503': 1}, 'retry_after': 4}]}))
+
+    response = mock_server_client.get('/api/v2/client/health', headers=mock_auth_headers)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '4'
+    assert mock_server_client.get('/admin/fault-profile').status_code == 200
+
+def test_dripped_responses_keep_their_body(mock_server_client, mock_auth_headers, monkeypatch):
+    """Test slow-drip responses stream the unchanged body with its full Content-Length"""
+    expected = mock_server_client.get('/api/v2/client/health', headers=mock_auth_headers)
+    monkeypatch.setattr(mock_server, 'fault_profile',
+                        FaultProfile({'default': {'drip': {'chunk_bytes': 8, 'interval_ms': 0}}}))
+
+    response = mock_server_client.get('/api/v2/client/health', headers=mock_auth_headers)
+
+    assert response.is_streamed
+    assert response.json['status'] == expected.json['status']
+    assert int(response.headers['Content-Length']) == len(response.get_data())
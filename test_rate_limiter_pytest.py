@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's per-token rate limits
+"""
+
+import pytest
+import mock_server
+from rate_limiter import RateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def limiter(config):
+    clock = FakeClock()
+    return RateLimiter(config, clock=clock), clock
+
+def test_quota_within_one_window():
+    """Test requests count down the quota and the first one over it is refused"""
+    limits, _ = limiter({'default': {'limit': 3, 'window_seconds': 10}})
+
+    decisions = [limits.check('token', 'GET', '/api/v2/client/employees') for _ in range(4)]
+
+    assert [decision.allowed for decision in decisions] == [True, True, True, False]
+    assert [decision.remaining for decision in decisions] == [2, 1, 0, 0]
+    assert decisions[0].reset_after == 10
+    assert decisions[3].headers()['Retry-After'] == str(decisions[3].retry_after)
+    assert 'Retry-After' not in decisions[0].headers()
+
+def test_retry_after_is_when_the_sliding_window_admits_again():
+    """Test Retry-After points at the first second a retry is allowed, not earlier"""
+    limits, clock = limiter({'default': {'limit': 3, 'window_seconds': 10}})
+    for _ in range(3):
+        limits.check('token', 'GET', '/x')
+    denied = limits.check('token', 'GET', '/x')
+    assert denied.retry_after == 14
+
+    clock.now = denied.retry_after - 1
+    assert not limits.check('token', 'GET', '/x').allowed
+    clock.now = denied.retry_after
+    assert limits.check('token', 'GET', '/x').allowed
+
+def test_previous_window_is_weighted_by_overlap():
+    """Test last window's count fades out as the sliding window moves past it"""
+    limits, clock = limiter({'default': {'limit': 4, 'window_seconds': 10}})
+    for _ in range(4):
+        limits.check('token', 'GET', '/x')
+
+    clock.now = 12.5  # previous window still overlaps 75%: estimate 3 + 1 fits, a second doesn't
+    assert limits.check('token', 'GET', '/x').allowed
+    assert not limits.check('token', 'GET', '/x').allowed
+
+    clock.now = 35  # two idle windows carry nothing over
+    assert [limits.check('token', 'GET', '/x').allowed for _ in range(5)] == [True] * 4 + [False]
+
+def test_groups_tokens_and_unlimited_routes():
+    """Test groups match in order by path and method, each token has its own quota, and unmatched routes are free"""
+    limits, _ = limiter({'groups': [
+        {'name': 'bulk', 'match': '/api/v2/client/bulk/*', 'methods': ['POST'], 'limit': 1, 'window_seconds': 60},
+        {'match': '/api/v2/client/payroll/*', 'limit': 1, 'window_seconds': 60},
+    ]})
+
+    assert limits.check('a', 'POST', '/api/v2/client/bulk/employees').group == 'bulk'
+    assert not limits.check('a', 'POST', '/api/v2/client/bulk/employees').allowed
+    assert limits.check('b', 'POST', '/api/v2/client/bulk/employees').allowed
+    assert limits.check('a', 'GET', '/api/v2/client/bulk/employees') is None
+    assert limits.check('a', 'GET', '/api/v2/client/payroll/runs').group == '/api/v2/client/payroll/*'
+    assert limits.check('a', 'GET', '/api/v2/client/employees') is None
+
+def test_idle_windows_are_pruned():
+    """Test counters idle for two of the longest windows are dropped"""
+    limits, clock = limiter({'default': {'limit': 5, 'window_seconds': 10}})
+    limits.check('old', 'GET', '/x')
+    clock.now = 15
+    limits.check('recent', 'GET', '/x')
+
+    clock.now = 20
+    limits._prune(clock.now)
+
+    assert list(limits.windows) == [('recent', 'default')]
+    assert limits.to_dict()['tracked_windows'] == 1
+
+@pytest.mark.parametrize('config', [
+    {'default': {'limit': 0, 'window_seconds': 10}},
+    {'default': {'limit': 5, 'window_seconds': 0}},
+    {'groups': [{'match': '/x', 'limit': 5}]},
+    {'groups': [{'match': '/x', 'limit': 'many', 'window_seconds': 10}]},
+])
+def test_invalid_policies(config):
+    """Test policies without a positive limit and window are refused"""
+    with pytest.raises(ValueError):
+        RateLimiter(config)
+
+def test_over_quota_requests_get_429(mock_server_client, mock_auth_headers, monkeypatch):
+    """Test the server answers over-quota requests with 429, Retry-After and rate-limit headers"""
+    monkeypatch.setattr(mock_server, 'rate_limiter', RateLimiter({'default': {'limit': 2, 'window_seconds': 60}}))
+
+    responses = [mock_server_client.get('/api/v2/client/companies', headers=mock_auth_headers) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert [response.headers['X-RateLimit-Remaining'] for response in responses] == ['1', '0', '0']
+    limited = responses[2]
+    assert limited.headers['X-RateLimit-Limit'] == '2'
+    assert limited.headers['X-RateLimit-Group'] == 'default'
+    assert int(limited.headers['Retry-After']) >= 1
+    assert limited.get_json() == {'error': 'Too Many Requests', 'retry_after': int(limited.headers['Retry-After'])}
+
+def test_admin_endpoints_do_not_count(mock_server_client, monkeypatch):
+    """Test /admin/* requests are never rate limited"""
+    monkeypatch.setattr(mock_server, 'rate_limiter', RateLimiter({'default': {'limit': 1, 'window_seconds': 60}}))
+
+    for _ in range(3):
+        response = mock_server_client.get('/admin/rate-limits')
+        assert response.status_code == 200
+        assert 'X-RateLimit-Limit' not in response.headers
+
+def test_admin_rate_limits_endpoint(mock_server_client, mock_auth_headers, monkeypatch):
+    """Test policies can be installed, read back, rejected when invalid and removed at runtime"""
+    monkeypatch.setattr(mock_server, 'rate_limiter', None)
+    policy = {'default': {'limit': 1, 'window_seconds': 60}}
+
+    assert mock_server_client.get('/admin/rate-limits').get_json() == {}
+    installed = mock_server_client.put('/admin/rate-limits', json=policy)
+    assert installed.status_code == 200
+    assert installed.get_json() == dict(policy, tracked_windows=0)
+
+    mock_server_client.get('/api/v2/client/companies', headers=mock_auth_headers)
+    assert mock_server_client.get('/api/v2/client/companies', headers=mock_auth_headers).status_code == 429
+    assert mock_server_client.get('/admin/rate-limits').get_json()['tracked_windows'] == 1
+
+    rejected = mock_server_client.put('/admin/rate-limits', json={'default': {'limit': -1, 'window_seconds': 60}})
+    assert rejected.status_code == 400
+    assert 'limit' in rejected.get_json()['error']
+    assert mock_server_client.get('/admin/rate-limits').get_json()['default'] == policy['default']
+
+    assert mock_server_client.delete('/admin/rate-limits').status_code == 204
+    assert mock_server.rate_limiter is None
+    assert mock_server_client.get('/api/v2/client/companies', headers=mock_auth_headers).status_code == 200
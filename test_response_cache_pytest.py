@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's ETags, conditional GETs and response cache
+"""
+
+import pytest
+import mock_server
+from mock_server import ResponseCache
+
+EMPLOYEES = '/api/v2/client/employees'
+
+@pytest.fixture
+def cache(mock_server_client):
+    """Start from an empty response cache, and leave the server's collections as they were"""
+    saved = dict(mock_server.mock_data)
+    mock_server.response_cache.clear()
+    yield mock_server_client
+    mock_server.mock_data.update(saved)
+    mock_server.response_cache.clear()
+
+def cache_stats(client):
+    return client.get('/admin/cache').json
+
+def test_if_none_match_gets_304(cache, mock_auth_headers):
+    """Test a matching validator gets an empty 304, and a stale or different one the full body"""
+    first = cache.get(EMPLOYEES, headers=mock_auth_headers)
+    etag = first.headers['ETag']
+    assert etag.startswith('W/"employees-')
+
+    not_modified = cache.get(EMPLOYEES, headers=dict(mock_auth_headers, **{'If-None-Match': etag}))
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b''
+    assert not_modified.headers['ETag'] == etag
+
+    other = cache.get(EMPLOYEES, headers=dict(mock_auth_headers, **{'If-None-Match': 'W/"employees-0-0"'}))
+    assert other.status_code == 200 and other.get_data() == first.get_data()
+    assert cache.get(f'{EMPLOYEES}?fields=id', headers=mock_auth_headers).headers['ETag'] != etag
+
+def test_conditional_get_still_needs_auth(cache, mock_auth_headers):
+    """Test a valid ETag without a token is not answered from the cache or with a 304"""
+    etag = cache.get(EMPLOYEES, headers=mock_auth_headers).headers['ETag']
+
+    assert cache.get(EMPLOYEES, headers={'If-None-Match': etag}).status_code == 401
+    assert cache.get(EMPLOYEES).status_code == 401
+
+def test_second_get_is_a_cache_hit(cache, mock_auth_headers):
+    """Test repeating a GET serves the stored body without rebuilding it"""
+    before = cache_stats(cache)
+    first = cache.get(EMPLOYEES, headers=mock_auth_headers)
+    second = cache.get(EMPLOYEES, headers=mock_auth_headers)
+    after = cache_stats(cache)
+
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert after['hits'] == before['hits'] + 1
+    assert after['misses'] == before['misses'] + 1
+    assert after['entries'] == 1 and after['bytes'] == len(first.get_data())
+
+def test_write_invalidates_cache_and_etag(cache, mock_auth_headers):
+    """Test a write changes the ETag and the next GET misses and sees the new record"""
+    first = cache.get(EMPLOYEES, headers=mock_auth_headers)
+    created = cache.post(EMPLOYEES, headers=mock_auth_headers, json={'first_name': 'Cache', 'last_name': 'Buster'}).json
+    misses = cache_stats(cache)['misses']
+
+    refreshed = cache.get(EMPLOYEES, headers=dict(mock_auth_headers, **{'If-None-Match': first.headers['ETag']}))
+
+    assert refreshed.status_code == 200
+    assert refreshed.headers['ETag'] != first.headers['ETag']
+    assert created['id'] in {employee['id'] for employee in refreshed.json['data']}
+    assert cache_stats(cache)['misses'] == misses + 1
+    del mock_server.mock_data['employees'][created['id']]
+
+def test_restore_invalidates_cache(cache, mock_auth_headers, tmp_path, monkeypatch):
+    """Test /admin/restore bumps versions and empties the cache, so the next GET misses"""
+    monkeypatch.setattr(mock_server, 'SNAPSHOT_DIR', str(tmp_path))
+    assert cache.post('/admin/snapshot', json={'name': 'cache.pkl'}).status_code == 201
+    first = cache.get(EMPLOYEES, headers=mock_auth_headers)
+    cache.get(EMPLOYEES, headers=mock_auth_headers)
+    assert cache_stats(cache)['entries'] == 1
+
+    assert cache.post('/admin/restore', json={'name': 'cache.pkl'}).status_code == 200
+    assert cache_stats(cache)['entries'] == 0
+    misses = cache_stats(cache)['misses']
+    restored = cache.get(EMPLOYEES, headers=dict(mock_auth_headers, **{'If-None-Match': first.headers['ETag']}))
+
+    assert restored.status_code == 200
+    assert restored.headers['ETag'] != first.headers['ETag']
+    assert cache_stats(cache)['misses'] == misses + 1
+
+def test_admin_cache_counters_and_clear(cache, mock_auth_headers):
+    """Test /admin/cache reports hits, misses and hit rate, and DELETE empties the cache"""
+    before = cache_stats(cache)
+    for _ in range(3):
+        cache.get(EMPLOYEES, headers=mock_auth_headers)
+    stats = cache_stats(cache)
+
+    assert (stats['hits'] - before['hits'], stats['misses'] - before['misses']) == (2, 1)
+    assert stats['hit_rate'] == round(stats['hits'] / (stats['hits'] + stats['misses']), 4)
+
+    assert cache.delete('/admin/cache').status_code == 204
+    assert cache_stats(cache)['entries'] == 0 and cache_stats(cache)['bytes'] == 0
+    cache.get(EMPLOYEES, headers=mock_auth_headers)
+    assert cache_stats(cache)['misses'] == stats['misses'] + 1
+
+def test_response_cache_bounds():
+    """Test the LRU evicts by entry count and total bytes, skips oversized bodies and checks versions"""
+    lru = ResponseCache(max_entries=2, max_bytes=10)
+    lru.put('a', 1, b'aaaa')
+    lru.put('b', 1, b'bbbb')
+    assert lru.get('a', 1) == b'aaaa'
+    lru.put('c', 1, b'cccc')
+
+    assert lru.get('b', 1) is None
+    assert lru.get('a', 2) is None
+    lru.put('d', 1, b'dddddd')
+    assert list(lru.entries) == ['c', 'd'] and lru.total_bytes == 10
+    lru.put('huge', 1, b'x' * 11)
+    assert 'huge' not in lru.entries
+    assert lru.stats()['evictions'] == 2
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's per-route quantile sketches and stats
+"""
+
+import random
+import pytest
+import mock_server
+from route_stats import UNMATCHED_ROUTE, QuantileSketch, RouteStats
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+def test_sketch_quantiles_within_relative_accuracy():
+    """Test estimates stay within 1% of the exact quantile across a wide value range"""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(1, 2) for _ in range(20000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999):
+        exact = exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert sketch.count == len(values)
+    assert sketch.min == min(values) and sketch.max == max(values)
+    assert len(sketch.buckets) < 2000
+
+def test_sketch_zero_and_empty():
+    """Test zero samples land below every positive value, and empty sketches report nothing"""
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.summary() == {'count': 0}
+
+    for value in (0, 0, 0, 5):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == 5
+    assert sketch.summary()['mean'] == 1.25
+
+def test_route_stats_snapshot_and_prometheus():
+    """Test per-route snapshots order busiest first and render as Prometheus summaries"""
+    stats = RouteStats()
+    for _ in range(3):
+        stats.record('GET', '/api/v2/client/employees', 200, 2.0, 0.5, 100)
+    stats.record('POST', '/api/v2/client/employees', 201, 4.0, 0.5, None)
+    stats.record('GET', '/api/v2/client/employees', 404, 1.0, 0.0, 20)
+
+    snapshot = stats.snapshot()
+    assert [(entry['method'], entry['route']) for entry in snapshot] == [
+        ('GET', '/api/v2/client/employees'), ('POST', '/api/v2/client/employees')]
+    assert snapshot[0]['statuses'] == {'200': 3, '404': 1}
+    assert snapshot[1]['response_bytes'] == {'count': 0}
+
+    text = stats.prometheus()
+    assert 'mock_ukg_requests_total{method="GET",route="/api/v2/client/employees",status="404"} 1' in text
+    assert 'mock_ukg_handler_seconds_count{method="GET",route="/api/v2/client/employees"} 4' in text
+    assert 'mock_ukg_response_bytes_count{method="POST"' not in text
+
+    stats.reset()
+    assert stats.snapshot() == []
+
+def test_unmatched_paths_share_one_series(mock_server_client, mock_auth_headers):
+    """Test 404s on distinct unknown paths are counted under one route label"""
+    mock_server.route_stats.reset()
+    for n in range(5):
+        response = mock_server_client.get(f'/api/v2/client/no-such-thing-{n}', headers=mock_auth_headers)
+        assert response.status_code == 404
+
+    routes = mock_server_client.get('/admin/stats').get_json()['routes']
+    unmatched = [entry for entry in routes if entry['route'] == UNMATCHED_ROUTE]
+    assert len(unmatched) == 1 and unmatched[0]['statuses'] == {'404': 5}
+    assert not any('no-such-thing' in entry['route'] for entry in routes)
+
+    metrics = mock_server_client.get('/admin/metrics').get_data(as_text=True)
+    assert 'no-such-thing' not in metrics
+    assert 'mock_ukg_requests_total{method="GET",route="<unmatched>",status="404"} 5' in metrics
+    mock_server.route_stats.reset()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for mock server snapshots and the /admin/snapshot and /admin/restore endpoints
+"""
+
+import pickle
+
+import pytest
+import mock_server
+from compact_store import ColumnarCollection
+from snapshot import dump_snapshot, load_snapshot, resolve_snapshot_name
+
+EMPLOYEES = {'E1': {'id': 'E1', 'name': 'Ada'}, 'E2': {'id': 'E2', 'name': 'Grace'}}
+TIMESHEETS = {'T1': {'id': 'T1', 'employee_id': 'E1', 'hours': 8.0}, 'T2': {'id': 'T2', 'employee_id': 'E2', 'hours': 7.5}}
+
+@pytest.fixture
+def mock_store(tmp_path, monkeypatch):
+    """Snapshot into a scratch directory, and put the mock server's collections back afterwards"""
+    monkeypatch.setattr(mock_server, 'SNAPSHOT_DIR', str(tmp_path))
+    saved = dict(mock_server.mock_data)
+    yield mock_server.mock_data
+    mock_server.mock_data.update(saved)
+
+def plain(records):
+    return {key: dict(record) for key, record in records.items()}
+
+def test_dump_and_load_round_trip(tmp_path):
+    """Test snapshots hold every collection except tokens"""
+    path = tmp_path / 'state.pkl'
+    dump_snapshot({'employees': EMPLOYEES, 'tokens': {'t': {}}}, str(path))
+
+    assert load_snapshot(str(path)) == {'employees': EMPLOYEES}
+    assert not (tmp_path / 'state.pkl.tmp').exists()
+
+@pytest.mark.parametrize('payload', [
+    {'format': 99, 'collections': {}},
+    {'format': 1, 'collections': {'employees': ['not', 'a', 'mapping']}},
+    ['not', 'a', 'snapshot'],
+])
+def test_load_rejects_malformed_snapshots(tmp_path, payload):
+    """Test unknown formats and non-mapping collections are rejected"""
+    path = tmp_path / 'bad.pkl'
+    path.write_bytes(pickle.dumps(payload))
+
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
+
+@pytest.mark.parametrize('name', ['../escape.pkl', '/etc/passwd', 'nested/state.pkl', '..', '', 42])
+def test_snapshot_names_stay_inside_the_directory(tmp_path, name):
+    """Test names with path components are refused"""
+    with pytest.raises(ValueError):
+        resolve_snapshot_name(str(tmp_path), name)
+
+def test_snapshot_names_reject_symlinks_out(tmp_path):
+    """Test a link inside the directory cannot point outside it"""
+    (tmp_path / 'snapshots').mkdir()
+    (tmp_path / 'snapshots' / 'link.pkl').symlink_to(tmp_path / 'outside.pkl')
+
+    with pytest.raises(ValueError):
+        resolve_snapshot_name(str(tmp_path / 'snapshots'), 'link.pkl')
+
+def test_snapshot_endpoints_round_trip(mock_server_client, mock_store, tmp_path):
+    """Test a dumped state comes back after the collections change"""
+    mock_store['employees'] = dict(EMPLOYEES)
+    response = mock_server_client.post('/admin/snapshot', json={'name': 'state.pkl'})
+    assert response.status_code == 201
+    assert (tmp_path / 'state.pkl').exists()
+
+    mock_store['employees'] = {}
+    response = mock_server_client.post('/admin/restore', json={'name': 'state.pkl'})
+
+    assert response.status_code == 200
+    assert plain(mock_store['employees']) == EMPLOYEES
+
+@pytest.mark.parametrize('endpoint', ['/admin/snapshot', '/admin/restore'])
+def test_snapshot_endpoints_refuse_paths(mock_server_client, mock_store, endpoint):
+    """Test the endpoints only take file names inside the snapshot directory"""
+    response = mock_server_client.post(endpoint, json={'name': '../../tmp/owned.pkl'})
+
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+def test_restore_keeps_compact_collections_compact(mock_server_client, mock_store, tmp_path):
+    """Test a snapshot of plain dicts restores into columnar collections on a compact server"""
+    dump_snapshot({'timesheets': TIMESHEETS, 'employees': EMPLOYEES}, str(tmp_path / 'dicts.pkl'))
+    mock_store['timesheets'] = ColumnarCollection()
+
+    response = mock_server_client.post('/admin/restore', json={'name': 'dicts.pkl'})
+
+    assert response.status_code == 200
+    assert isinstance(mock_store['timesheets'], ColumnarCollection)
+    assert plain(mock_store['timesheets']) == TIMESHEETS
+    assert type(mock_store['employees']) is dict
+
+def test_restore_of_compact_snapshot_into_plain_server(mock_store, tmp_path):
+    """Test columnar collections come back as plain dicts where the server stores dicts"""
+    dump_snapshot({'timesheets': ColumnarCollection(TIMESHEETS)}, str(tmp_path / 'compact.pkl'))
+    mock_store['timesheets'] = {}
+
+    mock_server.restore_snapshot(str(tmp_path / 'compact.pkl'))
+
+    assert type(mock_store['timesheets']) is dict
+    assert mock_store['timesheets'] == TIMESHEETS
+
+def test_failed_restore_changes_nothing(mock_server_client, mock_store, tmp_path):
+    """Test a snapshot with one bad collection leaves every collection as it was"""
+    (tmp_path / 'bad.pkl').write_bytes(pickle.dumps(
+        {'format': 1, 'collections': {'employees': {}, 'timesheets': 'broken'}}))
+    mock_store['employees'] = dict(EMPLOYEES)
+
+    response = mock_server_client.post('/admin/restore', json={'name': 'bad.pkl'})
+
+    assert response.status_code == 400
+    assert mock_store['employees'] == EMPLOYEES
+
+def test_restore_of_missing_snapshot(mock_server_client, mock_store):
+    """Test restoring a snapshot that does not exist"""
+    assert mock_server_client.post('/admin/restore', json={'name': 'absent.pkl'}).status_code == 404
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the mock server's token expiry and bounded token store
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import mock_server
+
+START = datetime(2026, 1, 1, 9, 0, 0)
+
+class FakeDatetime(datetime):
+    current = START
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+@pytest.fixture
+def clock(monkeypatch):
+    """An empty token store and a clock the test moves by hand"""
+    monkeypatch.setitem(mock_server.mock_data, 'tokens', {})
+    monkeypatch.setattr(mock_server, 'token_expiry_heap', [])
+    monkeypatch.setattr(mock_server, 'datetime', FakeDatetime)
+    monkeypatch.setattr(mock_server, 'TOKEN_TTL_SECONDS', 60)
+    FakeDatetime.current = START
+
+    def advance(seconds):
+        FakeDatetime.current += timedelta(seconds=seconds)
+    return advance
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+def test_token_works_until_it_expires(mock_server_client, clock):
+    """Test a token is accepted within its TTL and refused with 401 once it has expired"""
+    token = mock_server_client.post('/api/v2/client/tokens', headers={'Authorization': 'Basic dGVzdDp0ZXN0'}).json
+    assert token['expires_in'] == 60
+
+    clock(59)
+    assert mock_server_client.get('/api/v2/client/companies', headers=bearer(token['access_token'])).status_code == 200
+    clock(1)
+    assert mock_server_client.get('/api/v2/client/companies', headers=bearer(token['access_token'])).status_code == 401
+    assert token['access_token'] not in mock_server.mock_data['tokens']
+
+def test_expired_tokens_are_swept_from_heap_and_store(clock):
+    """Test expired entries leave both the expiry heap and the token dict, while live ones stay"""
+    expired = [mock_server.issue_token() for _ in range(5)]
+    clock(30)
+    live = mock_server.issue_token()
+    clock(31)
+
+    fresh = mock_server.issue_token()
+
+    assert set(mock_server.mock_data['tokens']) == {live, fresh}
+    assert sorted(token for _, token in mock_server.token_expiry_heap) == sorted([live, fresh])
+    assert not set(expired) & set(mock_server.mock_data['tokens'])
+
+def test_sweep_is_batched(clock):
+    """Test one sweep evicts at most TOKEN_SWEEP_BATCH expired tokens, leaving the rest for later calls"""
+    for _ in range(mock_server.TOKEN_SWEEP_BATCH + 10):
+        mock_server.issue_token()
+    clock(61)
+
+    assert mock_server.evict_expired_tokens(FakeDatetime.now()) == mock_server.TOKEN_SWEEP_BATCH
+    assert mock_server.evict_expired_tokens(FakeDatetime.now()) == 10
+    assert mock_server.mock_data['tokens'] == {} and mock_server.token_expiry_heap == []
+
+def test_store_never_exceeds_max_tokens(clock, monkeypatch):
+    """Test a full store of live tokens drops the ones closest to expiry"""
+    monkeypatch.setattr(mock_server, 'MAX_TOKENS', 3)
+    issued = []
+    for _ in range(10):
+        issued.append(mock_server.issue_token())
+        assert len(mock_server.mock_data['tokens']) <= 3
+        clock(1)
+
+    assert set(mock_server.mock_data['tokens']) == set(issued[-3:])
+    assert len(mock_server.token_expiry_heap) == 3
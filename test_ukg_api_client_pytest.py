@@ -56,20 +56,15 @@ def test_create_timesheet(mock_make_request, mock_client):
     assert result['id'] == 'ts_123'
     mock_make_request.assert_called_once_with('POST', 'time-attendance/timesheets', data=timesheet_data)
 
-@patch('ukg_api_client.requests.get')
-def test_get_timesheets(mock_get, mock_client):
+@patch.object(UKGAPIClient, 'make_request')
+def test_get_timesheets(mock_make_request, mock_client):
     """Test retrieving timesheets"""
-    mock_get.return_value.json.return_value = {'data': [{'id': 'ts_123', 'employee_id': '123'}]}
-    mock_get.return_value.raise_for_status.return_value = None
+    mock_make_request.return_value = {'data': [{'id': 'ts_123', 'employee_id': '123'}]}
     
     result = mock_client.get_timesheets(employee_id='123')
     
     assert len(result['data']) == 1
-    mock_get.assert_called_once_with(
-        f"{mock_client.BASE_URL}/api/v2/client/time-attendance/timesheets",
-        headers=mock_client.headers,
-        params={'employee_id': '123'}
-    )
+    mock_make_request.assert_called_once_with('GET', 'time-attendance/timesheets', params={'employee_id': '123'})
 
 @patch.object(UKGAPIClient, 'make_request')
 def test_create_vacation_request(mock_make_request, mock_client):
@@ -122,6 +117,72 @@ def test_get_vacation_requests(mock_make_request, mock_client):
     assert len(result['data']) == 1
     mock_make_request.assert_called_once_with('GET', 'time-off/requests', params={'employee_id': '123'})
 
+@patch('ukg_api_client.requests.request')
+def test_make_request_revalidates_with_etag(mock_request, mock_client):
+    """Test conditional GETs reuse the cached body on 304 Not Modified"""
+    first = Mock(status_code=200, headers={'ETag': 'W/"departments-1-abc"'})
+    first.json.return_value = {'data': [{'id': 'DEPT001'}]}
+    not_modified = Mock(status_code=304, headers={'ETag': 'W/"departments-1-abc"'})
+    mock_request.side_effect = [first, not_modified]
+    
+    assert mock_client.get_departments() == {'data': [{'id': 'DEPT001'}]}
+    assert mock_client.get_departments() == {'data': [{'id': 'DEPT001'}]}
+    
+    first_headers = mock_request.call_args_list[0].kwargs['headers']
+    second_headers = mock_request.call_args_list[1].kwargs['headers']
+    assert 'If-None-Match' not in first_headers
+    assert second_headers['If-None-Match'] == 'W/"departments-1-abc"'
+    not_modified.json.assert_not_called()
+
+@patch('ukg_api_client.requests.request')
+def test_make_request_refreshes_changed_resource(mock_request, mock_client):
+    """Test a changed resource replaces the cached validator and body"""
+    first = Mock(status_code=200, headers={'ETag': 'W/"employees-1-abc"'})
+    first.json.return_value = {'data': []}
+    changed = Mock(status_code=200, headers={'ETag': 'W/"employees-2-abc"'})
+    changed.json.return_value = {'data': [{'id': 'emp_123'}]}
+    mock_request.side_effect = [first, changed]
+    
+    mock_client.list_employees()
+    result = mock_client.list_employees()
+    
+    assert result == {'data': [{'id': 'emp_123'}]}
+    assert list(mock_client.etag_cache.values()) == [('W/"employees-2-abc"', {'data': [{'id': 'emp_123'}]})]
+
+@patch('ukg_api_client.requests.request')
+def test_make_request_caches_list_valued_params(mock_request, mock_client):
+    """Test list-valued params work as cache keys, independent of dict order"""
+    first = Mock(status_code=200, headers={'ETag': 'W/"employees-1-abc"'})
+    first.json.return_value = {'data': [{'id': 'emp_123'}]}
+    not_modified = Mock(status_code=304, headers={'ETag': 'W/"employees-1-abc"'})
+    mock_request.side_effect = [first, not_modified]
+    
+    mock_client.list_employees(params={'status': ['active', 'leave'], 'limit': 10})
+    result = mock_client.list_employees(params={'limit': 10, 'status': ['active', 'leave']})
+    
+    assert result == {'data': [{'id': 'emp_123'}]}
+    assert mock_request.call_args_list[1].kwargs['headers']['If-None-Match'] == 'W/"employees-1-abc"'
+    assert mock_request.call_args_list[1].kwargs['params'] == {'limit': 10, 'status': ['active', 'leave']}
+
+@patch('ukg_api_client.requests.request')
+def test_etag_cache_evicts_least_recently_used(mock_request, mock_client):
+    """Test the ETag cache keeps at most ETAG_CACHE_SIZE entries, dropping the least recently used"""
+    mock_client.ETAG_CACHE_SIZE = 2
+    
+    def respond(method, url, headers, params, json):
+        if 'If-None-Match' in headers:
+            return Mock(status_code=304)
+        response = Mock(status_code=200, headers={'ETag': f'W/"{params["page"]}"'})
+        response.json.return_value = {'page': params['page']}
+        return response
+    mock_request.side_effect = respond
+    
+    for page in (1, 2, 1, 3):
+        mock_client.list_employees(params={'page': page})
+    
+    assert [key[1] for key in mock_client.etag_cache] == ['page=1', 'page=3']
+    assert mock_client.list_employees(params={'page': 1}) == {'page': 1}
+
 @patch('ukg_api_client.requests.post')
 def test_authentication_failure(mock_post):
     """Test authentication failure handling"""
@@ -189,35 +250,42 @@ def test_get_pay_stubs_no_employee(mock_make_request, mock_client):
     assert len(result['data']) == 2
     mock_make_request.assert_called_once_with('GET', 'payroll/pay-stubs', params={})
 
-@patch('ukg_api_client.requests.get')
-def test_get_timesheets_with_dates(mock_get, mock_client):
+@patch.object(UKGAPIClient, 'make_request')
+def test_get_timesheets_with_dates(mock_make_request, mock_client):
     """Test retrieving timesheets with date filters"""
-    mock_get.return_value.json.return_value = {'data': [{'id': 'ts_123'}]}
-    mock_get.return_value.raise_for_status.return_value = None
+    mock_make_request.return_value = {'data': [{'id': 'ts_123'}]}
     
     result = mock_client.get_timesheets(employee_id='123', start_date='2025-01-01', end_date='2025-01-31')
     
     assert len(result['data']) == 1
-    mock_get.assert_called_once_with(
-        f"{mock_client.BASE_URL}/api/v2/client/time-attendance/timesheets",
-        headers=mock_client.headers,
+    mock_make_request.assert_called_once_with(
+        'GET', 'time-attendance/timesheets',
         params={'employee_id': '123', 'start_date': '2025-01-01', 'end_date': '2025-01-31'}
     )
 
-@patch('ukg_api_client.requests.get')
-def test_get_timesheets_no_params(mock_get, mock_client):
+@patch.object(UKGAPIClient, 'make_request')
+def test_get_timesheets_no_params(mock_make_request, mock_client):
     """Test retrieving timesheets without parameters"""
-    mock_get.return_value.json.return_value = {'data': []}
-    mock_get.return_value.raise_for_status.return_value = None
+    mock_make_request.return_value = {'data': []}
     
     result = mock_client.get_timesheets()
     
     assert len(result['data']) == 0
-    mock_get.assert_called_once_with(
-        f"{mock_client.BASE_URL}/api/v2/client/time-attendance/timesheets",
-        headers=mock_client.headers,
-        params={}
-    )
+    mock_make_request.assert_called_once_with('GET', 'time-attendance/timesheets', params={})
+
+@patch('ukg_api_client.requests.request')
+def test_get_timesheets_revalidates_with_etag(mock_request, mock_client):
+    """Test timesheet listings share the conditional GET cache"""
+    first = Mock(status_code=200, headers={'ETag': 'W/"timesheets-1-abc"'})
+    first.json.return_value = {'data': [{'id': 'ts_123'}]}
+    not_modified = Mock(status_code=304, headers={'ETag': 'W/"timesheets-1-abc"'})
+    mock_request.side_effect = [first, not_modified]
+    
+    assert mock_client.get_timesheets(employee_id='123') == {'data': [{'id': 'ts_123'}]}
+    assert mock_client.get_timesheets(employee_id='123') == {'data': [{'id': 'ts_123'}]}
+    
+    assert mock_request.call_args_list[1].kwargs['headers']['If-None-Match'] == 'W/"timesheets-1-abc"'
+    not_modified.json.assert_not_called()
 
 @patch.object(UKGAPIClient, 'make_request')
 def test_get_vacation_requests_no_employee(mock_make_request, mock_client):
@@ -284,6 +352,34 @@ def test_list_employees(mock_make_request, mock_client):
     assert len(result['data']) == 1
     mock_make_request.assert_called_once_with('GET', 'employees', params=None)
 
+@patch.object(UKGAPIClient, 'make_request')
+def test_list_employees_with_fields(mock_make_request, mock_client):
+    """Test listing employees with a sparse fieldset"""
+    mock_make_request.return_value = {'data': [{'id': 'emp_123', 'employee_id': 'EMP001', 'department': 'IT'}]}
+    
+    result = mock_client.list_employees(params={'status': 'active'}, fields=['id', 'employee_id', 'department'])
+    
+    assert set(result['data'][0]) == {'id', 'employee_id', 'department'}
+    mock_make_request.assert_called_once_with('GET', 'employees', params={'status': 'active', 'fields': 'id,employee_id,department'})
+
+@patch.object(UKGAPIClient, 'make_request')
+def test_get_pay_stubs_with_fields(mock_make_request, mock_client):
+    """Test retrieving pay stubs with a comma-separated fieldset"""
+    mock_make_request.return_value = {'data': [{'id': 'ps_123', 'net_pay': 1500}]}
+    
+    mock_client.get_pay_stubs('123', fields='id,net_pay')
+    
+    mock_make_request.assert_called_once_with('GET', 'payroll/pay-stubs', params={'employee_id': '123', 'fields': 'id,net_pay'})
+
+@patch.object(UKGAPIClient, 'make_request')
+def test_list_companies_with_fields(mock_make_request, mock_client):
+    """Test listing companies with a sparse fieldset"""
+    mock_make_request.return_value = {'data': [{'id': '1'}]}
+    
+    mock_client.list_companies(fields=['id'])
+    
+    mock_make_request.assert_called_once_with('GET', 'companies', params={'fields': 'id'})
+
 @patch.object(UKGAPIClient, 'make_request')
 def test_create_employee(mock_make_request, mock_client):
     """Test creating an employee"""
@@ -353,6 +449,55 @@ def test_get_organization_hierarchy_with_company(mock_make_request, mock_client)
     assert len(result['structure']) == 1
     mock_make_request.assert_called_once_with('GET', 'organization/hierarchy', params={'company_id': 'company_123'})
 
+@patch.object(UKGAPIClient, 'make_request')
+def test_iter_events_pages_until_caught_up(mock_make_request, mock_client):
+    """Test iterating the change feed across pages"""
+    mock_make_request.side_effect = [
+        {'data': [{'seq': 1}, {'seq': 2}], 'pagination': {'cursor': 2, 'has_more': True}, 'latest_seq': 3},
+        {'data': [{'seq': 3}], 'pagination': {'cursor': 3, 'has_more': False}, 'latest_seq': 3}
+    ]
+
+    events = list(mock_client.iter_events(limit=2, collections=['employees', 'timesheets']))
+
+    assert [event['seq'] for event in events] == [1, 2, 3]
+    assert mock_make_request.call_args_list[0].kwargs['params'] == {'since': 0, 'limit': 2, 'collection': 'employees,timesheets'}
+    assert mock_make_request.call_args_list[1].kwargs['params'] == {'since': 2, 'limit': 2, 'collection': 'employees,timesheets'}
+
+@patch.object(UKGAPIClient, 'make_request')
+def test_iter_events_follow_long_polls(mock_make_request, mock_client):
+    """Test following the change feed keeps polling with the wait parameter"""
+    mock_make_request.side_effect = [
+        {'data': [], 'pagination': {'cursor': 5, 'has_more': False}, 'latest_seq': 5},
+        {'data': [{'seq': 6}], 'pagination': {'cursor': 6, 'has_more': False}, 'latest_seq': 6}
+    ]
+
+    events = mock_client.iter_events(since=5, wait=10, follow=True)
+
+    assert next(events)['seq'] == 6
+    assert mock_make_request.call_args_list[1].kwargs['params'] == {'since': 5, 'limit': 100, 'wait': 10}
+
+@patch.object(UKGAPIClient, 'make_request')
+def test_iter_events_follow_defaults_to_long_poll(mock_make_request, mock_client):
+    """Test following without a wait still long-polls instead of spinning on empty pages"""
+    mock_make_request.side_effect = [
+        {'data': [], 'pagination': {'cursor': 5, 'has_more': False}, 'latest_seq': 5},
+        {'data': [{'seq': 6}], 'pagination': {'cursor': 6, 'has_more': False}, 'latest_seq': 6}
+    ]
+
+    events = mock_client.iter_events(since=5, follow=True)
+
+    assert next(events)['seq'] == 6
+    for call in mock_make_request.call_args_list:
+        assert call.kwargs['params']['wait'] == UKGAPIClient.FOLLOW_WAIT
+
+@patch.object(UKGAPIClient, 'make_request')
+def test_iter_events_without_follow_does_not_wait(mock_make_request, mock_client):
+    """Test a one-off catch-up read returns immediately"""
+    mock_make_request.return_value = {'data': [], 'pagination': {'cursor': 0, 'has_more': False}, 'latest_seq': 0}
+
+    assert list(mock_client.iter_events()) == []
+    assert 'wait' not in mock_make_request.call_args.kwargs['params']
+
 def test_main_execution():
     """Test main execution block"""
     with patch('ukg_api_client.requests.post') as mock_post:
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the Union Entitlements Service
+"""
+
+import json
+import shutil
+import sqlite3
+import threading
+
+import pytest
+import union_db_migrations
+import union_service_metrics
+import union_entitlements_service as service
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the service at a scratch copy of the union entitlements database"""
+    path = tmp_path / 'union_entitlements.db'
+    shutil.copy(service.DB_PATH, path)
+    service.close_connections()
+    monkeypatch.setattr(service, 'DB_PATH', str(path))
+    yield str(path)
+    service.close_connections()
+
+@pytest.fixture
+def client(db_path):
+    return service.app.test_client()
+
+def test_get_unions(client):
+    """Test listing unions"""
+    response = client.get('/unions')
+
+    assert response.status_code == 200
+    assert {union['union_id'] for union in response.json} >= {'UNION001', 'UNION002'}
+
+def test_get_employee_entitlements(client):
+    """Test entitlements joined through union membership"""
+    response = client.get('/employees/EMP001/entitlements')
+
+    assert response.status_code == 200
+    assert response.json
+    assert all(ent['union_id'] == 'UNION001' for ent in response.json)
+
+def test_read_connection_is_persistent_and_read_only(db_path):
+    """Test each thread reuses one read-only connection"""
+    conn = service.get_db_connection()
+
+    assert service.get_db_connection() is conn
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM unions")
+
+def test_read_connections_are_per_thread(db_path):
+    """Test another thread gets its own connection"""
+    conn = service.get_db_connection()
+    other = []
+    thread = threading.Thread(target=lambda: other.append(service.get_db_connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not conn
+
+def test_migrating_enables_wal(db_path, monkeypatch):
+    """Test migrating a database switches it to WAL, and the readers see it"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode = DELETE')
+    next_version = union_db_migrations.LATEST_VERSION + 1
+    monkeypatch.setattr(union_db_migrations, 'MIGRATIONS', [(next_version, 'Scratch table', ['CREATE TABLE scratch (x)'])])
+
+    assert union_db_migrations.migrate(conn, target=next_version) == [next_version]
+
+    assert sqlite3.connect(db_path).execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert service.get_db_connection().execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+def test_up_to_date_database_keeps_journal_mode(db_path):
+    """Test only migrating changes the journal mode; connecting to a current database does not"""
+    conn = sqlite3.connect(db_path)
+    union_db_migrations.migrate(conn)
+    conn.execute('PRAGMA journal_mode = DELETE')
+
+    assert union_db_migrations.migrate(conn) == []
+    assert sqlite3.connect(db_path).execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+
+def test_shipped_database_is_migrated(db_path):
+    """Test the shipped database is at the latest schema version, so migrating it is a no-op"""
+    conn = sqlite3.connect(db_path)
+
+    assert union_db_migrations.schema_version(conn) == union_db_migrations.LATEST_VERSION
+    assert union_db_migrations.migrate(conn) == []
+
+def test_reads_leave_the_database_alone(client, db_path):
+    """Test serving reads never changes the database file"""
+    with open(db_path, 'rb') as f:
+        before = f.read()
+
+    for path in ('/unions', '/employees/EMP001/leave-context', '/unions/UNION001/entitlement-totals', '/health'):
+        assert client.get(path).status_code == 200
+    service.close_connections()
+
+    with open(db_path, 'rb') as f:
+        assert f.read() == before
+
+def test_health_reports_schema_behind(client, db_path):
+    """Test /health flags a database with pending migrations instead of migrating it"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA user_version = 1')
+    conn.commit()
+
+    schema = client.get('/health').json['schema']
+
+    assert schema == {'version': 1, 'latest': union_db_migrations.LATEST_VERSION, 'current': False}
+    assert union_db_migrations.schema_version(conn) == 1
+
+@pytest.mark.parametrize('query', [
+    service.UNION_MEMBERS_QUERY,
+    service.UNION_COMPLIANCE_QUERY,
+    service.UNION_ENTITLEMENTS_QUERY,
+    service.EMPLOYEE_MEMBERSHIPS_QUERY,
+    service.EMPLOYEE_COMPLIANCE_QUERY,
+    service.EMPLOYEE_ENTITLEMENTS_QUERY,
+    service.EMPLOYEE_ENTITLEMENTS_BATCH_QUERY.format(placeholders='?, ?'),
+    service.MEMBER_ENTITLEMENTS_QUERY,
+    service.EMPLOYEE_VIOLATIONS_QUERY,
+    service.MEMBER_VIOLATIONS_QUERY,
+    service.MEMBER_VIOLATIONS_QUERY + service.violation_filters({'start_date': '2024-01-01', 'resolved': 'true'})[0],
+    service.UNION_ENTITLEMENT_TYPE_TOTALS_QUERY,
+])
+def test_lookup_queries_use_indexes(db_path, query):
+    """Test lookups search indexes instead of scanning whole tables"""
+    plan = [row[3] for row in service.get_db_connection().execute(f'EXPLAIN QUERY PLAN {query}', ('x',) * query.count('?'))]
+
+    assert not [step for step in plan if step.startswith('SCAN')], plan
+
+def test_violation_date_range_uses_member_date_index(db_path):
+    """Test date filters seek the (member_id, violation_date) index"""
+    filters, params = service.violation_filters({'start_date': '2024-01-01', 'end_date': '2024-01-31'})
+    plan = [row[3] for row in service.get_db_connection().execute(
+        f'EXPLAIN QUERY PLAN {service.EMPLOYEE_VIOLATIONS_QUERY}{filters}', ['EMP001', *params])]
+
+    assert any('idx_compliance_violations_member_date (member_id=? AND violation_date>? AND violation_date<?)' in step
+               for step in plan), plan
+
+def test_violation_filters(client, db_path):
+    """Test start_date, end_date and resolved narrow an employee's violations"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO compliance_violations (violation_id, member_id, parameter_id, violation_date, "
+                     "violation_type, description, resolved) VALUES (?, 'MEM001', 'COMP002', ?, 'notice_violation', '', ?)",
+                     [('VIOTEST1', '2025-03-01', 0), ('VIOTEST2', '2025-06-30', 1), ('VIOTEST3', '2025-07-01', 0)])
+    conn.commit()
+    conn.close()
+
+    def violation_ids(query):
+        return {violation['violation_id'] for violation in client.get(f'/employees/EMP001/violations?{query}').json}
+
+    assert {'VIOTEST1', 'VIOTEST2', 'VIOTEST3'} <= violation_ids('')
+    assert violation_ids('start_date=2025-01-01&end_date=2025-06-30') == {'VIOTEST1', 'VIOTEST2'}
+    assert violation_ids('start_date=2025-01-01&resolved=false') == {'VIOTEST1', 'VIOTEST3'}
+    context = client.get('/employees/EMP001/leave-context?start_date=2025-06-30&end_date=2025-06-30').json
+    assert [violation['violation_id'] for violation in context['violations']] == ['VIOTEST2']
+
+@pytest.mark.parametrize('query', ['start_date=2025-13-01', 'end_date=soon', 'resolved=maybe'])
+def test_violation_filters_reject_bad_values(client, query):
+    """Test malformed filter values are rejected"""
+    assert client.get(f'/members/MEM001/violations?{query}').status_code == 400
+
+def test_batch_employee_entitlements(client):
+    """Test batch lookup groups entitlements by employee"""
+    response = client.post('/employees/entitlements', json={'employee_ids': ['EMP001', 'EMP002', 'EMP001', 'NOBODY']})
+
+    assert response.status_code == 200
+    assert list(response.json) == ['EMP001', 'EMP002', 'NOBODY']
+    assert response.json['EMP001'] == client.get('/employees/EMP001/entitlements').json
+    assert {ent['union_id'] for ent in response.json['EMP002']} == {'UNION002'}
+    assert response.json['NOBODY'] == []
+
+def test_batch_employee_entitlements_across_chunks(client, monkeypatch):
+    """Test batches larger than one IN (...) chunk"""
+    monkeypatch.setattr(service, 'BATCH_CHUNK_SIZE', 2)
+
+    response = client.post('/employees/entitlements', json={'employee_ids': ['EMP001', 'EMP002', 'EMP003']})
+
+    assert all(response.json[employee_id] for employee_id in ('EMP001', 'EMP002', 'EMP003'))
+
+@pytest.mark.parametrize('body', [{'employee_ids': 'EMP001'}, ['EMP001'], 'EMP001', None])
+def test_batch_employee_entitlements_requires_id_list(client, body):
+    """Test batch lookup rejects a malformed body, including a JSON array or string"""
+    response = client.post('/employees/entitlements', json=body)
+
+    assert response.status_code == 400
+    assert response.json == {'error': 'employee_ids must be a list of strings'}
+
+def test_employee_leave_context(client):
+    """Test the leave context matches the individual lookups"""
+    response = client.get('/employees/EMP001/leave-context')
+
+    assert response.status_code == 200
+    context = response.json
+    assert [membership['union_id'] for membership in context['memberships']] == ['UNION001']
+    assert context['entitlements'] == client.get('/employees/EMP001/entitlements').json
+    assert context['violations'] == client.get('/employees/EMP001/violations').json
+    assert context['compliance_parameters'] == client.get('/unions/UNION001/compliance').json
+
+def test_employee_leave_context_for_non_member(client):
+    """Test the leave context of an employee without a union membership"""
+    response = client.get('/employees/NOBODY/leave-context')
+
+    assert response.status_code == 404
+    assert not service.get_db_connection().in_transaction
+
+def test_read_cache_hits_until_database_changes(client, db_path):
+    """Test cached unions are served until another connection commits a change"""
+    first = client.get('/unions').json
+    assert client.get('/unions').json == first
+    assert client.get('/health').json['cache']['hits'] == 1
+
+    other = sqlite3.connect(db_path)
+    other.execute("INSERT INTO unions (union_id, union_name) VALUES ('UNION999', 'Test Union')")
+    other.commit()
+    other.close()
+
+    assert 'UNION999' in {union['union_id'] for union in client.get('/unions').json}
+
+def test_union_entitlement_definitions(client):
+    """Test entitlement definitions for a union"""
+    response = client.get('/unions/UNION001/entitlements')
+
+    assert response.status_code == 200
+    assert response.json and all(ent['union_id'] == 'UNION001' for ent in response.json)
+    assert 'current_balance' not in response.json[0]
+
+@pytest.fixture
+def large_union(db_path):
+    """Add 1,200 members to UNION002"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO union_members (member_id, employee_id, union_id) VALUES (?, ?, 'UNION002')",
+                     [(f'BULK{n:05d}', f'BULKEMP{n:05d}') for n in range(1200)])
+    conn.commit()
+    conn.close()
+    return 'UNION002'
+
+def test_union_members_keyset_pagination(client, large_union):
+    """Test paging through members with after= and limit="""
+    seen = []
+    url = f'/unions/{large_union}/members?limit=500'
+    while url:
+        response = client.get(url)
+        seen.extend(member['member_id'] for member in response.json)
+        next_after = response.headers.get('X-Next-After')
+        url = f'/unions/{large_union}/members?limit=500&after={next_after}' if next_after else None
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 1201
+    assert seen == [member['member_id'] for member in client.get(f'/unions/{large_union}/members').json]
+
+def test_union_members_ndjson_stream(client, large_union):
+    """Test streaming members as newline-delimited JSON"""
+    response = client.get(f'/unions/{large_union}/members', headers={'Accept': 'application/x-ndjson'})
+
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 1201
+    assert json.loads(lines[0])['union_id'] == large_union
+
+def test_abandoned_ndjson_stream_releases_its_snapshot(client, large_union, db_path):
+    """Test closing a stream part-way finishes its statement, so a checkpoint isn't blocked by it"""
+    writer = sqlite3.connect(db_path, timeout=0)
+    add_member = "INSERT INTO union_members (member_id, employee_id, union_id) VALUES (?, ?, 'UNION001')"
+    writer.execute(add_member, ('LATE00001', 'LATEEMP00001'))
+    writer.commit()
+    response = client.get(f'/unions/{large_union}/members?format=ndjson', buffered=False)
+    first_batch = next(iter(response.response))
+    writer.execute(add_member, ('LATE00002', 'LATEEMP00002'))
+    writer.commit()
+
+    assert writer.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()[0] == 1
+    response.close()
+    assert writer.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()[0] == 0
+    assert first_batch.count(b'\n') == service.STREAM_BATCH_SIZE
+
+@pytest.mark.parametrize('limit', ['0', '-1', 'ten', '10001', '99999999999999999999999'])
+def test_union_members_rejects_bad_limit(client, limit):
+    """Test non-positive, non-numeric and oversized limits are rejected instead of overflowing SQLite"""
+    assert client.get(f'/unions/UNION001/members?limit={limit}').status_code == 400
+
+def test_union_members_accepts_max_limit(client):
+    """Test the largest allowed page is served"""
+    response = client.get(f'/unions/UNION001/members?limit={service.MAX_MEMBERS_PAGE}')
+
+    assert response.status_code == 200
+    assert response.json == client.get('/unions/UNION001/members').json
+
+@pytest.mark.parametrize('path', [
+    '/unions',
+    '/unions/UNION002/members',
+    '/employees/EMP001/entitlements',
+    '/employees/EMP001/leave-context',
+    '/members/MEM001/violations?resolved=true',
+])
+def test_sqlite_json_matches_python_serialization(client, large_union, monkeypatch, path):
+    """Test json_group_array bodies match the ones built from row tuples"""
+    expected = client.get(path).json
+    monkeypatch.setattr(service, 'SQLITE_JSON', True)
+    service.read_cache.clear()
+
+    assert client.get(path).json == expected
+
+def test_rows_serialize_from_plain_tuples(db_path):
+    """Test fast-path rows come from tuple cursors with precomputed column names"""
+    conn = service.get_db_connection()
+    rows = service.query_rows(conn, service.EMPLOYEE_MEMBERSHIPS_QUERY, ('EMP001',))
+
+    assert rows == [dict(row) for row in conn.execute(service.EMPLOYEE_MEMBERSHIPS_QUERY, ('EMP001',))]
+    assert service.prepare(conn, service.EMPLOYEE_MEMBERSHIPS_QUERY, ('EMP001',))[0] == tuple(rows[0])
+
+def entitlement_totals_from_scratch(conn, union_id):
+    """Recompute a union's totals straight from member_entitlements"""
+    return {row[0]: list(row[1:]) for row in conn.execute(
+        "SELECT e.entitlement_type, COUNT(*), ROUND(TOTAL(me.current_balance), 4), ROUND(TOTAL(me.accrued_ytd), 4), "
+        "ROUND(TOTAL(me.used_ytd), 4) FROM member_entitlements me JOIN entitlements e USING (entitlement_id) "
+        "WHERE e.union_id = ? GROUP BY e.entitlement_type", (union_id,))}
+
+def served_entitlement_totals(client, union_id):
+    return {totals['entitlement_type']: [totals['member_entitlement_count'], totals['current_balance'],
+                                         totals['accrued_ytd'], totals['used_ytd']]
+            for totals in client.get(f'/unions/{union_id}/entitlement-totals').json['entitlement_types']}
+
+def test_union_entitlement_totals(client, db_path):
+    """Test the materialized totals match a full recompute"""
+    response = client.get('/unions/UNION001/entitlement-totals')
+
+    assert response.status_code == 200
+    assert response.json['union_id'] == 'UNION001'
+    assert {totals['unit'] for totals in response.json['entitlement_types']} == {'days', 'dollars'}
+    assert served_entitlement_totals(client, 'UNION001') == entitlement_totals_from_scratch(sqlite3.connect(db_path), 'UNION001')
+
+def test_union_entitlement_totals_follow_writes(client, db_path):
+    """Test triggers keep the totals current through inserts, updates, deletes and regrouped entitlements"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO member_entitlements (member_id, entitlement_id, current_balance, accrued_ytd, used_ytd) "
+                 "VALUES ('MEM001', 'ENT001', 4.5, 6, 1.5)")
+    conn.execute("UPDATE member_entitlements SET used_ytd = used_ytd + 2, current_balance = current_balance - 2 "
+                 "WHERE member_id = 'MEM001' AND entitlement_id = 'ENT002'")
+    conn.execute("DELETE FROM member_entitlements WHERE member_id = 'MEM001' AND entitlement_id = 'ENT003'")
+    conn.execute("UPDATE entitlements SET entitlement_type = 'vacation', union_id = 'UNION001' WHERE entitlement_id = 'ENT005'")
+    conn.commit()
+
+    for union_id in ('UNION001', 'UNION002'):
+        assert served_entitlement_totals(client, union_id) == entitlement_totals_from_scratch(conn, union_id)
+
+def test_union_entitlement_totals_for_unknown_union(client):
+    """Test totals for a union that does not exist"""
+    assert client.get('/unions/NOUNION/entitlement-totals').status_code == 404
+
+def test_metrics(client):
+    """Test /metrics reports route latency, statement timings and rows, connections and cache hit rate"""
+    service.metrics.reset()
+    client.get('/unions')
+    client.get('/unions')
+    client.get('/employees/EMP001/entitlements')
+
+    text = client.get('/metrics').get_data(as_text=True)
+    statement = union_service_metrics.normalize_statement(service.EMPLOYEE_ENTITLEMENTS_QUERY)
+    rows = len(client.get('/employees/EMP001/entitlements').json)
+
+    assert 'union_service_request_duration_seconds_count{method="GET",route="/unions"} 2' in text
+    assert 'union_service_requests_total{method="GET",route="/employees/<employee_id>/entitlements",status="200"} 1' in text
+    assert f'union_service_query_duration_seconds_count{{statement="{statement}"}} 1' in text
+    assert f'union_service_query_rows_sum{{statement="{statement}"}} {rows}\n' in text
+    assert 'union_service_connections{role="read",state="assigned"}' in text
+    assert 'role="writer"' not in text
+    assert f"union_service_cache_hits_total {client.get('/health').json['cache']['hits']}" in text
+    assert 'route="/metrics"' not in text
+
+def test_metrics_unmatched_paths_share_one_series(client):
+    """Test 404s on distinct unknown paths are counted under one route label"""
+    service.metrics.reset()
+    for n in range(5):
+        assert client.get(f'/no-such-route-{n}').status_code == 404
+
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert 'no-such-route' not in text
+    assert 'union_service_requests_total{method="GET",route="<unmatched>",status="404"} 5' in text
+    assert list(service.metrics.routes) == [('GET', union_service_metrics.UNMATCHED_ROUTE)]
+
+def test_metrics_histogram_buckets_are_cumulative():
+    """Test histogram buckets count every observation at or below their bound"""
+    histogram = union_service_metrics.Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    assert list(histogram.buckets()) == [('1', 2), ('10', 3), ('+Inf', 4)]
+
+def test_metrics_fold_batch_statements():
+    """Test IN lists of any length share one statement label"""
+    two = service.EMPLOYEE_ENTITLEMENTS_BATCH_QUERY.format(placeholders='?,?')
+    three = service.EMPLOYEE_ENTITLEMENTS_BATCH_QUERY.format(placeholders='?,?,?')
+
+    assert union_service_metrics.normalize_statement(two) == union_service_metrics.normalize_statement(three)
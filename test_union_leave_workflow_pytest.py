@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Pytest tests for the union leave workflow's union entitlements service calls
+"""
+
+import shutil
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+import requests
+import union_entitlements_service as service
+import union_leave_workflow as workflow
+
+@pytest.fixture
+def service_calls(tmp_path, monkeypatch):
+    """Answer the workflow's GETs and POSTs from the service app, backed by a scratch copy of the database"""
+    db_path = tmp_path / 'union_entitlements.db'
+    shutil.copy(service.DB_PATH, db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO compliance_violations (violation_id, member_id, parameter_id, violation_date, "
+                     "violation_type, description, resolved) VALUES (?, 'MEM001', 'COMP002', ?, 'notice_violation', '', ?)",
+                     [('VIOWF1', '2025-03-01', 0), ('VIOWF2', '2025-06-30', 1), ('VIOWF3', '2025-07-01', 0)])
+    conn.commit()
+    conn.close()
+    service.close_connections()
+    monkeypatch.setattr(service, 'DB_PATH', str(db_path))
+    client = service.app.test_client()
+    calls = []
+
+    def wrap(response):
+        wrapped = Mock(status_code=response.status_code)
+        wrapped.json.return_value = response.json
+        wrapped.raise_for_status.side_effect = None if response.status_code < 400 else requests.HTTPError(response.status_code)
+        return wrapped
+
+    def get(url, params=None):
+        calls.append((url, params))
+        return wrap(client.get(url[len(workflow.UNION_ENTITLEMENT_SERVICE_BASE_URL):], query_string=params))
+
+    def post(url, json=None):
+        calls.append((url, json))
+        return wrap(client.post(url[len(workflow.UNION_ENTITLEMENT_SERVICE_BASE_URL):], json=json))
+
+    monkeypatch.setattr(workflow.requests, 'get', get)
+    monkeypatch.setattr(workflow.requests, 'post', post)
+    yield calls
+    service.close_connections()
+
+def violation_ids(context):
+    return {violation['violation_id'] for violation in context['violations']}
+
+@pytest.mark.parametrize('args, params', [
+    ((), {}),
+    (('2025-01-01',), {'start_date': '2025-01-01'}),
+    ((None, '2025-06-30'), {'end_date': '2025-06-30'}),
+    (('2025-01-01', '2025-06-30', True), {'start_date': '2025-01-01', 'end_date': '2025-06-30', 'resolved': 'true'}),
+    ((None, None, False), {'resolved': 'false'}),
+])
+def test_violation_filters(args, params):
+    """Test only the filters that are set become query parameters, with resolved as true/false"""
+    assert workflow.violation_filters(*args) == params
+
+def test_leave_context_without_filters(service_calls):
+    """Test the leave context returns every section and all of the employee's violations"""
+    context = workflow.get_leave_context('EMP001')
+
+    assert service_calls == [(f'{workflow.UNION_ENTITLEMENT_SERVICE_BASE_URL}/employees/EMP001/leave-context', {})]
+    assert {'memberships', 'entitlements', 'violations', 'compliance_parameters'} <= set(context)
+    assert {'VIO001', 'VIOWF1', 'VIOWF2', 'VIOWF3'} <= violation_ids(context)
+    assert context['entitlements']
+
+def test_leave_context_filters_violations(service_calls):
+    """Test a lookback window and the resolved filter narrow only the violations"""
+    unfiltered = workflow.get_leave_context('EMP001')
+
+    since = workflow.get_leave_context('EMP001', start_date='2025-06-30')
+    active = workflow.get_leave_context('EMP001', start_date='2025-01-01', resolved=False)
+
+    assert violation_ids(since) == {'VIOWF2', 'VIOWF3'}
+    assert violation_ids(active) == {'VIOWF1', 'VIOWF3'}
+    assert since['entitlements'] == unfiltered['entitlements']
+    assert service_calls[-1][1] == {'start_date': '2025-01-01', 'resolved': 'false'}
+
+def test_leave_context_rejects_bad_dates(service_calls):
+    """Test a malformed date surfaces as an error instead of an unfiltered context"""
+    with pytest.raises(requests.HTTPError):
+        workflow.get_leave_context('EMP001', start_date='next week')
+
+def test_entitlements_batch_merges_chunks(service_calls):
+    """Test IDs are sent in chunks of batch_size and the per-chunk results merged into one mapping"""
+    employee_ids = ['EMP001', 'EMP002', 'EMP003', 'NOBODY', 'EMP001']
+
+    entitlements = workflow.get_union_entitlements_batch(employee_ids, batch_size=2)
+
+    assert [body['employee_ids'] for _, body in service_calls] == [['EMP001', 'EMP002'], ['EMP003', 'NOBODY'], ['EMP001']]
+    assert set(entitlements) == {'EMP001', 'EMP002', 'EMP003', 'NOBODY'}
+    assert entitlements['EMP001'] == workflow.get_union_entitlements('EMP001')
+    assert entitlements['EMP003'] and entitlements['NOBODY'] == []
+
+def test_entitlements_batch_defaults_to_service_limit(service_calls):
+    """Test the default chunk is the service's own per-request limit, so small batches take one request"""
+    assert workflow.MAX_BATCH_EMPLOYEES == service.MAX_BATCH_EMPLOYEES
+
+    entitlements = workflow.get_union_entitlements_batch(['EMP001', 'EMP002'])
+
+    assert len(service_calls) == 1 and set(entitlements) == {'EMP001', 'EMP002'}
+    assert workflow.get_union_entitlements_batch([]) == {}
@@ -6,6 +6,7 @@ from datetime import datetime
 from urllib.parse import urlencode
 import logging
 import os
+from collections import OrderedDict
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +18,8 @@ class UKGAPIClient:
     APP_SECRET = os.getenv('UKG_APP_SECRET')  # Your actual application secret
     CLIENT_ID = os.getenv('UKG_CLIENT_ID')  # Your actual client ID
     COMPANY_SHORT_NAME = os.getenv('UKG_COMPANY_SHORT_NAME')  # Your company identifier
+    FOLLOW_WAIT = 30  # Long-poll seconds per request when following the change feed
+    ETAG_CACHE_SIZE = 256  # Most recently used GET responses kept for revalidation
 
     def __init__(self):
         token = self.get_access_token()
@@ -25,6 +28,8 @@ class UKGAPIClient:
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
         }
+        # Validators for conditional GETs, least recently used first: (url, query) -> (etag, body)
+        self.etag_cache = OrderedDict()
 
     def get_access_token(self):
         auth_url = f"{self.BASE_URL}/api/v2/client/tokens"
@@ -45,19 +50,51 @@ class UKGAPIClient:
         response.raise_for_status()
         return response.json()['access_token']
     
+    @staticmethod
+    def fields_param(fields):
+        """Format a sparse fieldset (list or comma-separated string) for the `fields` query parameter"""
+        if isinstance(fields, str):
+            return fields
+        return ','.join(fields)
+
     def make_request(self, method, endpoint, params = None, data = None):
         url = f"{self.BASE_URL}/api/v2/client/{endpoint}"
-        response = requests.request(method, url, headers=self.headers, params=params, json=data)
+        if method != "GET":
+            response = requests.request(method, url, headers=self.headers, params=params, json=data)
+            response.raise_for_status()
+            return response.json()
+        
+        # Revalidate GETs with If-None-Match so unchanged resources cost only a 304. The key uses
+        # the encoded query string, so list-valued params (sent as repeated keys) are hashable
+        cache_key = (url, urlencode(sorted((params or {}).items()), doseq=True))
+        cached = self.etag_cache.get(cache_key)
+        if cached:
+            self.etag_cache.move_to_end(cache_key)
+        headers = dict(self.headers, **{'If-None-Match': cached[0]}) if cached else self.headers
+        response = requests.request(method, url, headers=headers, params=params, json=data)
+        if response.status_code == 304 and cached:
+            return cached[1]
         response.raise_for_status()
-        return response.json()
+        body = response.json()
+        etag = response.headers.get('ETag')
+        if etag:
+            self.etag_cache[cache_key] = (etag, body)
+            self.etag_cache.move_to_end(cache_key)
+            while len(self.etag_cache) > self.ETAG_CACHE_SIZE:
+                self.etag_cache.popitem(last=False)
+        else:
+            self.etag_cache.pop(cache_key, None)
+        return body
 
-    def list_companies(self):        
+    def list_companies(self, fields=None):
+        if fields:
+            return self.make_request("GET", "companies", params={'fields': self.fields_param(fields)})
         return self.make_request("GET", "companies")
     
     def create_timesheet(self, data):
         return self.make_request("POST", "time-attendance/timesheets", data=data)
     
-    def get_timesheets(self, employee_id: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_timesheets(self, employee_id: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, fields: Optional[Union[str, List[str]]] = None) -> List[Dict[str, Any]]:
         params = {}
         if employee_id:
             params['employee_id'] = employee_id
@@ -65,10 +102,10 @@ class UKGAPIClient:
             params['start_date'] = start_date
         if end_date:
             params['end_date'] = end_date
+        if fields:
+            params['fields'] = self.fields_param(fields)
         
-        response = requests.get(f"{self.BASE_URL}/api/v2/client/time-attendance/timesheets", headers=self.headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        return self.make_request("GET", "time-attendance/timesheets", params=params)
     
     def create_vacation_request(self, data):
         return self.make_request("POST", "time-off/requests", data=data)
@@ -85,13 +122,17 @@ class UKGAPIClient:
         }
         return self.make_request("PUT", f"time-off/requests/{request_id}", data=data)
     
-    def get_vacation_requests(self, employee_id):
+    def get_vacation_requests(self, employee_id, fields=None):
         params = {}
         if employee_id:
             params['employee_id'] = employee_id
+        if fields:
+            params['fields'] = self.fields_param(fields)
         return self.make_request("GET", "time-off/requests", params=params)
     
-    def get_payroll_runs(self):
+    def get_payroll_runs(self, fields=None):
+        if fields:
+            return self.make_request("GET", "payroll/runs", params={'fields': self.fields_param(fields)})
         return self.make_request("GET", "payroll/runs")
     
     def create_payroll_runs(self, payroll_run_data):
@@ -100,44 +141,58 @@ class UKGAPIClient:
     def create_pay_stubs(self, pay_stub_data):
         return self.make_request("POST", "payroll/pay-stubs", data=pay_stub_data)
     
-    def get_pay_stubs(self, employee_id):
+    def get_pay_stubs(self, employee_id, fields=None):
         params = {}
         if employee_id:
             params['employee_id'] = employee_id
+        if fields:
+            params['fields'] = self.fields_param(fields)
         return self.make_request("GET", "payroll/pay-stubs", params=params)
     
     def create_deduction(self, deduction_data):
         return self.make_request("POST", "payroll/deductions", data=deduction_data)
 
-    def get_deductions(self, employee_id):
+    def get_deductions(self, employee_id, fields=None):
         params = {}
         if employee_id:
             params['employee_id'] = employee_id
+        if fields:
+            params['fields'] = self.fields_param(fields)
         return self.make_request("GET", "payroll/deductions", params=params)
     
     def create_tax(self, tax_data):
         return self.make_request("POST", "payroll/taxes", data=tax_data)
 
-    def get_taxes(self, employee_id):
+    def get_taxes(self, employee_id, fields=None):
         params = {}
         if employee_id:
             params['employee_id'] = employee_id
+        if fields:
+            params['fields'] = self.fields_param(fields)
         return self.make_request("GET", "payroll/taxes", params=params)
 
     # EMPLOYEE & ORGANIZATION
-    def list_employees(self, params = None):
+    def list_employees(self, params = None, fields = None):
+        if fields:
+            params = dict(params or {}, fields=self.fields_param(fields))
         return self.make_request("GET", "employees", params=params)
     
     def create_employee(self, data):
         return self.make_request("POST", "employees", data=data)
     
-    def get_employee_by_uuid(self, employee_uuid):
+    def get_employee_by_uuid(self, employee_uuid, fields=None):
+        if fields:
+            return self.make_request("GET", f"employees/{employee_uuid}", params={'fields': self.fields_param(fields)})
         return self.make_request("GET", f"employees/{employee_uuid}")
     
-    def get_departments(self):
+    def get_departments(self, fields=None):
+        if fields:
+            return self.make_request("GET", "configuration/departments", params={'fields': self.fields_param(fields)})
         return self.make_request("GET", "configuration/departments")
     
-    def get_locations(self):
+    def get_locations(self, fields=None):
+        if fields:
+            return self.make_request("GET", "configuration/locations", params={'fields': self.fields_param(fields)})
         return self.make_request("GET", "configuration/locations")
     
     def get_organization_hierarchy(self, company_id=None):
@@ -176,6 +231,27 @@ class UKGAPIClient:
             params['employee_id'] = employee_id
         return self.make_request("GET", "time-off/pto-plans", params=params)
 
+    # CHANGE FEED
+    def iter_events(self, since=0, limit=100, collections=None, wait=0, follow=False):
+        """
+        Yield change events with sequence numbers after `since`, oldest first.
+        With follow=True, keep long-polling (`wait` seconds per request, FOLLOW_WAIT
+        if not given) for new events, so an idle feed doesn't spin on empty pages.
+        """
+        params = {'since': since, 'limit': limit}
+        if collections:
+            params['collection'] = self.fields_param(collections)
+        if follow and (not wait or wait <= 0):
+            wait = self.FOLLOW_WAIT
+        if wait:
+            params['wait'] = wait
+        while True:
+            page = self.make_request("GET", "events", params=dict(params))
+            yield from page['data']
+            params['since'] = page['pagination']['cursor']
+            if not page['pagination']['has_more'] and not follow:
+                return
+
 if __name__ == '__main__':
     client = UKGAPIClient()
     companies = client.list_companies()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the union entitlements database
+
+Each migration is applied once, in order, inside its own transaction. The
+database's schema version is recorded in `PRAGMA user_version`, so running
+the migrations again is a no-op. The union entitlements service only reads
+its database and never migrates it (it warns at startup, and /health reports,
+when the schema is behind); run this script to migrate or inspect one.
+"""
+
+import argparse
+import os
+import sqlite3
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), 'external_data', 'union_entitlements.db')
+
+# Member balances summed per union and entitlement type, kept up to date by triggers
+BALANCE_TOTALS_TABLE = 'union_entitlement_type_totals'
+BALANCE_TOTALS_KEYS = ('union_id', 'entitlement_type')
+BALANCE_COLUMNS = ('current_balance', 'accrued_ytd', 'used_ytd')
+
+def balance_totals_statements(table=BALANCE_TOTALS_TABLE, keys=BALANCE_TOTALS_KEYS):
+    """Create and populate the balance totals table, and the triggers that maintain it"""
+    key_list = ', '.join(keys)
+    totals = ', '.join(f'{column} REAL NOT NULL DEFAULT 0' for column in BALANCE_COLUMNS)
+    upsert = (f'INSERT INTO {table} ({key_list}, member_entitlement_count, {", ".join(BALANCE_COLUMNS)}) '
+              '{select} '
+              f'ON CONFLICT ({key_list}) DO UPDATE SET '
+              'member_entitlement_count = member_entitlement_count + excluded.member_entitlement_count, '
+              + ', '.join(f'{column} = {column} + excluded.{column}' for column in BALANCE_COLUMNS))
+
+    def add_row(ref, sign):
+        # Add (sign '') or subtract (sign '-') one member_entitlements row's balances
+        balances = ', '.join(f'{sign}COALESCE({ref}.{column}, 0)' for column in BALANCE_COLUMNS)
+        return upsert.format(select=f'SELECT {key_list}, {sign}1, {balances} '
+                                    f'FROM entitlements WHERE entitlement_id = {ref}.entitlement_id') + ';'
+
+    def move_entitlement(ref, sign):
+        # Add or subtract every member's balances for an entitlement filed under `ref`'s keys
+        balances = ', '.join(f'{sign}TOTAL({column})' for column in BALANCE_COLUMNS)
+        return upsert.format(select=f'SELECT {", ".join(f"{ref}.{key}" for key in keys)}, {sign}COUNT(*), {balances} '
+                                    f'FROM member_entitlements WHERE entitlement_id = {ref}.entitlement_id') + ';'
+
+    return [
+        f'CREATE TABLE IF NOT EXISTS {table} ({", ".join(f"{key} TEXT NOT NULL" for key in keys)}, '
+        f'member_entitlement_count INTEGER NOT NULL DEFAULT 0, {totals}, '
+        f'PRIMARY KEY ({key_list})) WITHOUT ROWID',
+        upsert.format(select=f'SELECT {", ".join(f"e.{key}" for key in keys)}, COUNT(*), '
+                             + ', '.join(f'TOTAL(me.{column})' for column in BALANCE_COLUMNS)
+                             + ' FROM member_entitlements me JOIN entitlements e ON e.entitlement_id = me.entitlement_id '
+                             f'WHERE true GROUP BY {", ".join(f"e.{key}" for key in keys)}'),
+        f'CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON member_entitlements BEGIN '
+        f'{add_row("NEW", "")} END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON member_entitlements BEGIN '
+        f'{add_row("OLD", "-")} END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF entitlement_id, {", ".join(BALANCE_COLUMNS)} '
+        f'ON member_entitlements BEGIN {add_row("OLD", "-")} {add_row("NEW", "")} END',
+        # An entitlement moving to another union or type takes its members' balances with it
+        f'CREATE TRIGGER IF NOT EXISTS {table}_regroup AFTER UPDATE OF {key_list} ON entitlements BEGIN '
+        f'{move_entitlement("OLD", "-")} {move_entitlement("NEW", "")} END',
+    ]
+
+# (version, description, statements)
+MIGRATIONS = [
+    (1, 'Index membership, entitlement, violation and compliance lookups', [
+        # employee -> member (and union) without touching the table
+        'CREATE INDEX IF NOT EXISTS idx_union_members_employee ON union_members (employee_id, member_id, union_id)',
+        'CREATE INDEX IF NOT EXISTS idx_union_members_union ON union_members (union_id, member_id)',
+        # Covers every member_entitlements column the entitlement routes read
+        'CREATE INDEX IF NOT EXISTS idx_member_entitlements_member ON member_entitlements '
+        '(member_id, entitlement_id, current_balance, accrued_ytd, used_ytd, last_updated)',
+        'CREATE INDEX IF NOT EXISTS idx_compliance_violations_member ON compliance_violations (member_id)',
+        'CREATE INDEX IF NOT EXISTS idx_compliance_parameters_union ON compliance_parameters (union_id)',
+        'CREATE INDEX IF NOT EXISTS idx_entitlements_union ON entitlements (union_id)',
+    ]),
+    (2, 'Index violations by member and date for date-range filters', [
+        'CREATE INDEX IF NOT EXISTS idx_compliance_violations_member_date ON compliance_violations (member_id, violation_date)',
+        # Superseded: member_id is the new index's leading column
+        'DROP INDEX IF EXISTS idx_compliance_violations_member',
+    ]),
+    (3, 'Materialize member balance totals by union and entitlement type', balance_totals_statements()),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn, target=LATEST_VERSION):
+    """
+    Apply pending migrations up to `target`; return the versions applied.
+    A database being migrated is also switched to WAL, which persists in the
+    file, so readers keep reading while a writer commits.
+    """
+    applied = []
+    if schema_version(conn) < target:
+        conn.execute('PRAGMA journal_mode = WAL')
+    for version, _, statements in MIGRATIONS:
+        if version > target or version <= schema_version(conn):
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Re-check under the write lock in case another process migrated first
+            if version <= schema_version(conn):
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    if applied:
+        conn.execute('PRAGMA optimize')
+    return applied
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate the union entitlements database')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--status', action='store_true', help='Show the schema version without migrating')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        current = schema_version(conn)
+        if args.status:
+            print(f"Schema version {current} (latest {LATEST_VERSION})")
+            for version, description, _ in MIGRATIONS:
+                print(f"  {'✓' if version <= current else '•'} {version}: {description}")
+            return
+        applied = migrate(conn)
+        if applied:
+            print(f"✓ Migrated {args.db} from version {current} to {schema_version(conn)}")
+        else:
+            print(f"✓ {args.db} is up to date (version {current})")
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()
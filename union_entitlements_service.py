@@ -3,97 +3,507 @@
 Simple web service to read union entitlements data from SQLite database
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request, Response
+from collections import OrderedDict
+from datetime import date
+from urllib.parse import quote, urlencode
+import json
 import sqlite3
+import threading
+import time
 import os
 
+from union_db_migrations import LATEST_VERSION, schema_version
+from union_service_metrics import UNMATCHED_ROUTE, ServiceMetrics, normalize_statement
+
 app = Flask(__name__)
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'external_data', 'union_entitlements.db')
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+# Applied to every read connection: memory-map the file, keep a 64 MB page cache, temp tables in RAM
+READ_PRAGMAS = (
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -65536',
+    'PRAGMA temp_store = MEMORY',
+)
+
+# Prepared statements each read connection keeps; every query below is a constant string, so repeats skip parsing
+CACHED_STATEMENTS = 256
+
+# Build JSON bodies inside SQLite with json_group_array() rather than from Python row tuples
+SQLITE_JSON = os.environ.get('UNION_SERVICE_SQLITE_JSON', '').lower() in ('1', 'true', 'yes')
+
+# Route latencies and per-statement timings, served by /metrics
+metrics = ServiceMetrics()
+
+# Persistent connections: one read-only connection per thread
+_local = threading.local()
+_connections_lock = threading.Lock()
+_read_connections = {}
+_generation = 0
+def open_read_connection():
+    conn = sqlite3.connect(f'file:{quote(DB_PATH)}?mode=ro', uri=True, check_same_thread=False,
+                           cached_statements=CACHED_STATEMENTS)
     conn.row_factory = sqlite3.Row
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def get_db_connection():
+    """This thread's persistent read-only connection"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.generation != _generation:
+        current = threading.current_thread()
+        with _connections_lock:
+            # Threads that have exited (e.g. the dev server's per-request threads) hand their connection on
+            conn = next((_read_connections.pop(thread) for thread in list(_read_connections)
+                         if not thread.is_alive()), None)
+            if conn is None:
+                conn = open_read_connection()
+            _read_connections[current] = conn
+            _local.conn = conn
+            _local.generation = _generation
+    return conn
+
+def close_connections():
+    """Close every persistent connection, e.g. after pointing DB_PATH at another database"""
+    global _generation
+    with _connections_lock:
+        for conn in _read_connections.values():
+            conn.close()
+        _read_connections.clear()
+        read_cache.clear()
+        _statements.clear()
+        _generation += 1
+
+class ReadCache:
+    """
+    Read-through cache of JSON bodies for data that rarely changes. Any commit
+    to the database, from this process or another, invalidates every entry:
+    each connection's `PRAGMA data_version` changes when another connection
+    commits, so the first request to notice bumps the cache generation.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.generation = 0
+        # connection -> data_version it last reported
+        self.seen_versions = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def current_generation(self, conn):
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        with self.lock:
+            # A connection seen for the first time cannot tell what changed before it opened
+            if self.seen_versions.get(conn) != data_version:
+                self.seen_versions[conn] = data_version
+                self.generation += 1
+                self.entries.clear()
+                self.invalidations += 1
+            return self.generation
+
+    def get(self, conn, key, load):
+        """Cached body for `key`, or `load()` it and cache it"""
+        generation = self.current_generation(conn)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        body = load()
+        with self.lock:
+            # Stamped with the generation seen before loading, so a racing commit leaves it stale
+            if generation == self.generation:
+                self.entries[key] = (generation, body)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return body
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.seen_versions.clear()
+            self.generation += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+read_cache = ReadCache()
+
+def cached_json(key, load):
+    """Serve the JSON body `load(conn)` returns through the read cache"""
+    conn = get_db_connection()
+    return json_response(read_cache.get(conn, key, lambda: load(conn)))
+
+def json_response(body):
+    return app.response_class(body, mimetype='application/json')
+
+encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+# query text -> (column names, the query wrapped to return its rows as one JSON array and their count, metrics label)
+_statements = {}
+
+def prepare(conn, query, params):
+    """Column names, JSON form and metrics label of `query`, worked out once per query text"""
+    statement = _statements.get(query)
+    if statement is None:
+        description = conn.execute(f'SELECT * FROM ({query}) LIMIT 0', params).description
+        columns = tuple(column[0] for column in description)
+        pairs = ', '.join("'{}', \"{}\"".format(name.replace("'", "''"), name.replace('"', '""')) for name in columns)
+        statement = _statements[query] = (columns,
+                                           f'SELECT json_group_array(json_object({pairs})), count(*) FROM ({query})',
+                                           normalize_statement(query))
+    return statement
+
+def query_rows(conn, query, params=()):
+    """Rows as dicts, built straight from plain tuples with the precomputed column names"""
+    columns, _, label = prepare(conn, query, params)
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    rows = [dict(zip(columns, row)) for row in cursor.execute(query, params)]
+    metrics.record_query(label, time.perf_counter() - started, len(rows))
+    return rows
+
+def query_json(conn, query, params=()):
+    """UTF-8 JSON array of the rows `query` returns, one object per row"""
+    if SQLITE_JSON:
+        _, json_query, label = prepare(conn, query, params)
+        started = time.perf_counter()
+        body, rows = conn.execute(json_query, params).fetchone()
+        metrics.record_query(label, time.perf_counter() - started, rows)
+        return body.encode()
+    return encode_json(query_rows(conn, query, params)).encode()
+
+def json_object_body(fields):
+    """JSON object from (key, UTF-8 JSON value) pairs, without decoding the values again"""
+    return b'{' + b','.join(encode_json(key).encode() + b':' + value for key, value in fields) + b'}'
+
+# Keyset pagination: members after a member_id, in member_id order (LIMIT -1 means no limit)
+UNION_MEMBERS_QUERY = '''
+    SELECT * FROM union_members
+    WHERE union_id = ? AND member_id > ?
+    ORDER BY member_id
+    LIMIT ?
+'''
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 500
+
+UNION_COMPLIANCE_QUERY = 'SELECT * FROM compliance_parameters WHERE union_id = ?'
+
+UNION_ENTITLEMENTS_QUERY = 'SELECT * FROM entitlements WHERE union_id = ?'
+
+EMPLOYEE_MEMBERSHIPS_QUERY = 'SELECT * FROM union_members WHERE employee_id = ?'
+
+EMPLOYEE_COMPLIANCE_QUERY = '''
+    SELECT cp.*
+    FROM compliance_parameters cp
+    JOIN union_members um ON cp.union_id = um.union_id
+    WHERE um.employee_id = ?
+'''
+
+EMPLOYEE_ENTITLEMENTS_QUERY = '''
+    SELECT e.*, me.current_balance, me.accrued_ytd, me.used_ytd, me.last_updated
+    FROM entitlements e
+    JOIN member_entitlements me ON e.entitlement_id = me.entitlement_id
+    JOIN union_members um ON me.member_id = um.member_id
+    WHERE um.employee_id = ?
+'''
+
+# Batch form of EMPLOYEE_ENTITLEMENTS_QUERY; {placeholders} is filled with one `?` per employee ID
+EMPLOYEE_ENTITLEMENTS_BATCH_QUERY = '''
+    SELECT um.employee_id AS employee_id, e.*, me.current_balance, me.accrued_ytd, me.used_ytd, me.last_updated
+    FROM entitlements e
+    JOIN member_entitlements me ON e.entitlement_id = me.entitlement_id
+    JOIN union_members um ON me.member_id = um.member_id
+    WHERE um.employee_id IN ({placeholders})
+'''
+
+# Stays well under SQLite's bound-parameter limit (999 on older builds)
+BATCH_CHUNK_SIZE = 500
+MAX_BATCH_EMPLOYEES = 10000
+# Largest member page; SQLite's LIMIT must fit in a 64-bit integer, and bigger pages should stream instead
+MAX_MEMBERS_PAGE = 10000
+
+MEMBER_ENTITLEMENTS_QUERY = '''
+    SELECT e.*, me.current_balance, me.accrued_ytd, me.used_ytd, me.last_updated
+    FROM entitlements e
+    JOIN member_entitlements me ON e.entitlement_id = me.entitlement_id
+    WHERE me.member_id = ?
+'''
+
+EMPLOYEE_VIOLATIONS_QUERY = '''
+    SELECT cv.*, cp.parameter_name, cp.description as param_description
+    FROM compliance_violations cv
+    JOIN compliance_parameters cp ON cv.parameter_id = cp.parameter_id
+    JOIN union_members um ON cv.member_id = um.member_id
+    WHERE um.employee_id = ?
+'''
+
+MEMBER_VIOLATIONS_QUERY = '''
+    SELECT cv.*, cp.parameter_name, cp.description as param_description
+    FROM compliance_violations cv
+    JOIN compliance_parameters cp ON cv.parameter_id = cp.parameter_id
+    WHERE cv.member_id = ?
+'''
+
+# Reads the trigger-maintained totals table (see union_db_migrations), never member_entitlements itself
+UNION_ENTITLEMENT_TYPE_TOTALS_QUERY = '''
+    SELECT t.entitlement_type,
+           (SELECT e.unit FROM entitlements e
+            WHERE e.union_id = t.union_id AND e.entitlement_type = t.entitlement_type LIMIT 1) AS unit,
+           t.member_entitlement_count,
+           ROUND(t.current_balance, 4) AS current_balance,
+           ROUND(t.accrued_ytd, 4) AS accrued_ytd,
+           ROUND(t.used_ytd, 4) AS used_ytd
+    FROM union_entitlement_type_totals t
+    WHERE t.union_id = ? AND t.member_entitlement_count > 0
+    ORDER BY t.entitlement_type
+'''
+
+def violation_filters(args):
+    """
+    SQL conditions for the `start_date`, `end_date` (inclusive, YYYY-MM-DD) and
+    `resolved` (true/false) query parameters, to append to a violations query
+    """
+    conditions, params = [], []
+    for name, operator in (('start_date', '>='), ('end_date', '<=')):
+        if name in args:
+            try:
+                params.append(date.fromisoformat(args[name]).isoformat())
+            except ValueError:
+                raise ValueError(f'{name} must be a YYYY-MM-DD date')
+            conditions.append(f'cv.violation_date {operator} ?')
+    if 'resolved' in args:
+        resolved = args['resolved'].lower()
+        if resolved not in ('true', 'false', '1', '0'):
+            raise ValueError('resolved must be true or false')
+        conditions.append('cv.resolved = ?')
+        params.append(int(resolved in ('true', '1')))
+    return ''.join(f' AND {condition}' for condition in conditions), params
+
 @app.route('/unions', methods=['GET'])
 def get_unions():
-    conn = get_db_connection()
-    unions = conn.execute('SELECT * FROM unions').fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in unions])
+    return cached_json('unions', lambda conn: query_json(conn, 'SELECT * FROM unions'))
 
 @app.route('/unions/<union_id>/members', methods=['GET'])
 def get_union_members(union_id):
+    """
+    Members in member_id order. `?limit=N&after=<member_id>` pages through them;
+    the next page's `after` is returned in the X-Next-After and Link headers.
+    Ask for `Accept: application/x-ndjson` (or `?format=ndjson`) to stream one
+    member per line as rows are read, instead of building the whole list.
+    """
+    after = request.args.get('after', '')
+    try:
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+    except ValueError:
+        limit = 0
+    if limit is not None and limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    if limit is not None and limit > MAX_MEMBERS_PAGE:
+        return jsonify({'error': f'limit must be at most {MAX_MEMBERS_PAGE}'}), 400
     conn = get_db_connection()
-    members = conn.execute('SELECT * FROM union_members WHERE union_id = ?', (union_id,)).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in members])
+    params = (union_id, after, -1 if limit is None else limit)
+
+    if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        columns, _, label = prepare(conn, UNION_MEMBERS_QUERY, params)
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(UNION_MEMBERS_QUERY, params)
+
+        def stream():
+            # The statement's time includes waiting on the client, since rows are read as it consumes them
+            streamed = 0
+            try:
+                while True:
+                    rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+                    if not rows:
+                        return
+                    streamed += len(rows)
+                    yield ''.join(encode_json(dict(zip(columns, row))) + '\n' for row in rows)
+            finally:
+                # Finish the statement even if the client disconnects mid-stream, so it stops pinning the read snapshot
+                cursor.close()
+                metrics.record_query(label, time.perf_counter() - started, streamed)
+        return Response(stream(), mimetype=NDJSON_MIMETYPE)
+
+    if limit is None:
+        return json_response(query_json(conn, UNION_MEMBERS_QUERY, params))
+    members = query_rows(conn, UNION_MEMBERS_QUERY, params)
+    response = json_response(encode_json(members).encode())
+    if len(members) == limit:
+        next_after = members[-1]['member_id']
+        response.headers['X-Next-After'] = next_after
+        response.headers['Link'] = f'<{request.base_url}?{urlencode({"after": next_after, "limit": limit})}>; rel="next"'
+    return response
 
 @app.route('/employees/<employee_id>/entitlements', methods=['GET'])
 def get_employee_entitlements(employee_id):
+    return json_response(query_json(get_db_connection(), EMPLOYEE_ENTITLEMENTS_QUERY, (employee_id,)))
+
+@app.route('/employees/entitlements', methods=['POST'])
+def get_batch_employee_entitlements():
+    """Entitlements for many employees at once: {"employee_ids": [...]} -> {employee_id: [entitlements]}"""
+    payload = request.get_json(silent=True)
+    employee_ids = payload.get('employee_ids') if isinstance(payload, dict) else None
+    if not isinstance(employee_ids, list) or not all(isinstance(employee_id, str) for employee_id in employee_ids):
+        return jsonify({'error': 'employee_ids must be a list of strings'}), 400
+    employee_ids = list(dict.fromkeys(employee_ids))
+    if len(employee_ids) > MAX_BATCH_EMPLOYEES:
+        return jsonify({'error': f'At most {MAX_BATCH_EMPLOYEES} employee_ids per request'}), 400
+
+    conn = get_db_connection()
+    results = {employee_id: [] for employee_id in employee_ids}
+    for start in range(0, len(employee_ids), BATCH_CHUNK_SIZE):
+        chunk = employee_ids[start:start + BATCH_CHUNK_SIZE]
+        query = EMPLOYEE_ENTITLEMENTS_BATCH_QUERY.format(placeholders=','.join('?' * len(chunk)))
+        for entitlement in query_rows(conn, query, chunk):
+            results[entitlement.pop('employee_id')].append(entitlement)
+    return json_response(encode_json(results).encode())
+
+@app.route('/employees/<employee_id>/leave-context', methods=['GET'])
+def get_employee_leave_context(employee_id):
+    """
+    Everything a leave decision needs, read from one consistent snapshot.
+    Violations accept the same filters as /employees/<employee_id>/violations.
+    """
+    try:
+        filters, filter_params = violation_filters(request.args)
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
     conn = get_db_connection()
-    query = '''
-        SELECT e.*, me.current_balance, me.accrued_ytd, me.used_ytd, me.last_updated
-        FROM entitlements e
-        JOIN member_entitlements me ON e.entitlement_id = me.entitlement_id
-        JOIN union_members um ON me.member_id = um.member_id
-        WHERE um.employee_id = ?
-    '''
-    entitlements = conn.execute(query, (employee_id,)).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in entitlements])
+    conn.execute('BEGIN')
+    try:
+        memberships = query_json(conn, EMPLOYEE_MEMBERSHIPS_QUERY, (employee_id,))
+        if memberships == b'[]':
+            return jsonify({'error': 'Employee is not a union member'}), 404
+        body = json_object_body([
+            ('employee_id', encode_json(employee_id).encode()),
+            ('memberships', memberships),
+            ('entitlements', query_json(conn, EMPLOYEE_ENTITLEMENTS_QUERY, (employee_id,))),
+            ('violations', query_json(conn, EMPLOYEE_VIOLATIONS_QUERY + filters, [employee_id, *filter_params])),
+            ('compliance_parameters', query_json(conn, EMPLOYEE_COMPLIANCE_QUERY, (employee_id,))),
+        ])
+    finally:
+        conn.execute('COMMIT')
+    return json_response(body)
 
 @app.route('/members/<member_id>/entitlements', methods=['GET'])
 def get_member_entitlements(member_id):
-    conn = get_db_connection()
-    query = '''
-        SELECT e.*, me.current_balance, me.accrued_ytd, me.used_ytd, me.last_updated
-        FROM entitlements e
-        JOIN member_entitlements me ON e.entitlement_id = me.entitlement_id
-        WHERE me.member_id = ?
-    '''
-    entitlements = conn.execute(query, (member_id,)).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in entitlements])
+    return json_response(query_json(get_db_connection(), MEMBER_ENTITLEMENTS_QUERY, (member_id,)))
 
 @app.route('/unions/<union_id>/compliance', methods=['GET'])
 def get_union_compliance(union_id):
+    return cached_json(('compliance', union_id),
+                       lambda conn: query_json(conn, UNION_COMPLIANCE_QUERY, (union_id,)))
+
+@app.route('/unions/<union_id>/entitlements', methods=['GET'])
+def get_union_entitlement_definitions(union_id):
+    return cached_json(('entitlements', union_id),
+                       lambda conn: query_json(conn, UNION_ENTITLEMENTS_QUERY, (union_id,)))
+
+@app.route('/unions/<union_id>/entitlement-totals', methods=['GET'])
+def get_union_entitlement_totals(union_id):
+    """
+    Member balances summed by entitlement type. Types are not added together
+    across the union, since they are kept in different units (days, dollars, years).
+    """
     conn = get_db_connection()
-    params = conn.execute('SELECT * FROM compliance_parameters WHERE union_id = ?', (union_id,)).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in params])
+    conn.execute('BEGIN')
+    try:
+        if not query_rows(conn, 'SELECT union_id FROM unions WHERE union_id = ?', (union_id,)):
+            return jsonify({'error': 'Union not found'}), 404
+        entitlement_types = query_rows(conn, UNION_ENTITLEMENT_TYPE_TOTALS_QUERY, (union_id,))
+    finally:
+        conn.execute('COMMIT')
+    return json_response(encode_json({
+        'union_id': union_id,
+        'member_entitlement_count': sum(totals['member_entitlement_count'] for totals in entitlement_types),
+        'entitlement_types': entitlement_types,
+    }).encode())
 
 @app.route('/employees/<employee_id>/violations', methods=['GET'])
 def get_employee_violations(employee_id):
-    conn = get_db_connection()
-    query = '''
-        SELECT cv.*, cp.parameter_name, cp.description as param_description
-        FROM compliance_violations cv
-        JOIN compliance_parameters cp ON cv.parameter_id = cp.parameter_id
-        JOIN union_members um ON cv.member_id = um.member_id
-        WHERE um.employee_id = ?
-    '''
-    violations = conn.execute(query, (employee_id,)).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in violations])
+    return query_violations(EMPLOYEE_VIOLATIONS_QUERY, employee_id)
 
 @app.route('/members/<member_id>/violations', methods=['GET'])
 def get_member_violations(member_id):
-    conn = get_db_connection()
-    query = '''
-        SELECT cv.*, cp.parameter_name, cp.description as param_description
-        FROM compliance_violations cv
-        JOIN compliance_parameters cp ON cv.parameter_id = cp.parameter_id
-        WHERE cv.member_id = ?
-    '''
-    violations = conn.execute(query, (member_id,)).fetchall()
-    conn.close()
-    return jsonify([dict(row) for row in violations])
+    return query_violations(MEMBER_VIOLATIONS_QUERY, member_id)
+
+def query_violations(query, key):
+    try:
+        filters, params = violation_filters(request.args)
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    return json_response(query_json(get_db_connection(), query + filters, [key, *params]))
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    if request.path != '/metrics' and 'request_started' in g:
+        route = request.url_rule.rule if request.url_rule else UNMATCHED_ROUTE
+        metrics.record_request(request.method, route, response.status_code, time.perf_counter() - g.request_started)
+    return response
+
+def connection_counts():
+    with _connections_lock:
+        assigned = sum(thread.is_alive() for thread in _read_connections)
+        return {'read_assigned': assigned, 'read_spare': len(_read_connections) - assigned}
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of request, query, connection and cache metrics"""
+    connections = connection_counts()
+    cache = read_cache.stats()
+    return Response(metrics.prometheus([
+        ('connections', 'gauge', 'Open SQLite connections; spare read connections wait for the next new thread',
+         [({'role': 'read', 'state': 'assigned'}, connections['read_assigned']),
+          ({'role': 'read', 'state': 'spare'}, connections['read_spare'])]),
+        ('prepared_queries', 'gauge', 'Query texts with precomputed columns and JSON form', [({}, len(_statements))]),
+        ('cache_entries', 'gauge', 'Responses held by the read cache', [({}, cache['entries'])]),
+        ('cache_hits_total', 'counter', 'Read cache hits', [({}, cache['hits'])]),
+        ('cache_misses_total', 'counter', 'Read cache misses', [({}, cache['misses'])]),
+        ('cache_invalidations_total', 'counter', 'Read cache flushes after a database commit',
+         [({}, cache['invalidations'])]),
+        ('cache_hit_ratio', 'gauge', 'Read cache hits per lookup since startup', [({}, cache['hit_rate'])]),
+    ]), mimetype='text/plain; version=0.0.4')
+
+def schema_status():
+    """The database's schema version against the latest migration; the service reads it but never migrates"""
+    version = schema_version(get_db_connection())
+    return {'version': version, 'latest': LATEST_VERSION, 'current': version >= LATEST_VERSION}
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'database': os.path.exists(DB_PATH)})
+    database = os.path.exists(DB_PATH)
+    health = {'status': 'healthy', 'database': database, 'cache': read_cache.stats()}
+    if database:
+        health['schema'] = schema_status()
+    return jsonify(health)
 
 if __name__ == '__main__':
+    schema = schema_status()
+    if not schema['current']:
+        app.logger.warning('%s is at schema version %d (latest %d); run `python union_db_migrations.py --db %s` '
+                           'to migrate it', DB_PATH, schema['version'], LATEST_VERSION, DB_PATH)
     app.run(host='0.0.0.0', port=8081, debug=True)
\ No newline at end of file
@@ -1,7 +1,12 @@
 import requests
+from datetime import date, timedelta
 from ukg_api_client import UKGAPIClient
 
 UNION_ENTITLEMENT_SERVICE_BASE_URL="http://localhost:8081"
+# Compliance history reviewed with a leave request: violations from the last 12 months
+VIOLATION_LOOKBACK_DAYS = 365
+# Most employee IDs the service accepts in one POST /employees/entitlements
+MAX_BATCH_EMPLOYEES = 10000
 
 def get_union_entitlements(employee_id):
     response = requests.get(
@@ -9,9 +14,38 @@ def get_union_entitlements(employee_id):
     )
     return response.json()
 
-def get_compliance_violations(employee_id, start_date, end_date):
+def violation_filters(start_date=None, end_date=None, resolved=None):
+    """Query parameters for the service's violation date-range and resolved filters"""
+    params = {"start_date": start_date, "end_date": end_date}
+    if resolved is not None:
+        params["resolved"] = "true" if resolved else "false"
+    return {name: value for name, value in params.items() if value is not None}
+
+def get_leave_context(employee_id, start_date=None, end_date=None, resolved=None):
+    """Membership, entitlements, violations and compliance parameters in a single request"""
+    response = requests.get(
+        f"{UNION_ENTITLEMENT_SERVICE_BASE_URL}/employees/{employee_id}/leave-context",
+        params=violation_filters(start_date, end_date, resolved)
+    )
+    response.raise_for_status()
+    return response.json()
+
+def get_union_entitlements_batch(employee_ids, batch_size=MAX_BATCH_EMPLOYEES):
+    """Entitlements for many employees, keyed by employee ID, in one request per `batch_size` employees"""
+    entitlements = {}
+    for start in range(0, len(employee_ids), batch_size):
+        response = requests.post(
+            f"{UNION_ENTITLEMENT_SERVICE_BASE_URL}/employees/entitlements",
+            json={"employee_ids": employee_ids[start:start + batch_size]}
+        )
+        response.raise_for_status()
+        entitlements.update(response.json())
+    return entitlements
+
+def get_compliance_violations(employee_id, start_date, end_date, resolved=None):
     response = requests.get(
-        f"{UNION_ENTITLEMENT_SERVICE_BASE_URL}/employees/{employee_id}/violations"
+        f"{UNION_ENTITLEMENT_SERVICE_BASE_URL}/employees/{employee_id}/violations",
+        params=violation_filters(start_date, end_date, resolved)
     )
     return response.json()
 
@@ -82,15 +116,19 @@ if __name__ == "__main__":
         print(f"❌ Insufficient PTO balance (≥{required_hours} hrs required)")
 
     print("\n🔄 Step 4: Checking Union Entitlements...")
-    entitlements = get_union_entitlements(employee_id)
+    # One round trip for steps 4-6 instead of three dependent requests. Violations are history,
+    # so look back from today rather than at the (future) leave period.
+    violations_since = (date.today() - timedelta(days=VIOLATION_LOOKBACK_DAYS)).isoformat()
+    leave_context = get_leave_context(employee_id, start_date=violations_since)
+    entitlements = leave_context['entitlements']
     for ent in entitlements:
         print(f"🏛️ {ent['description']}: {ent['current_balance']} {ent['unit']} available")
 
     is_union_entitled = evaluate_union_entitlements(entitlements, time_off_request)
     print(f"{'✅' if is_union_entitled else '❌'} Union entitlements {'approved' if is_union_entitled else 'denied'}")
     
-    print("\n🔄 Step 5: Reviewing Compliance Violations...")
-    violations = get_compliance_violations(employee_id, start_date, end_date)
+    print(f"\n🔄 Step 5: Reviewing Compliance Violations since {violations_since}...")
+    violations = leave_context['violations']
     if violations:
         for violation in violations:
             status = "✅ Resolved" if violation['resolved'] else "⚠️ Active"
@@ -102,8 +140,7 @@ if __name__ == "__main__":
     print(f"{'✅' if is_compliant_violations else '❌'} Compliance violations check {'passed' if is_compliant_violations else 'failed'}")
 
     print("\n🔄 Step 6: Evaluating Compliance Parameters...")
-    union_id = entitlements[0].get("union_id", "UNION001")
-    compliance_parameters = get_compliance_parameters(union_id)
+    compliance_parameters = leave_context['compliance_parameters']
     for param in compliance_parameters:
         print(f"📏 {param['parameter_name']}: {param['parameter_value']} ({param['description']})")
 
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Request and query metrics for the union entitlements service
+
+Route latencies, SQLite statement timings and rows returned are kept in
+fixed-bucket histograms, so memory stays bounded however long the service
+runs, and the service's /metrics endpoint renders them in the Prometheus
+text exposition format.
+"""
+
+import bisect
+import re
+import threading
+
+# Request and statement durations, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+# Route label for requests that matched no route, so 404 scans don't add a series per path
+UNMATCHED_ROUTE = '<unmatched>'
+
+_IN_LIST = re.compile(r'IN \(\?(?:, ?\?)*\)')
+
+def normalize_statement(sql):
+    """One label per statement: whitespace collapsed and `IN (?, ?, ...)` lists folded together"""
+    return _IN_LIST.sub('IN (...)', ' '.join(sql.split()))
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus exposes them"""
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def buckets(self):
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield _format_number(bound), cumulative
+        yield '+Inf', self.count
+
+class RouteMetrics:
+    __slots__ = ('latency', 'statuses')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statuses = {}
+
+class StatementMetrics:
+    __slots__ = ('duration', 'rows')
+
+    def __init__(self):
+        self.duration = Histogram(LATENCY_BUCKETS)
+        self.rows = Histogram(ROW_BUCKETS)
+
+class ServiceMetrics:
+    def __init__(self, prefix='union_service'):
+        self.prefix = prefix
+        self.routes = {}
+        self.statements = {}
+        self.lock = threading.Lock()
+
+    def record_request(self, method, route, status, seconds):
+        with self.lock:
+            metrics = self.routes.get((method, route))
+            if metrics is None:
+                metrics = self.routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(seconds)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def record_query(self, statement, seconds, rows):
+        """Time and row count of one statement, labelled by its normalize_statement() text"""
+        with self.lock:
+            metrics = self.statements.get(statement)
+            if metrics is None:
+                metrics = self.statements[statement] = StatementMetrics()
+            metrics.duration.observe(seconds)
+            metrics.rows.observe(rows)
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+            self.statements = {}
+
+    def prometheus(self, readings=()):
+        """
+        Prometheus text exposition format. `readings` adds values the caller
+        reads at scrape time, as (name, type, help, [(labels, value), ...]).
+        """
+        prefix = self.prefix
+        lines = []
+
+        def histograms(name, help_text, series):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} histogram')
+            for labels, histogram in series:
+                for bound, count in histogram.buckets():
+                    lines.append(f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{prefix}_{name}_sum{{{labels}}} {_format_number(histogram.sum)}')
+                lines.append(f'{prefix}_{name}_count{{{labels}}} {histogram.count}')
+
+        with self.lock:
+            routes = sorted(self.routes.items())
+            statements = sorted(self.statements.items())
+            histograms('request_duration_seconds', 'Request latency by route',
+                       [(_labels(method=method, route=route), metrics.latency) for (method, route), metrics in routes])
+            lines.append(f'# HELP {prefix}_requests_total Requests by route and status')
+            lines.append(f'# TYPE {prefix}_requests_total counter')
+            for (method, route), metrics in routes:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'{prefix}_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}')
+            histograms('query_duration_seconds', 'SQLite statement time, including fetching every row',
+                       [(_labels(statement=statement), metrics.duration) for statement, metrics in statements])
+            histograms('query_rows', 'Rows returned per SQLite statement',
+                       [(_labels(statement=statement), metrics.rows) for statement, metrics in statements])
+
+        for name, metric_type, help_text, samples in readings:
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} {metric_type}')
+            for labels, value in samples:
+                series = f'{{{_labels(**labels)}}}' if labels else ''
+                lines.append(f'{prefix}_{name}{series} {_format_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_number(value):
+    return str(value) if isinstance(value, int) else repr(float(value))